@@ -0,0 +1,476 @@
+"""
+Fashion MNIST Benchmark Suite
+=============================
+Script untuk mengukur performa training, inferensi dan startup project ini,
+menyimpan hasilnya ke file JSON, lalu membandingkannya dengan baseline
+sehingga regresi performa langsung terlihat.
+
+Pengukuran:
+1. Cold start setiap entry point:
+   - startup: proses Python baru sampai `<script>.py --help` selesai
+     (biaya import setiap script CLI, termasuk fashion_cli.py)
+   - prediksi pertama: predict_custom_image.main() pada satu gambar,
+     inference_server yang menjawab satu request /predict, dan
+     NumpyFashionModel yang memuat weights .npz lalu memprediksi satu gambar
+2. Latency satu gambar (p50/p95/p99) pada jalur predict_custom_image.py:
+   preprocess_image() → predict_batch() dengan batch 1
+3. Throughput inferensi (gambar/detik) untuk berbagai batch size
+4. Waktu model.evaluate() pada 10.000 gambar test
+5. Throughput training (samples/detik)
+
+Semua pengukuran berjalan offline di CPU. Jika cache dataset belum ada dan
+tidak bisa diunduh, data sintetis dengan ukuran yang sama dipakai (waktu
+komputasi tidak bergantung pada isi gambar).
+
+Penggunaan:
+    python benchmark.py                           # ukur & bandingkan dengan baseline
+    python benchmark.py --save-baseline           # jadikan hasil ini baseline baru
+    python benchmark.py --quick                   # versi cepat (pengulangan lebih sedikit)
+    python benchmark.py --tolerance 0.10          # regresi jika lebih buruk > 10%
+
+Exit code 1 jika ada metric yang mengalami regresi terhadap baseline.
+Exit code 2 jika baseline tidak sebanding (mode --quick berbeda atau
+dibuat oleh versi benchmark yang mengukur hal lain); buat baseline baru
+dengan --save-baseline.
+
+Dibuat oleh: Fathih Apriandi
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import tensorflow as tf
+import numpy as np
+from PIL import Image
+
+from dataset_cache import load_data
+from export_numpy_model import WEIGHTS_PATH, export_weights
+from predict_custom_image import MODEL_PATH, build_inference_fn, predict_batch, preprocess_image
+from train_fashion_mnist_model import build_model, compile_model
+from training_pipeline import ThroughputLogger, make_dataset
+
+# ============================================================================
+# KONFIGURASI BENCHMARK
+# ============================================================================
+
+# File hasil benchmark terbaru dan baseline pembanding
+RESULTS_PATH = 'benchmark_results.json'
+BASELINE_PATH = 'benchmark_baseline.json'
+
+# Folder script ini: tempat semua entry point
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Toleransi default: metric dianggap regresi jika lebih buruk > 15%
+DEFAULT_TOLERANCE = 0.15
+
+# Versi metode pengukuran: naikkan jika arti suatu metric berubah agar
+# baseline lama tidak dibandingkan dengan hasil baru
+BENCHMARK_VERSION = 2
+
+# Script CLI yang diukur waktu startup-nya dengan `--help` (semua import
+# module-level ikut terukur, tanpa menjalankan pekerjaan script)
+STARTUP_SCRIPTS = [
+    'fashion_cli',
+    'download_image',
+    'train_fashion_mnist_model',
+    'predict_custom_image',
+    'inference_server',
+    'numpy_inference',
+    'export_numpy_model',
+    'quantize_model',
+    'compress_model',
+    'evaluate_models',
+    'embedding_index',
+    'bulk_predict',
+]
+
+# Script cold start per entry point, dijalankan di proses baru dengan cwd
+# berisi test-image/sample.png, fashion_mnist_model.keras dan weights .npz
+FIRST_PREDICTION_SCRIPTS = {
+    'predict_custom_image': (
+        "import predict_custom_image\n"
+        "predict_custom_image.main(['--no-chart', '--workers', '0'])\n"
+    ),
+    'inference_server': (
+        "import base64, json, threading, urllib.request\n"
+        "from inference_server import MicroBatcher, create_server\n"
+        "from predict_custom_image import build_inference_fn, load_model\n"
+        "infer = build_inference_fn(load_model())\n"
+        "batcher = MicroBatcher(lambda images: infer(images).numpy()).start()\n"
+        "server = create_server(batcher, '127.0.0.1', 0)\n"
+        "threading.Thread(target=server.serve_forever, daemon=True).start()\n"
+        "with open('test-image/sample.png', 'rb') as f:\n"
+        "    body = json.dumps({'image': base64.b64encode(f.read()).decode('ascii')})\n"
+        "request = urllib.request.Request(\n"
+        "    f'http://127.0.0.1:{server.server_port}/predict', data=body.encode('utf-8'),\n"
+        "    headers={'Content-Type': 'application/json'})\n"
+        "urllib.request.urlopen(request, timeout=60).read()\n"
+        "server.shutdown()\n"
+        "batcher.stop()\n"
+    ),
+    'numpy_inference': (
+        "from numpy_inference import NumpyFashionModel\n"
+        "from predict_custom_image import preprocess_image\n"
+        "model = NumpyFashionModel.load()\n"
+        "model.predict(preprocess_image('test-image/sample.png')[1][None])\n"
+    ),
+}
+
+# Batch size untuk pengukuran throughput inferensi
+BATCH_SIZES = [1, 8, 32, 128, 512]
+
+# ============================================================================
+# HELPER PENGUKURAN
+# ============================================================================
+
+def metric(value, unit, better):
+    """
+    Membuat satu entry metric.
+    better: 'lower' (waktu/latency) atau 'higher' (throughput)
+    """
+    return {'value': float(value), 'unit': unit, 'better': better}
+
+
+def percentile(values, q):
+    return float(np.percentile(np.asarray(values), q))
+
+
+def run_command(args, repeat, cwd=None):
+    """Menjalankan `python <args>` di proses baru, return median waktu (detik)."""
+    env = dict(os.environ, TF_CPP_MIN_LOG_LEVEL='3')
+    env['PYTHONPATH'] = SCRIPT_DIR + os.pathsep + env.get('PYTHONPATH', '')
+
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], check=True, env=env, cwd=cwd,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+def run_python(code, repeat, cwd=None):
+    """Menjalankan `python -c code` di proses baru, return median waktu (detik)."""
+    return run_command(['-c', code], repeat, cwd)
+
+
+def load_test_set():
+    """
+    Memuat 10.000 gambar test dari cache dataset.
+    Jika dataset tidak tersedia (offline tanpa cache), pakai data sintetis.
+    Return: (x_test uint8, y_test, sumber data)
+    """
+    try:
+        (_, _), (x_test, y_test) = load_data()
+        return x_test, y_test, 'fashion_mnist'
+    except Exception as error:
+        print(f"   ⚠️  Dataset tidak tersedia ({error}), memakai data sintetis")
+        rng = np.random.default_rng(0)
+        x_test = rng.integers(0, 256, size=(10000, 28, 28), dtype=np.uint8)
+        y_test = rng.integers(0, 10, size=10000, dtype=np.uint8)
+        return x_test, y_test, 'synthetic'
+
+# ============================================================================
+# BENCHMARK: COLD START
+# ============================================================================
+
+def bench_startup(repeat):
+    """Waktu startup setiap script CLI: proses baru sampai `--help` selesai."""
+    results = {}
+    for module in STARTUP_SCRIPTS:
+        print(f"   • {module}.py --help")
+        results[f'startup.{module}'] = metric(
+            run_command([os.path.join(SCRIPT_DIR, f'{module}.py'), '--help'], repeat),
+            's', 'lower'
+        )
+    return results
+
+
+def bench_first_prediction(model_path, sample_image, repeat):
+    """
+    Waktu dari proses Python baru sampai prediksi pertama selesai, untuk
+    setiap entry point di FIRST_PREDICTION_SCRIPTS. Menyiapkan folder kerja
+    (gambar, model, weights .npz) tidak ikut diukur.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        os.makedirs(os.path.join(workdir, 'test-image'))
+        Image.fromarray(np.asarray(sample_image)).save(
+            os.path.join(workdir, 'test-image', 'sample.png'))
+
+        model_copy = os.path.join(workdir, MODEL_PATH)
+        try:
+            os.symlink(os.path.abspath(model_path), model_copy)
+        except OSError:
+            shutil.copy2(model_path, model_copy)
+        export_weights(model_copy, os.path.join(workdir, WEIGHTS_PATH))
+
+        for name, code in FIRST_PREDICTION_SCRIPTS.items():
+            print(f"   • {name}")
+            results[f'first_prediction.{name}'] = metric(
+                run_python(code, repeat, cwd=workdir), 's', 'lower'
+            )
+    return results
+
+# ============================================================================
+# BENCHMARK: LATENCY SATU GAMBAR
+# ============================================================================
+
+def bench_single_image_latency(infer, images, repeat):
+    """
+    Latency per gambar pada jalur predict_custom_image.py:
+    baca file PNG → preprocess → forward pass batch 1.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # Simpan sample gambar test sebagai PNG, seperti hasil download_image.py
+        paths = []
+        for i, array in enumerate(images[:100]):
+            path = os.path.join(tmpdir, f"sample_{i + 1}.png")
+            Image.fromarray(np.asarray(array)).save(path)
+            paths.append(path)
+
+        # Warm-up (tracing tf.function)
+        predict_batch(infer, [preprocess_image(paths[0])[1]])
+
+        latencies = []
+        for i in range(repeat):
+            start = time.perf_counter()
+            _, img_array = preprocess_image(paths[i % len(paths)])
+            predict_batch(infer, [img_array])
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    return {
+        'single_image_latency.p50': metric(percentile(latencies, 50), 'ms', 'lower'),
+        'single_image_latency.p95': metric(percentile(latencies, 95), 'ms', 'lower'),
+        'single_image_latency.p99': metric(percentile(latencies, 99), 'ms', 'lower'),
+    }
+
+# ============================================================================
+# BENCHMARK: THROUGHPUT VS BATCH SIZE
+# ============================================================================
+
+def bench_batch_throughput(infer, x_test, min_seconds):
+    results = {}
+    x = x_test.astype(np.float32) / 255.0
+
+    for batch_size in BATCH_SIZES:
+        batch = x[:batch_size]
+        predict_batch(infer, batch)  # warm-up
+
+        # Ulangi sampai minimal `min_seconds` agar hasil stabil
+        count = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < min_seconds:
+            predict_batch(infer, batch)
+            count += 1
+        elapsed = time.perf_counter() - start
+
+        images_per_s = count * batch_size / elapsed
+        print(f"   • batch {batch_size:>4}: {images_per_s:,.0f} gambar/detik")
+        results[f'throughput.batch_{batch_size}'] = metric(images_per_s, 'images/s', 'higher')
+    return results
+
+# ============================================================================
+# BENCHMARK: EVALUATE & TRAINING
+# ============================================================================
+
+def bench_evaluate(model, x_test, y_test, repeat):
+    x = x_test.astype(np.float32) / 255.0
+    model.evaluate(x, y_test, verbose=0)  # warm-up
+
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        model.evaluate(x, y_test, verbose=0)
+        durations.append(time.perf_counter() - start)
+    return {'evaluate.test_set': metric(statistics.median(durations), 's', 'lower')}
+
+
+def bench_training(num_samples, epochs, batch_size=32):
+    """
+    Throughput training dengan pipeline yang sama seperti
+    train_fashion_mnist_model.py. Data sintetis dipakai karena waktu
+    per step tidak bergantung pada isi gambar.
+    """
+    rng = np.random.default_rng(0)
+    x = rng.integers(0, 256, size=(num_samples, 28, 28), dtype=np.uint8)
+    y = rng.integers(0, 10, size=num_samples, dtype=np.uint8)
+
+    model = compile_model(build_model())
+    logger = ThroughputLogger(num_samples=num_samples, batch_size=batch_size)
+    model.fit(make_dataset(x, y, batch_size=batch_size, shuffle=True),
+              epochs=epochs, callbacks=[logger], verbose=0)
+
+    return {'training.samples_per_s': metric(logger.summary()['samples_per_s'],
+                                             'samples/s', 'higher')}
+
+# ============================================================================
+# PERBANDINGAN DENGAN BASELINE
+# ============================================================================
+
+def compare_with_baseline(metrics, baseline_metrics, tolerance):
+    """
+    Membandingkan setiap metric dengan baseline.
+    Return: list (nama, nilai baseline, nilai sekarang, perubahan relatif, regresi?)
+    """
+    rows = []
+    for name, current in metrics.items():
+        base = baseline_metrics.get(name)
+        if base is None or base['value'] == 0:
+            continue
+
+        change = (current['value'] - base['value']) / base['value']
+        # Untuk metric "lower is better", kenaikan berarti lebih buruk
+        worse = change if current['better'] == 'lower' else -change
+        rows.append((name, base['value'], current['value'], change, worse > tolerance))
+    return rows
+
+
+def baseline_mismatch(results, baseline):
+    """
+    Mengecek apakah baseline sebanding dengan hasil sekarang.
+    Return: alasan (str) jika tidak sebanding, None jika sebanding
+    """
+    if baseline.get('benchmark_version') != results['benchmark_version']:
+        return (f"baseline dibuat oleh benchmark versi {baseline.get('benchmark_version', 1)}, "
+                f"sekarang versi {results['benchmark_version']}")
+
+    base_quick = baseline.get('environment', {}).get('quick')
+    quick = results['environment']['quick']
+    if base_quick != quick:
+        modes = {True: '--quick', False: 'penuh', None: 'tidak diketahui'}
+        return f"baseline dijalankan dengan mode {modes[base_quick]}, sekarang mode {modes[quick]}"
+    return None
+
+
+def check_against_baseline(results, baseline, tolerance, baseline_path=BASELINE_PATH):
+    """
+    Menampilkan perbandingan hasil dengan baseline.
+
+    Return:
+        exit code: 0 tanpa regresi, 1 jika ada regresi, 2 jika baseline
+        tidak sebanding (lihat baseline_mismatch())
+    """
+    mismatch = baseline_mismatch(results, baseline)
+    if mismatch:
+        print(f"\n⛔ Baseline '{baseline_path}' tidak sebanding: {mismatch}")
+        print("   Jalankan ulang dengan mode yang sama atau buat baseline baru dengan --save-baseline")
+        return 2
+
+    rows = compare_with_baseline(results['metrics'], baseline['metrics'], tolerance)
+    regressions = [row for row in rows if row[4]]
+
+    print(f"\n📈 Perbandingan dengan baseline ({baseline.get('timestamp', '?')}), "
+          f"toleransi {tolerance:.0%}:")
+    for name, base_value, value, change, regressed in rows:
+        status = "❌ REGRESI" if regressed else "✅"
+        print(f"   {name:<40}{base_value:>12,.3f} → {value:>12,.3f} ({change:+.1%}) {status}")
+
+    if regressions:
+        print(f"\n❌ {len(regressions)} metric mengalami regresi")
+        return 1
+
+    print("\n✅ Tidak ada regresi performa")
+    return 0
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark suite Fashion MNIST")
+    parser.add_argument("--model", default=MODEL_PATH,
+                        help=f"Path model (default: {MODEL_PATH})")
+    parser.add_argument("--output", default=RESULTS_PATH,
+                        help=f"File JSON hasil benchmark (default: {RESULTS_PATH})")
+    parser.add_argument("--baseline", default=BASELINE_PATH,
+                        help=f"File JSON baseline (default: {BASELINE_PATH})")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Simpan hasil ini sebagai baseline baru")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"Batas regresi relatif (default: {DEFAULT_TOLERANCE})")
+    parser.add_argument("--quick", action="store_true",
+                        help="Pengulangan lebih sedikit (lebih cepat, kurang presisi)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    # Jumlah pengulangan: mode quick untuk cek cepat di laptop/CI
+    cold_repeat = 1 if args.quick else 3
+    latency_repeat = 200 if args.quick else 1000
+    throughput_seconds = 0.5 if args.quick else 2.0
+    evaluate_repeat = 1 if args.quick else 3
+    train_samples, train_epochs = (10000, 2) if args.quick else (60000, 2)
+
+    model = tf.keras.models.load_model(args.model)
+    infer = build_inference_fn(model)
+    x_test, y_test, data_source = load_test_set()
+
+    metrics = {}
+
+    print("🚀 [1/5] Cold start: startup script CLI dan prediksi pertama per entry point...")
+    metrics.update(bench_startup(cold_repeat))
+    metrics.update(bench_first_prediction(args.model, x_test[0], cold_repeat))
+
+    print("🚀 [2/5] Latency satu gambar (jalur predict_custom_image.py)...")
+    metrics.update(bench_single_image_latency(infer, x_test, latency_repeat))
+
+    print("🚀 [3/5] Throughput inferensi per batch size...")
+    metrics.update(bench_batch_throughput(infer, x_test, throughput_seconds))
+
+    print("🚀 [4/5] model.evaluate pada 10.000 gambar test...")
+    metrics.update(bench_evaluate(model, x_test, y_test, evaluate_repeat))
+
+    print("🚀 [5/5] Throughput training...")
+    metrics.update(bench_training(train_samples, train_epochs))
+
+    results = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'benchmark_version': BENCHMARK_VERSION,
+        'environment': {
+            'python': platform.python_version(),
+            'tensorflow': tf.__version__,
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'dataset': data_source,
+            'quick': args.quick,
+        },
+        'metrics': metrics,
+    }
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n💾 Hasil disimpan di '{args.output}'")
+
+    print(f"\n📊 Hasil benchmark:")
+    for name, m in metrics.items():
+        print(f"   {name:<40}{m['value']:>14,.3f} {m['unit']}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n📌 Baseline baru disimpan di '{args.baseline}'")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nℹ️  Baseline '{args.baseline}' belum ada, jalankan dengan --save-baseline")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    return check_against_baseline(results, baseline, args.tolerance, args.baseline)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,568 @@
+"""
+Fashion MNIST Bulk Prediction Job
+=================================
+Job prediksi massal (jutaan gambar) yang dibagi ke beberapa shard dan
+dijalankan oleh beberapa worker process, atau beberapa host yang berbagi
+filesystem. Berbeda dengan predict_custom_image.py, folder job tidak pernah
+dihapus: job yang terhenti dilanjutkan dari titik terakhir.
+
+Cara kerja:
+1. Daftar input (folder, atau file daftar path satu per baris) dibagi ke
+   `--shards` shard secara deterministik: shard = crc32(path) % shards.
+   Pembagian tidak bergantung pada urutan listing maupun host.
+2. Setiap shard diproses oleh satu worker process (TensorFlow dengan
+   thread terbatas per process) dan hasilnya di-append ke
+   <job>/shard-00003.jsonl, di-flush per batch. File ini sekaligus
+   progress: saat resume, path yang sudah ada di file dilewati.
+   Gambar yang gagal dibaca/di-decode (file rusak, hilang, tidak bisa
+   dibaca) tidak menghentikan job: dicatat ke <job>/shard-00003.errors.jsonl
+   dan dilewati, juga saat resume (hapus file errors untuk mencoba lagi).
+3. Shard yang selesai ditandai <job>/shard-00003.done berisi
+   prediction_count shard tersebut dan digest daftar input shard. Jika
+   daftar input shard berubah (gambar baru masuk atau dihapus), digest
+   tidak cocok lagi dan run berikutnya memproses ulang shard itu: hanya
+   gambar baru yang diprediksi, hasil gambar yang sudah dihapus dibuang.
+4. `merge` menggabungkan semua shard menjadi <job>/predictions.jsonl,
+   <job>/errors.jsonl, dan <job>/summary.json (prediction_count total).
+
+Struktur folder job:
+    <job>/job.json                  # jumlah shard & fingerprint model
+    <job>/shard-NNNNN.jsonl         # hasil per shard (format prediction_output.py)
+    <job>/shard-NNNNN.errors.jsonl  # gambar yang gagal dibaca {"filename", "error"}
+    <job>/shard-NNNNN.done          # penanda shard selesai
+    <job>/predictions.jsonl         # hasil gabungan (setelah merge)
+    <job>/errors.jsonl              # error gabungan (setelah merge)
+    <job>/summary.json              # prediction_count gabungan (setelah merge)
+
+Penggunaan:
+    python bulk_predict.py run --input test-image --job bulk-job --shards 16 --workers 4
+    python bulk_predict.py run --input-list paths.txt --job bulk-job --shards 64 --shard-ids 0-31  # host A
+    python bulk_predict.py run --input-list paths.txt --job bulk-job --shards 64 --shard-ids 32-63 # host B
+    python bulk_predict.py status --job bulk-job
+    python bulk_predict.py merge --job bulk-job
+
+Satu shard hanya boleh dikerjakan oleh satu process pada satu waktu; bagi
+shard antar host dengan --shard-ids yang tidak tumpang tindih.
+
+Dibuat oleh: Fathih Apriandi
+"""
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+
+from predict_custom_image import (
+    IMAGE_EXTENSIONS, LABELS, MODEL_PATH, build_inference_fn, decode_prediction,
+    iter_preprocessed_batches, predict_batch, preprocess_or_error,
+)
+from prediction_manifest import model_fingerprint
+from prediction_output import PredictionWriter
+
+# ============================================================================
+# KONFIGURASI
+# ============================================================================
+
+# Folder job default
+JOB_FOLDER = 'bulk-job'
+
+# Default jumlah shard, worker, dan ukuran batch
+DEFAULT_SHARDS = 16
+DEFAULT_WORKERS = os.cpu_count() or 1
+DEFAULT_BATCH_SIZE = 256
+
+JOB_FILENAME = 'job.json'
+MERGED_FILENAME = 'predictions.jsonl'
+MERGED_ERRORS_FILENAME = 'errors.jsonl'
+SUMMARY_FILENAME = 'summary.json'
+ERRORS_SUFFIX = '.errors.jsonl'
+
+# ============================================================================
+# FUNGSI: SHARDING
+# ============================================================================
+
+def shard_of(path, num_shards):
+    """
+    Shard untuk satu path input. crc32 (bukan hash() bawaan Python yang
+    diacak per process) agar hasilnya sama di setiap worker dan host.
+    """
+    return zlib.crc32(path.encode('utf-8')) % num_shards
+
+
+def list_inputs(input_folder, input_list=None):
+    """
+    Daftar path input relatif terhadap input_folder.
+
+    Parameter:
+        input_list: file teks berisi satu path per baris (relatif terhadap
+                    input_folder); None = semua gambar di input_folder
+    """
+    if input_list is not None:
+        with open(input_list) as f:
+            return [line.strip() for line in f if line.strip()]
+
+    # os.scandir lebih murah dari os.listdir + stat untuk folder besar
+    with os.scandir(input_folder) as entries:
+        return [
+            entry.name for entry in entries
+            if entry.is_file() and entry.name.lower().endswith(IMAGE_EXTENSIONS)
+        ]
+
+
+def group_by_shard(paths, num_shards):
+    """Return: list berisi daftar path (terurut) untuk setiap shard."""
+    shards = [[] for _ in range(num_shards)]
+    for path in paths:
+        shards[shard_of(path, num_shards)].append(path)
+    for shard in shards:
+        shard.sort()
+    return shards
+
+
+def parse_shard_ids(text, num_shards):
+    """'0-3,7' → [0, 1, 2, 3, 7]; None = semua shard."""
+    if text is None:
+        return list(range(num_shards))
+
+    shard_ids = set()
+    for part in text.split(','):
+        start, _, end = part.partition('-')
+        shard_ids.update(range(int(start), int(end or start) + 1))
+
+    invalid = [i for i in shard_ids if not 0 <= i < num_shards]
+    if invalid:
+        raise ValueError(f"shard di luar 0-{num_shards - 1}: {sorted(invalid)}")
+    return sorted(shard_ids)
+
+
+def listing_digest(filenames):
+    """
+    Digest daftar input satu shard (urutan tidak berpengaruh). Disimpan di
+    penanda .done; jika berbeda, shard diproses ulang.
+    """
+    digest = hashlib.sha256()
+    for filename in sorted(filenames):
+        digest.update(filename.encode('utf-8') + b'\n')
+    return digest.hexdigest()
+
+# ============================================================================
+# FUNGSI: FILE JOB & PROGRESS SHARD
+# ============================================================================
+
+def shard_path(job_folder, shard_id, suffix='.jsonl'):
+    return os.path.join(job_folder, f"shard-{shard_id:05d}{suffix}")
+
+
+def _write_json_atomic(path, data):
+    # File sementara lalu rename, sama seperti PredictionManifest.save()
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def open_job(job_folder, num_shards, fingerprint, input_folder=None, input_list=None):
+    """
+    Membuat job.json, atau memvalidasi job yang sudah ada.
+
+    Jumlah shard dan model harus sama dengan run sebelumnya: shard lain
+    (mungkin di host lain) sudah dibagi dan diprediksi dengan nilai itu.
+    Sumber input run terakhir disimpan agar status dan merge bisa membuat
+    ulang daftar input setiap shard (lihat job_shards()).
+    """
+    os.makedirs(job_folder, exist_ok=True)
+    path = os.path.join(job_folder, JOB_FILENAME)
+
+    inputs = {}
+    if input_folder is not None:
+        inputs = {
+            'input_folder': os.path.abspath(input_folder),
+            'input_list': os.path.abspath(input_list) if input_list is not None else None,
+        }
+
+    if not os.path.exists(path):
+        job = {'num_shards': num_shards, 'model_fingerprint': fingerprint, **inputs}
+        _write_json_atomic(path, job)
+        return job
+
+    with open(path) as f:
+        job = json.load(f)
+    if job['num_shards'] != num_shards:
+        raise ValueError(f"job '{job_folder}' dibuat dengan {job['num_shards']} shard, "
+                         f"bukan {num_shards}")
+    if job['model_fingerprint'] != fingerprint:
+        raise ValueError(f"job '{job_folder}' dibuat dengan model lain; "
+                         f"gunakan folder job baru")
+
+    if inputs and any(job.get(key) != value for key, value in inputs.items()):
+        job.update(inputs)
+        _write_json_atomic(path, job)
+    return job
+
+
+def job_shards(job):
+    """
+    Daftar input setiap shard, dibuat ulang dari sumber input di job.json.
+
+    Return:
+        list daftar path per shard, atau None untuk job.json lama yang
+        belum menyimpan sumber input
+    """
+    if job.get('input_folder') is None:
+        return None
+    filenames = list_inputs(job['input_folder'], job.get('input_list'))
+    return group_by_shard(filenames, job['num_shards'])
+
+
+def read_shard_results(path):
+    """
+    Membaca hasil shard yang sudah tersimpan.
+
+    Baris terakhir yang terpotong (process mati saat menulis) dibuang dari
+    file agar append berikutnya dimulai di baris baru.
+
+    Return:
+        list dictionary {"filename", "label", "confidence"}
+    """
+    if not os.path.exists(path):
+        return []
+
+    with open(path, 'rb+') as f:
+        data = f.read()
+        complete = data.rfind(b'\n') + 1
+        if complete < len(data):
+            f.truncate(complete)
+
+    return [json.loads(line) for line in data[:complete].splitlines()]
+
+
+def _write_jsonl_atomic(path, records):
+    # Dipakai saat hasil input yang sudah dihapus dibuang dari file shard
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+    os.replace(tmp_path, path)
+
+
+def read_current_results(path, filenames):
+    """
+    read_shard_results() tanpa baris untuk file yang sudah tidak ada di
+    daftar input shard; file ditulis ulang jika ada baris yang dibuang.
+    """
+    results = read_shard_results(path)
+    current = [result for result in results if result['filename'] in filenames]
+    if len(current) < len(results):
+        _write_jsonl_atomic(path, current)
+    return current
+
+
+def shard_is_done(job_folder, shard_id, filenames):
+    """True jika shard punya penanda .done untuk daftar input yang sama."""
+    path = shard_path(job_folder, shard_id, '.done')
+    if not os.path.exists(path):
+        return False
+    with open(path) as f:
+        return json.load(f).get('inputs') == listing_digest(filenames)
+
+
+def count_labels(results, labels):
+    """prediction_count {label: jumlah} dengan urutan label tetap."""
+    prediction_count = {label: 0 for label in labels}
+    for result in results:
+        prediction_count[result['label']] += 1
+    return prediction_count
+
+# ============================================================================
+# FUNGSI: WORKER (SATU SHARD)
+# ============================================================================
+
+@lru_cache(maxsize=1)
+def load_worker_model(model_path, threads):
+    """
+    Memuat model sekali per worker process (bukan sekali per shard).
+
+    Parameter:
+        threads: thread TensorFlow untuk process ini. Dibatasi agar N worker
+                 tidak saling berebut core (throughput naik ±linear per worker).
+
+    Return:
+        fungsi inferensi dari build_inference_fn()
+    """
+    import tensorflow as tf
+    # Harus dipanggil sebelum operasi TensorFlow pertama di process ini
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+    return build_inference_fn(tf.keras.models.load_model(model_path))
+
+
+def run_shard(job_folder, shard_id, input_folder, filenames, model_path=MODEL_PATH,
+              batch_size=DEFAULT_BATCH_SIZE, threads=1):
+    """
+    Memprediksi satu shard di worker process; dilanjutkan dari hasil dan
+    error yang sudah ada di shard-NNNNN.jsonl / shard-NNNNN.errors.jsonl.
+
+    Return:
+        (shard_id, jumlah gambar diproses di run ini, prediction_count shard,
+         jumlah gambar shard yang gagal dibaca)
+    """
+    results_path = shard_path(job_folder, shard_id)
+    errors_path = shard_path(job_folder, shard_id, ERRORS_SUFFIX)
+    current = set(filenames)
+    done = {
+        record['filename']
+        for path in (results_path, errors_path)
+        for record in read_current_results(path, current)
+    }
+    remaining = [f for f in filenames if f not in done]
+
+    if remaining:
+        infer = load_worker_model(model_path, threads)
+
+        # mode 'none': tanpa file per gambar, hasil hanya ke file shard
+        with PredictionWriter(job_folder, mode='none', predictions_path=results_path,
+                              append=True) as writer:
+            # 1 thread preprocessing: decode batch berikutnya selagi batch ini diprediksi
+            for batch_files, img_arrays, errors in iter_preprocessed_batches(
+                    input_folder, remaining, batch_size, workers=1,
+                    preprocess=preprocess_or_error):
+                readable = [i for i, error in enumerate(errors) if error is None]
+                if readable:
+                    predictions = predict_batch(infer, [img_arrays[i] for i in readable])
+                    for i, probabilities in zip(readable, predictions):
+                        label, confidence = decode_prediction(probabilities)
+                        writer.write(None, None, batch_files[i], label, confidence)
+
+                failed = [{'filename': filename, 'error': error}
+                          for filename, error in zip(batch_files, errors) if error is not None]
+                if failed:
+                    # Jarang terjadi: file errors hanya dibuka jika ada yang gagal
+                    with open(errors_path, 'a') as f:
+                        for record in failed:
+                            f.write(json.dumps(record) + "\n")
+
+                # Checkpoint: batch ini tidak diproses ulang jika process mati
+                writer.flush()
+
+    prediction_count = count_labels(read_shard_results(results_path), LABELS)
+    error_count = len(read_shard_results(errors_path))
+    _write_json_atomic(shard_path(job_folder, shard_id, '.done'), {
+        'count': sum(prediction_count.values()),
+        'errors': error_count,
+        'inputs': listing_digest(filenames),
+        'prediction_count': prediction_count,
+    })
+    return shard_id, len(remaining), prediction_count, error_count
+
+# ============================================================================
+# FUNGSI: ORKESTRASI JOB
+# ============================================================================
+
+def run_job(input_folder, job_folder=JOB_FOLDER, input_list=None, num_shards=DEFAULT_SHARDS,
+            shard_ids=None, workers=DEFAULT_WORKERS, batch_size=DEFAULT_BATCH_SIZE,
+            model_path=MODEL_PATH):
+    """
+    Menjalankan shard yang belum selesai dengan `workers` process paralel.
+
+    Return:
+        jumlah gambar yang diproses di run ini (termasuk yang gagal dibaca)
+    """
+    open_job(job_folder, num_shards, model_fingerprint(model_path), input_folder, input_list)
+    shards = group_by_shard(list_inputs(input_folder, input_list), num_shards)
+
+    # Shard yang daftar inputnya berubah sejak selesai ikut diproses lagi
+    pending = [
+        i for i in parse_shard_ids(shard_ids, num_shards)
+        if not shard_is_done(job_folder, i, shards[i])
+    ]
+    print(f"📦 {sum(len(s) for s in shards):,} gambar, {num_shards} shard "
+          f"({len(pending)} belum selesai), {workers} worker")
+    if not pending:
+        return 0
+
+    workers = max(1, min(workers, len(pending)))
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    predicted = 0
+
+    # spawn: setiap worker memulai TensorFlow sendiri (fork tidak aman untuk TF)
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = [
+            pool.submit(run_shard, job_folder, i, input_folder, shards[i],
+                        model_path, batch_size, threads)
+            for i in pending
+        ]
+        for finished, future in enumerate(as_completed(futures), start=1):
+            shard_id, count, prediction_count, error_count = future.result()
+            predicted += count
+            failed = f", {error_count:,} gagal dibaca" if error_count else ""
+            print(f"   ✅ Shard {shard_id:>5}: {count:,} diproses, "
+                  f"total {sum(prediction_count.values()):,}{failed} ({finished}/{len(pending)})")
+    return predicted
+
+
+def job_status(job_folder):
+    """
+    Status setiap shard. Penanda .done hanya dihitung selesai jika digest
+    daftar inputnya sama dengan isi folder/daftar input saat ini.
+
+    Return:
+        (num_shards, list shard selesai, list shard basi (.done untuk daftar
+        input lama), {shard: jumlah hasil} shard yang sudah dimulai tapi
+        belum selesai)
+    """
+    with open(os.path.join(job_folder, JOB_FILENAME)) as f:
+        job = json.load(f)
+    num_shards = job['num_shards']
+    shards = job_shards(job)
+
+    done, stale, partial = [], [], {}
+    for i in range(num_shards):
+        if os.path.exists(shard_path(job_folder, i, '.done')):
+            if shards is None or shard_is_done(job_folder, i, shards[i]):
+                done.append(i)
+            else:
+                stale.append(i)
+        elif os.path.exists(shard_path(job_folder, i)):
+            with open(shard_path(job_folder, i), 'rb') as f:
+                partial[i] = sum(1 for _ in f)
+    return num_shards, done, stale, partial
+
+
+def merge_job(job_folder=JOB_FOLDER):
+    """
+    Menggabungkan hasil semua shard menjadi predictions.jsonl, errors.jsonl,
+    dan summary.json. Semua shard harus sudah selesai untuk daftar input
+    saat ini.
+
+    Return:
+        prediction_count gabungan
+    """
+    num_shards, done, stale, _ = job_status(job_folder)
+    if stale:
+        raise RuntimeError(f"{len(stale)} shard selesai untuk daftar input lama "
+                           f"(input berubah), jalankan 'run' lagi: {stale[:10]}")
+    missing = sorted(set(range(num_shards)) - set(done))
+    if missing:
+        raise RuntimeError(f"{len(missing)} shard belum selesai: {missing[:10]}")
+
+    prediction_count = {}
+    error_count = 0
+    for i in range(num_shards):
+        with open(shard_path(job_folder, i, '.done')) as f:
+            marker = json.load(f)
+        error_count += marker.get('errors', 0)
+        for label, count in marker['prediction_count'].items():
+            prediction_count[label] = prediction_count.get(label, 0) + count
+
+    for merged_name, suffix in ((MERGED_FILENAME, '.jsonl'),
+                                (MERGED_ERRORS_FILENAME, ERRORS_SUFFIX)):
+        merged_path = os.path.join(job_folder, merged_name)
+        with open(merged_path + '.tmp', 'wb') as merged:
+            for i in range(num_shards):
+                # Shard tanpa gambar (atau tanpa error) tidak punya file
+                if not os.path.exists(shard_path(job_folder, i, suffix)):
+                    continue
+                # Salin byte apa adanya: tidak perlu parse ulang jutaan baris
+                with open(shard_path(job_folder, i, suffix), 'rb') as shard:
+                    while chunk := shard.read(1024 * 1024):
+                        merged.write(chunk)
+        os.replace(merged_path + '.tmp', merged_path)
+
+    _write_json_atomic(os.path.join(job_folder, SUMMARY_FILENAME), {
+        'count': sum(prediction_count.values()),
+        'errors': error_count,
+        'prediction_count': prediction_count,
+    })
+    return prediction_count
+
+
+def print_job_summary(prediction_count, job_folder):
+    """Ringkasan distribusi prediksi (format sama dengan predict_custom_image.py)."""
+    total_images = sum(prediction_count.values())
+    print("\n" + "=" * 60)
+    print(f"📊 RINGKASAN HASIL: {total_images:,} gambar")
+    print("=" * 60)
+    for label, count in prediction_count.items():
+        percentage = count / total_images * 100 if total_images else 0
+        print(f"   {label:<15}: {count:>9,} gambar ({percentage:5.1f}%)")
+    print(f"\n💾 Hasil gabungan: '{os.path.join(job_folder, MERGED_FILENAME)}'")
+
+    errors_path = os.path.join(job_folder, MERGED_ERRORS_FILENAME)
+    if os.path.exists(errors_path) and os.path.getsize(errors_path):
+        with open(errors_path, 'rb') as f:
+            error_count = sum(1 for _ in f)
+        print(f"⚠️  {error_count:,} gambar gagal dibaca: '{errors_path}'")
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Prediksi massal Fashion MNIST dengan shard yang bisa di-resume"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Prediksi shard yang belum selesai")
+    run.add_argument("--job", default=JOB_FOLDER, help=f"Folder job (default: {JOB_FOLDER})")
+    run.add_argument("--input", default='.',
+                     help="Folder gambar, atau folder dasar path di --input-list (default: .)")
+    run.add_argument("--input-list", default=None,
+                     help="File daftar path gambar, satu per baris (default: isi --input)")
+    run.add_argument("--shards", type=int, default=DEFAULT_SHARDS,
+                     help=f"Jumlah shard; harus sama di setiap run/host (default: {DEFAULT_SHARDS})")
+    run.add_argument("--shard-ids", default=None,
+                     help="Shard yang dikerjakan host ini, contoh: 0-31 atau 0,4,8 (default: semua)")
+    run.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                     help=f"Jumlah worker process (default: {DEFAULT_WORKERS})")
+    run.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                     help=f"Gambar per forward pass (default: {DEFAULT_BATCH_SIZE})")
+    run.add_argument("--model", default=MODEL_PATH, help=f"File model (default: {MODEL_PATH})")
+    run.add_argument("--merge", action="store_true",
+                     help="Langsung merge jika semua shard sudah selesai")
+
+    for name, help_text in (("status", "Progress setiap shard"),
+                            ("merge", "Gabungkan hasil semua shard")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("--job", default=JOB_FOLDER,
+                             help=f"Folder job (default: {JOB_FOLDER})")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if args.command == "run":
+        start = time.perf_counter()
+        predicted = run_job(args.input, args.job, args.input_list, args.shards,
+                            args.shard_ids, args.workers, args.batch_size, args.model)
+        elapsed = time.perf_counter() - start
+        print(f"⏱️  {predicted:,} gambar dalam {elapsed:.1f}s "
+              f"({predicted / elapsed:,.0f} gambar/detik)")
+
+        _, done, _, _ = job_status(args.job)
+        if args.merge and len(done) == args.shards:
+            print_job_summary(merge_job(args.job), args.job)
+        return
+
+    if args.command == "status":
+        num_shards, done, stale, partial = job_status(args.job)
+        print(f"📦 Job '{args.job}': {len(done)}/{num_shards} shard selesai")
+        if stale:
+            print(f"   ⚠️  {len(stale)} shard basi (daftar input berubah sejak selesai): "
+                  f"{stale[:10]}")
+        for shard_id, count in sorted(partial.items()):
+            print(f"   ⏳ Shard {shard_id:>5}: {count:,} hasil (belum selesai)")
+        return
+
+    print_job_summary(merge_job(args.job), args.job)
+
+
+if __name__ == "__main__":
+    main()
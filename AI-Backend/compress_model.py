@@ -0,0 +1,363 @@
+"""
+Fashion MNIST Model Compression
+===============================
+Script untuk mengecilkan model 784→512→10 hasil train_fashion_mnist_model.py
+dan membandingkan akurasi dengan kecepatannya.
+
+Metode:
+1. Magnitude pruning (unstructured): weights dengan |w| terkecil di setiap
+   kernel di-nol-kan sampai `sparsity` tercapai, lalu fine-tune singkat
+   dengan mask tetap. Arsitektur tidak berubah, jadi matmul dense tidak
+   lebih cepat; keuntungannya ada di ukuran file setelah dikompres.
+2. Structured pruning: hanya `hidden_units` neuron hidden terpenting yang
+   dipertahankan (skor = norma weight masuk × norma weight keluar),
+   hasilnya model build_model(hidden_units) yang benar-benar lebih kecil.
+3. Knowledge distillation: student build_model(hidden_units) dilatih
+   meniru probabilitas teacher (fashion_mnist_model.keras) yang dilunakkan
+   dengan temperature, ditambah loss label asli.
+
+Setiap model disimpan sebagai .keras tanpa state optimizer (siap serving,
+bisa dipakai predict_custom_image.py dan export_numpy_model.py), lalu
+dilaporkan: akurasi test, jumlah parameter, ukuran file, latency batch 1
+dan batch 256. Model yang tidak didominasi model lain (akurasi lebih
+tinggi atau biaya lebih rendah) ditandai sebagai Pareto-optimal.
+
+Penggunaan:
+    python compress_model.py                                   # semua metode, setting default
+    python compress_model.py --sparsity 0.5 0.8 0.95
+    python compress_model.py --prune-hidden 256 128 --distill-hidden 128 64 32
+    python compress_model.py --distill-epochs 10 --temperature 4 --alpha 0.1
+
+Dibuat oleh: Fathih Apriandi
+"""
+
+import argparse
+import json
+import os
+import zlib
+
+import tensorflow as tf
+import numpy as np
+
+from dataset_cache import load_data
+from numpy_inference import measure_latency
+from predict_custom_image import build_inference_fn
+from train_fashion_mnist_model import build_model, compile_model
+from training_pipeline import make_dataset, save_model_atomic
+
+# ============================================================================
+# KONFIGURASI DEFAULT
+# ============================================================================
+
+# Model teacher / model yang dikompres
+MODEL_PATH = 'fashion_mnist_model.keras'
+
+# Folder hasil: satu file .keras per model + laporan JSON
+OUTPUT_DIR = 'compressed-models'
+REPORT_FILENAME = 'compression_report.json'
+
+DEFAULT_SPARSITY = (0.5, 0.9)
+DEFAULT_PRUNE_HIDDEN = (128,)
+DEFAULT_DISTILL_HIDDEN = (128, 64)
+
+# Fine-tune setelah pruning cukup singkat; distillation melatih dari nol
+DEFAULT_FINETUNE_EPOCHS = 2
+DEFAULT_DISTILL_EPOCHS = 5
+DEFAULT_BATCH_SIZE = 128
+
+# Temperature melunakkan probabilitas teacher; alpha = bobot loss label asli
+DEFAULT_TEMPERATURE = 4.0
+DEFAULT_ALPHA = 0.1
+
+# Pengulangan pengukuran latency per batch size
+LATENCY_REPEAT = 50
+
+# Mencegah log(0) saat probabilitas softmax diubah kembali menjadi logit
+EPSILON = 1e-7
+
+# ============================================================================
+# FUNGSI: PRUNING
+# ============================================================================
+
+def dense_layers(model):
+    """Layer Dense model secara berurutan (Flatten tidak punya weights)."""
+    return [layer for layer in model.layers if isinstance(layer, tf.keras.layers.Dense)]
+
+
+def magnitude_mask(kernel, sparsity):
+    """
+    Mask 0/1 yang menyisakan (1 - sparsity) weights dengan |w| terbesar.
+    """
+    k = int(round(kernel.size * sparsity))
+    if k == 0:
+        return np.ones_like(kernel, dtype=np.float32)
+    # Nilai |w| ke-k terkecil sebagai threshold (argpartition, tanpa sort penuh)
+    threshold = np.partition(np.abs(kernel).ravel(), k - 1)[k - 1]
+    return (np.abs(kernel) > threshold).astype(np.float32)
+
+
+class PruningMask(tf.keras.callbacks.Callback):
+    """
+    Mengalikan kernel dengan mask setelah setiap step training, agar weights
+    yang sudah di-prune tetap nol selama fine-tune.
+    """
+
+    def __init__(self, masks):
+        super().__init__()
+        self.masks = masks
+
+    def on_train_batch_end(self, batch, logs=None):
+        for layer, mask in zip(dense_layers(self.model), self.masks):
+            layer.kernel.assign(layer.kernel * mask)
+
+
+def prune_magnitude(model, sparsity):
+    """
+    Salinan model dengan `sparsity` bagian setiap kernel di-nol-kan.
+
+    Return:
+        (model hasil pruning, list mask per layer Dense)
+    """
+    pruned = tf.keras.models.clone_model(model)
+    pruned.set_weights(model.get_weights())
+
+    masks = []
+    for layer in dense_layers(pruned):
+        kernel, bias = layer.get_weights()
+        mask = magnitude_mask(kernel, sparsity)
+        layer.set_weights([kernel * mask, bias])
+        masks.append(tf.constant(mask))
+    return pruned, masks
+
+
+def select_hidden_units(kernel_in, kernel_out, hidden_units):
+    """
+    Index neuron hidden yang dipertahankan pada structured pruning.
+
+    Neuron yang weights masuk atau keluarnya kecil hampir tidak berpengaruh
+    ke output, jadi skor = ||kolom kernel_in|| × ||baris kernel_out||.
+    Return: index terurut (urutan neuron asli dipertahankan).
+    """
+    scores = np.linalg.norm(kernel_in, axis=0) * np.linalg.norm(kernel_out, axis=1)
+    return np.sort(np.argsort(-scores)[:hidden_units])
+
+
+def prune_hidden_units(model, hidden_units):
+    """Model build_model(hidden_units) berisi neuron hidden terpenting dari `model`."""
+    (kernel_in, bias_in), (kernel_out, bias_out) = (
+        layer.get_weights() for layer in dense_layers(model)
+    )
+    keep = select_hidden_units(kernel_in, kernel_out, hidden_units)
+
+    pruned = build_model(hidden_units)
+    pruned.set_weights([kernel_in[:, keep], bias_in[keep], kernel_out[keep], bias_out])
+    return pruned
+
+# ============================================================================
+# FUNGSI: KNOWLEDGE DISTILLATION
+# ============================================================================
+
+def distillation_loss(temperature=DEFAULT_TEMPERATURE, alpha=DEFAULT_ALPHA):
+    """
+    Loss distillation untuk model dengan output softmax.
+
+    y_true berisi [label, 10 probabilitas teacher]. log(probabilitas) sama
+    dengan logit dikurangi konstanta, jadi softmax(log(p) / T) adalah
+    distribusi yang dilunakkan dengan temperature T tanpa mengubah
+    arsitektur build_model(). Loss soft dikali T² (Hinton et al.) agar
+    skalanya sebanding dengan loss label asli.
+    """
+    def loss(y_true, y_pred):
+        labels = tf.cast(y_true[:, 0], tf.int32)
+        teacher_probs = y_true[:, 1:]
+
+        hard = tf.keras.losses.sparse_categorical_crossentropy(labels, y_pred)
+        soft_teacher = tf.nn.softmax(tf.math.log(teacher_probs + EPSILON) / temperature)
+        soft_student = tf.nn.log_softmax(tf.math.log(y_pred + EPSILON) / temperature)
+        soft = -tf.reduce_sum(soft_teacher * soft_student, axis=1) * temperature ** 2
+        return alpha * hard + (1 - alpha) * soft
+
+    return loss
+
+
+def distill(teacher_probs, x_train, y_train, hidden_units, epochs=DEFAULT_DISTILL_EPOCHS,
+            batch_size=DEFAULT_BATCH_SIZE, temperature=DEFAULT_TEMPERATURE,
+            alpha=DEFAULT_ALPHA, seed=None):
+    """
+    Melatih student build_model(hidden_units) dari probabilitas teacher.
+
+    Parameter:
+        teacher_probs: output teacher untuk x_train (dihitung sekali untuk
+                       semua student, bukan per step)
+    """
+    targets = np.column_stack([y_train.astype(np.float32), teacher_probs])
+    dataset = make_dataset(x_train, targets, batch_size=batch_size, shuffle=True, seed=seed)
+
+    student = build_model(hidden_units)
+    student.compile(optimizer=tf.optimizers.Adam(), loss=distillation_loss(temperature, alpha))
+    student.fit(dataset, epochs=epochs, verbose=0)
+    return student
+
+
+def finetune(model, x_train, y_train, epochs, batch_size=DEFAULT_BATCH_SIZE,
+             callbacks=None, seed=None):
+    """Fine-tune singkat dengan loss & optimizer yang sama seperti training asli."""
+    if epochs <= 0:
+        return model
+    dataset = make_dataset(x_train, y_train, batch_size=batch_size, shuffle=True, seed=seed)
+    compile_model(model).fit(dataset, epochs=epochs, callbacks=callbacks, verbose=0)
+    return model
+
+# ============================================================================
+# FUNGSI: SIMPAN & EVALUASI
+# ============================================================================
+
+def save_for_serving(model, path):
+    """
+    Menyimpan arsitektur + weights saja. State optimizer (2x ukuran weights
+    untuk Adam) dan loss custom tidak ikut, jadi file bisa dimuat dengan
+    tf.keras.models.load_model() biasa.
+    """
+    # get_config() hanya berisi arsitektur; clone_model/to_json ikut membawa
+    # konfigurasi compile sehingga optimizer ikut tersimpan
+    serving = type(model).from_config(model.get_config())
+    serving.set_weights(model.get_weights())
+    save_model_atomic(serving, path)
+
+
+def evaluate(model, path, x_test, y_test):
+    """
+    Akurasi, jumlah parameter, ukuran file, dan latency (median) lewat
+    jalur inferensi predict_custom_image.py (build_inference_fn).
+    """
+    infer = build_inference_fn(model)
+    predict = lambda x: infer(tf.convert_to_tensor(x)).numpy()
+
+    probabilities = np.concatenate([
+        predict(x_test[start:start + 256]) for start in range(0, len(x_test), 256)
+    ])
+    with open(path, 'rb') as f:
+        compressed_size = len(zlib.compress(f.read()))
+
+    return {
+        'accuracy': float((probabilities.argmax(axis=1) == y_test).mean()),
+        'params': int(model.count_params()),
+        'nonzero_params': int(sum(np.count_nonzero(w) for w in model.get_weights())),
+        'file_size_kb': os.path.getsize(path) / 1024,
+        'compressed_kb': compressed_size / 1024,
+        'latency_b1_ms': 1000 * float(np.median(measure_latency(predict, x_test[:1], LATENCY_REPEAT))),
+        'latency_b256_ms': 1000 * float(np.median(measure_latency(predict, x_test[:256], LATENCY_REPEAT))),
+    }
+
+
+def mark_pareto(rows, costs=('latency_b1_ms', 'latency_b256_ms', 'file_size_kb')):
+    """
+    Menandai model Pareto-optimal: tidak ada model lain yang akurasinya
+    sama/lebih tinggi DAN semua biayanya sama/lebih rendah (minimal satu
+    lebih baik).
+    """
+    def dominates(a, b):
+        no_worse = a['accuracy'] >= b['accuracy'] and all(a[c] <= b[c] for c in costs)
+        better = a['accuracy'] > b['accuracy'] or any(a[c] < b[c] for c in costs)
+        return no_worse and better
+
+    for row in rows:
+        row['pareto'] = not any(dominates(other, row) for other in rows if other is not row)
+    return rows
+
+
+def print_report(rows):
+    print(f"\n   {'Model':<22}{'Akurasi':>9}{'Params':>10}{'Non-zero':>10}{'File':>10}"
+          f"{'Deflate':>10}{'B=1 (ms)':>10}{'B=256 (ms)':>12}  Pareto")
+    for row in rows:
+        print(f"   {row['name']:<22}{row['accuracy'] * 100:>8.2f}%{row['params']:>10,}"
+              f"{row['nonzero_params']:>10,}{row['file_size_kb']:>7.0f} KB"
+              f"{row['compressed_kb']:>7.0f} KB{row['latency_b1_ms']:>10.3f}"
+              f"{row['latency_b256_ms']:>12.3f}  {'⭐' if row['pareto'] else ''}")
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Kompresi model Fashion MNIST (pruning & distillation) dan laporan perbandingan"
+    )
+    parser.add_argument("--model", default=MODEL_PATH,
+                        help=f"Model asli / teacher (default: {MODEL_PATH})")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR,
+                        help=f"Folder model hasil kompresi (default: {OUTPUT_DIR})")
+    parser.add_argument("--sparsity", type=float, nargs="*", default=list(DEFAULT_SPARSITY),
+                        help="Sparsity magnitude pruning, 0-1 (default: 0.5 0.9)")
+    parser.add_argument("--prune-hidden", type=int, nargs="*", default=list(DEFAULT_PRUNE_HIDDEN),
+                        help="Jumlah neuron hidden untuk structured pruning (default: 128)")
+    parser.add_argument("--distill-hidden", type=int, nargs="*",
+                        default=list(DEFAULT_DISTILL_HIDDEN),
+                        help="Jumlah neuron hidden student distillation (default: 128 64)")
+    parser.add_argument("--finetune-epochs", type=int, default=DEFAULT_FINETUNE_EPOCHS,
+                        help=f"Epoch fine-tune setelah pruning (default: {DEFAULT_FINETUNE_EPOCHS})")
+    parser.add_argument("--distill-epochs", type=int, default=DEFAULT_DISTILL_EPOCHS,
+                        help=f"Epoch training student (default: {DEFAULT_DISTILL_EPOCHS})")
+    parser.add_argument("--temperature", type=float, default=DEFAULT_TEMPERATURE,
+                        help=f"Temperature distillation (default: {DEFAULT_TEMPERATURE})")
+    parser.add_argument("--alpha", type=float, default=DEFAULT_ALPHA,
+                        help=f"Bobot loss label asli pada distillation (default: {DEFAULT_ALPHA})")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"Batch size fine-tune & distillation (default: {DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Seed shuffle dan inisialisasi weights (default: acak)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.seed is not None:
+        tf.keras.utils.set_random_seed(args.seed)
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    (x_train, y_train), (x_test, y_test) = load_data()
+    x_test = x_test.astype(np.float32) / 255.0
+    teacher = tf.keras.models.load_model(args.model)
+
+    # Setiap kandidat: (nama, fungsi yang membuat model)
+    candidates = [('original', lambda: teacher)]
+    for sparsity in args.sparsity:
+        def make(sparsity=sparsity):
+            pruned, masks = prune_magnitude(teacher, sparsity)
+            return finetune(pruned, x_train, y_train, args.finetune_epochs, args.batch_size,
+                            [PruningMask(masks)], args.seed)
+        candidates.append((f'pruned_s{round(sparsity * 100)}', make))
+    for hidden_units in args.prune_hidden:
+        candidates.append((f'pruned_h{hidden_units}', lambda hidden_units=hidden_units: finetune(
+            prune_hidden_units(teacher, hidden_units), x_train, y_train,
+            args.finetune_epochs, args.batch_size, seed=args.seed)))
+
+    if args.distill_hidden:
+        # Probabilitas teacher untuk seluruh data training, dihitung sekali
+        teacher_probs = teacher.predict(x_train.astype(np.float32) / 255.0,
+                                        batch_size=1024, verbose=0)
+        for hidden_units in args.distill_hidden:
+            candidates.append((f'student_h{hidden_units}', lambda hidden_units=hidden_units: distill(
+                teacher_probs, x_train, y_train, hidden_units, args.distill_epochs,
+                args.batch_size, args.temperature, args.alpha, args.seed)))
+
+    rows = []
+    for name, make in candidates:
+        print(f"🔄 {name}...")
+        model = make()
+        path = os.path.join(args.output_dir, f"{name}.keras")
+        save_for_serving(model, path)
+        rows.append({'name': name, 'path': path, **evaluate(model, path, x_test, y_test)})
+
+    mark_pareto(rows)
+    print(f"\n📊 Evaluasi pada {len(x_test):,} gambar test:")
+    print_report(rows)
+
+    report_path = os.path.join(args.output_dir, REPORT_FILENAME)
+    with open(report_path, 'w') as f:
+        json.dump(rows, f, indent=2)
+    print(f"\n💾 Model & laporan disimpan di '{args.output_dir}/' ({REPORT_FILENAME})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Fashion MNIST Dataset Cache
+===========================
+Module untuk memuat dataset Fashion MNIST dari cache .npy yang bisa
+di-memory-map, sebagai pengganti tf.keras.datasets.fashion_mnist.load_data().
+
+load_data() bawaan Keras mendekompresi arsip gzip menjadi array baru setiap
+kali dipanggil. Module ini mengonversi dataset SEKALI menjadi dua file:
+- images.npy: uint8 shape (70000, 28, 28) → 60.000 train lalu 10.000 test
+- labels.npy: uint8 shape (70000,)
+
+Setelah itu file dibuka dengan np.load(mmap_mode='r'): loading hampir
+instan, halaman memori hanya dibaca saat dipakai, dan x_train / x_test
+hanyalah view (slice) dari file yang sama, tanpa salinan dan tanpa
+np.concatenate. TensorFlow hanya di-import saat cache belum ada.
+
+Penggunaan:
+    from dataset_cache import load_data, load_all
+    (x_train, y_train), (x_test, y_test) = load_data()
+    images, labels = load_all()        # seluruh 70.000 gambar
+
+    python dataset_cache.py            # buat cache sekali di awal
+
+Dibuat oleh: Fathih Apriandi
+"""
+
+import os
+
+import numpy as np
+
+# ============================================================================
+# KONFIGURASI CACHE
+# ============================================================================
+
+# Folder cache, bisa diganti lewat environment variable FASHION_MNIST_CACHE
+CACHE_FOLDER = os.environ.get('FASHION_MNIST_CACHE', 'dataset-cache')
+
+IMAGES_FILE = 'images.npy'
+LABELS_FILE = 'labels.npy'
+
+# Jumlah gambar training; sisanya (10.000) adalah test split resmi
+NUM_TRAIN = 60000
+NUM_TOTAL = 70000
+
+# ============================================================================
+# FUNGSI PEMBUATAN CACHE
+# ============================================================================
+
+def _save_atomic(path, array):
+    """Menyimpan array ke .npy lewat file sementara lalu rename (atomic)."""
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            np.save(f, array)
+        os.replace(tmp_path, path)
+    finally:
+        # Save yang gagal tidak meninggalkan file .tmp setengah jadi
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def build_cache(cache_folder=CACHE_FOLDER):
+    """
+    Mengonversi dataset Keras menjadi images.npy dan labels.npy (uint8).
+    Hanya perlu dijalankan sekali; dipanggil otomatis oleh load_all().
+    """
+    # Import TensorFlow hanya di sini: pemanggilan berikutnya tidak perlu TF
+    import tensorflow as tf
+
+    (x_train, y_train), (x_test, y_test) = tf.keras.datasets.fashion_mnist.load_data()
+
+    os.makedirs(cache_folder, exist_ok=True)
+    _save_atomic(
+        os.path.join(cache_folder, IMAGES_FILE),
+        np.concatenate((x_train, x_test)).astype(np.uint8, copy=False),
+    )
+    _save_atomic(
+        os.path.join(cache_folder, LABELS_FILE),
+        np.concatenate((y_train, y_test)).astype(np.uint8, copy=False),
+    )
+
+# ============================================================================
+# FUNGSI LOAD DATASET
+# ============================================================================
+
+def load_all(cache_folder=CACHE_FOLDER, mmap=True):
+    """
+    Memuat seluruh 70.000 gambar dan label (train lalu test).
+
+    Parameter:
+        mmap: True = memory-map read-only (tanpa salinan), False = baca ke RAM
+
+    Return:
+        (images uint8 (70000, 28, 28), labels uint8 (70000,))
+    """
+    images_path = os.path.join(cache_folder, IMAGES_FILE)
+    labels_path = os.path.join(cache_folder, LABELS_FILE)
+
+    if not (os.path.exists(images_path) and os.path.exists(labels_path)):
+        build_cache(cache_folder)
+
+    mmap_mode = 'r' if mmap else None
+    return (
+        np.load(images_path, mmap_mode=mmap_mode),
+        np.load(labels_path, mmap_mode=mmap_mode),
+    )
+
+
+def load_data(cache_folder=CACHE_FOLDER, mmap=True):
+    """
+    Pengganti tf.keras.datasets.fashion_mnist.load_data() dengan format
+    return yang sama: ((x_train, y_train), (x_test, y_test)).
+    Semua array adalah view dari file cache (uint8, tanpa salinan).
+    """
+    images, labels = load_all(cache_folder, mmap)
+    return (
+        (images[:NUM_TRAIN], labels[:NUM_TRAIN]),
+        (images[NUM_TRAIN:], labels[NUM_TRAIN:]),
+    )
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    print(f"🔄 Menyiapkan cache dataset di '{CACHE_FOLDER}/'...")
+    images, labels = load_all()
+    print(f"✅ Cache siap: {len(images)} gambar, {len(labels)} label "
+          f"({images.nbytes / 1024 / 1024:.1f} MB uint8)")
@@ -1,93 +1,267 @@
 """
 Fashion MNIST Sample Image Downloader
 =====================================
-Script untuk mengunduh 100 gambar sample acak dari dataset Fashion MNIST
-dan menyimpannya dalam format PNG untuk keperluan testing.
+Script untuk mengambil gambar sample acak dari dataset Fashion MNIST
+dan menyimpannya untuk keperluan testing dan load testing.
+
+Fitur:
+1. Jumlah sample bebas, dari 1 sampai seluruh 70.000 gambar
+2. Seed tetap secara default, jadi sample yang sama selalu bisa dibuat ulang
+3. PNG ditulis paralel dengan process pool
+4. Format output:
+   - png : satu file PNG per gambar (default, dipakai predict_custom_image.py)
+   - npz : satu arsip berisi images, labels, dan indeks dataset
+   - tar : satu arsip tar berisi semua PNG + labels.csv
+5. Label asli (ground truth) disimpan ke labels.csv (kolom label = index
+   kelas 0-9, urutan sama dengan LABELS di predict_custom_image.py)
+
+Penggunaan:
+    python download_image.py                          # 100 PNG acak ke test-image/ (seed 42)
+    python download_image.py --seed 7                 # sample lain yang tetap reproducible
+    python download_image.py --count 70000            # seluruh dataset
+    python download_image.py --count 10000 --format npz --output samples.npz
+    python download_image.py --count 10000 --format tar --output samples.tar
 
 Dibuat oleh: Fathih Apriandi
 """
 
-import tensorflow as tf
-import numpy as np
 from PIL import Image
+import argparse
+import csv
+import io
 import os
-import random
+import tarfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from dataset_cache import CACHE_FOLDER, NUM_TOTAL, load_all
 
 # ============================================================================
-# KONFIGURASI FOLDER OUTPUT
+# KONFIGURASI DEFAULT
 # ============================================================================
 
-# Nama folder tujuan penyimpanan gambar sample
+# Nama folder tujuan penyimpanan gambar sample (format png)
 folder_output = "test-image"
 
-# Membuat folder jika belum ada, exist_ok=True mencegah error jika folder sudah ada
-# Fungsi ini penting agar program tidak crash saat folder sudah tersedia
-os.makedirs(folder_output, exist_ok=True)
+# Jumlah sample default (sama dengan versi lama script ini)
+DEFAULT_COUNT = 100
 
-# ============================================================================
-# LOAD DATASET FASHION MNIST
-# ============================================================================
+# Seed sampling default: run tanpa --seed selalu menghasilkan sample yang sama
+DEFAULT_SEED = 42
+
+# Format output yang didukung
+OUTPUT_FORMATS = ('png', 'npz', 'tar')
 
-# Load dataset Fashion MNIST resmi dari Keras
-# Dataset ini berisi 70.000 gambar grayscale 28x28 pixels:
-# - x_train: 60.000 gambar untuk training
-# - y_train: 60.000 label untuk training (0-9)
-# - x_test: 10.000 gambar untuk testing
-# - y_test: 10.000 label untuk testing (0-9)
-(x_train, y_train), (x_test, y_test) = tf.keras.datasets.fashion_mnist.load_data()
+# Nama file label di folder output / di dalam arsip tar
+LABELS_FILENAME = 'labels.csv'
+
+# Jumlah proses untuk encode PNG (0/1 = tanpa process pool)
+DEFAULT_WORKERS = os.cpu_count() or 1
 
 # ============================================================================
-# GABUNGKAN SEMUA DATA
+# FUNGSI: PEMILIHAN SAMPLE
 # ============================================================================
 
-# Menggabungkan data training dan testing menjadi satu array
-# Menggunakan np.concatenate untuk menggabung array sepanjang axis 0 (baris)
-# Tujuan: agar kita bisa random sampling dari keseluruhan 70.000 gambar
-# tanpa bias hanya dari training atau testing set saja
-x_semua_data = np.concatenate((x_train, x_test))
+def pilih_indeks(jumlah, seed=DEFAULT_SEED, total=NUM_TOTAL):
+    """
+    Memilih `jumlah` index acak tanpa duplikasi dari seluruh dataset.
+
+    Dataset berisi 70.000 gambar grayscale 28x28 pixels:
+    - index 0-59999: 60.000 gambar training
+    - index 60000-69999: 10.000 gambar testing
+    Sampling dari keseluruhan 70.000 gambar agar tidak bias ke training
+    atau testing set saja.
+
+    Parameter:
+        seed: seed generator acak; None = acak setiap run
+    """
+    if not 1 <= jumlah <= total:
+        raise ValueError(f"jumlah sample harus 1-{total}, didapat: {jumlah}")
+
+    # replace=False memastikan tidak ada duplikasi index
+    return np.random.default_rng(seed).choice(total, size=jumlah, replace=False)
+
+
+def nama_file_sample(i):
+    """sample_1.png, sample_2.png, dst (mulai dari 1 agar user-friendly)."""
+    return f"sample_{i + 1}.png"
 
 # ============================================================================
-# RANDOM SAMPLING 100 GAMBAR
+# FUNGSI: ENCODE PNG (DIJALANKAN DI WORKER PROCESS)
 # ============================================================================
 
-# Mengambil 100 index acak dari total 70.000 gambar
-# random.sample() memastikan tidak ada duplikasi index
-# range(len(x_semua_data)) menghasilkan angka 0 sampai 69999
-# Parameter 100 adalah jumlah sample yang diinginkan
-indeks_terpilih = random.sample(range(len(x_semua_data)), 100)
+def _encode_png(array_gambar):
+    """Encode satu array uint8 28x28 menjadi bytes PNG grayscale (mode L)."""
+    buffer = io.BytesIO()
+    Image.fromarray(array_gambar).convert("L").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _simpan_png_chunk(cache_folder, folder_tujuan, items):
+    """
+    Worker: menyimpan satu potongan sample sebagai file PNG.
+    Setiap proses membuka cache dataset sendiri lewat memory-map, jadi
+    data gambar tidak perlu dikirim (pickle) dari proses utama.
+    """
+    images, _ = load_all(cache_folder)
+    for nama_file, idx in items:
+        with open(os.path.join(folder_tujuan, nama_file), 'wb') as f:
+            f.write(_encode_png(images[idx]))
+    return len(items)
+
+
+def _encode_png_chunk(cache_folder, items):
+    """Worker: encode satu potongan sample, return [(nama_file, bytes PNG)]."""
+    images, _ = load_all(cache_folder)
+    return [(nama_file, _encode_png(images[idx])) for nama_file, idx in items]
+
+
+def _bagi_chunk(items, workers):
+    """Membagi items menjadi beberapa chunk (±4 chunk per worker)."""
+    ukuran = max(1, len(items) // (max(1, workers) * 4))
+    return [items[start:start + ukuran] for start in range(0, len(items), ukuran)]
+
+
+def _jalankan(fungsi, cache_folder, chunks, workers, *args):
+    """
+    Menjalankan fungsi worker untuk setiap chunk, paralel jika workers > 1.
+    Hasil dikembalikan sesuai urutan chunk.
+    """
+    if workers <= 1:
+        return [fungsi(cache_folder, *args, chunk) for chunk in chunks]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(fungsi, cache_folder, *args, chunk) for chunk in chunks]
+        return [future.result() for future in futures]
 
 # ============================================================================
-# PROSES PENYIMPANAN GAMBAR
+# FUNGSI: PENULISAN OUTPUT
 # ============================================================================
 
-# Loop untuk setiap index yang terpilih
-# enumerate() memberikan counter otomatis mulai dari 0
-# i = counter iterasi (0-99), idx = index gambar di dataset (random)
-for i, idx in enumerate(indeks_terpilih):
-    # Ambil array gambar dari dataset berdasarkan index
-    # array_gambar berisi matrix 28x28 dengan nilai pixel 0-255
-    array_gambar = x_semua_data[idx]
-    
-    # Konversi numpy array menjadi PIL Image object
-    # PIL Image diperlukan untuk menyimpan gambar ke file
-    gambar = Image.fromarray(array_gambar)
-    
-    # Konversi ke mode grayscale (L = Luminance)
-    # Meskipun dataset sudah grayscale, konversi ini memastikan
-    # format file PNG tersimpan dengan benar dalam mode grayscale
-    gambar = gambar.convert("L")
-    
-    # Membuat nama file dengan format sample_1.png, sample_2.png, dst
-    # i+1 karena kita ingin mulai dari 1 bukan 0 (lebih user-friendly)
-    nama_file = f"sample_{i+1}.png"
-    
-    # Menyimpan gambar ke folder output dengan nama file yang sudah ditentukan
-    # os.path.join() menggabungkan path folder dan nama file secara cross-platform
-    gambar.save(os.path.join(folder_output, nama_file))
+def tulis_labels_csv(f, nama_files, indeks, labels):
+    """Menulis labels.csv: filename, label (index kelas), dataset_index."""
+    writer = csv.writer(f)
+    writer.writerow(['filename', 'label', 'dataset_index'])
+    for nama_file, idx in zip(nama_files, indeks):
+        writer.writerow([nama_file, int(labels[idx]), int(idx)])
+
+
+def ekspor_png(indeks, folder_tujuan, cache_folder=CACHE_FOLDER, workers=DEFAULT_WORKERS):
+    """Menyimpan setiap sample sebagai PNG + labels.csv di folder_tujuan."""
+    # Membuat folder jika belum ada, exist_ok=True mencegah error jika folder sudah ada
+    os.makedirs(folder_tujuan, exist_ok=True)
+
+    _, labels = load_all(cache_folder)
+    nama_files = [nama_file_sample(i) for i in range(len(indeks))]
+    items = list(zip(nama_files, indeks.tolist()))
+
+    _jalankan(_simpan_png_chunk, cache_folder, _bagi_chunk(items, workers), workers, folder_tujuan)
+
+    with open(os.path.join(folder_tujuan, LABELS_FILENAME), 'w', newline='') as f:
+        tulis_labels_csv(f, nama_files, indeks, labels)
+
+
+def ekspor_npz(indeks, path_tujuan, cache_folder=CACHE_FOLDER):
+    """
+    Menyimpan semua sample dalam satu arsip .npz:
+    images uint8 (N, 28, 28), labels uint8 (N,), indices (N,).
+    Tidak ada encode PNG, jadi process pool tidak diperlukan.
+
+    Return: path file yang benar-benar ditulis (np.savez menambahkan
+    ekstensi .npz jika belum ada, jadi path dinormalisasi lebih dulu)
+    """
+    if not path_tujuan.endswith('.npz'):
+        path_tujuan += '.npz'
+
+    images, labels = load_all(cache_folder)
+    # Fancy indexing membaca hanya baris yang dipilih dari file memory-map
+    np.savez(path_tujuan, images=images[indeks], labels=labels[indeks], indices=indeks)
+    return path_tujuan
+
+
+def ekspor_tar(indeks, path_tujuan, cache_folder=CACHE_FOLDER, workers=DEFAULT_WORKERS):
+    """
+    Menyimpan semua sample sebagai PNG di dalam satu arsip tar + labels.csv.
+    Encode PNG paralel di process pool; penulisan tar berurutan di proses utama.
+    """
+    _, labels = load_all(cache_folder)
+    nama_files = [nama_file_sample(i) for i in range(len(indeks))]
+    items = list(zip(nama_files, indeks.tolist()))
+
+    def tambah_member(tar, nama, data):
+        info = tarfile.TarInfo(nama)
+        info.size = len(data)
+        tar.addfile(info, io.BytesIO(data))
+
+    with tarfile.open(path_tujuan, 'w') as tar:
+        for hasil_chunk in _jalankan(_encode_png_chunk, cache_folder,
+                                     _bagi_chunk(items, workers), workers):
+            for nama_file, data in hasil_chunk:
+                tambah_member(tar, nama_file, data)
+
+        buffer = io.StringIO()
+        tulis_labels_csv(buffer, nama_files, indeks, labels)
+        tambah_member(tar, LABELS_FILENAME, buffer.getvalue().encode('utf-8'))
 
 # ============================================================================
-# PESAN SELESAI
+# MAIN EXECUTION
 # ============================================================================
 
-# Menampilkan pesan konfirmasi bahwa proses berhasil
-print(f"✅ Selesai! 100 gambar acak disimpan di folder '{folder_output}'")
\ No newline at end of file
+def parse_args(argv=None):
+    """
+    Membaca argumen command line (argv=None: dari sys.argv).
+    """
+    parser = argparse.ArgumentParser(
+        description="Ekspor gambar sample acak dari dataset Fashion MNIST"
+    )
+    parser.add_argument(
+        "--count", type=int, default=DEFAULT_COUNT,
+        help=f"Jumlah gambar, 1-{NUM_TOTAL} (default: {DEFAULT_COUNT})"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=DEFAULT_SEED,
+        help=f"Seed sampling, run dengan seed sama menghasilkan sample sama (default: {DEFAULT_SEED})"
+    )
+    parser.add_argument(
+        "--format", choices=OUTPUT_FORMATS, default='png',
+        help="png = file per gambar, npz/tar = satu arsip (default: png)"
+    )
+    parser.add_argument(
+        "--output", default=None,
+        help=f"Folder (png) atau file arsip (npz/tar) tujuan "
+             f"(default: '{folder_output}', 'samples.npz', 'samples.tar')"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=DEFAULT_WORKERS,
+        help=f"Jumlah proses untuk encode PNG, 0/1 = serial (default: {DEFAULT_WORKERS})"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    output = args.output or {
+        'png': folder_output, 'npz': 'samples.npz', 'tar': 'samples.tar'
+    }[args.format]
+
+    # Pastikan cache dataset sudah ada sebelum worker process membukanya
+    # (lihat dataset_cache.py; dibuat sekali jika belum ada)
+    load_all()
+    indeks_terpilih = pilih_indeks(args.count, args.seed)
+
+    if args.format == 'png':
+        ekspor_png(indeks_terpilih, output, workers=args.workers)
+    elif args.format == 'npz':
+        output = ekspor_npz(indeks_terpilih, output)
+    else:
+        ekspor_tar(indeks_terpilih, output, workers=args.workers)
+
+    # Menampilkan pesan konfirmasi bahwa proses berhasil
+    print(f"✅ Selesai! {args.count} gambar acak (seed {args.seed}) disimpan di "
+          f"'{output}' (format {args.format})")
+
+
+# Block ini dijalankan hanya jika script dieksekusi langsung
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,483 @@
+"""
+Fashion MNIST Embedding & Similar-Item Search
+=============================================
+Hidden layer Dense(512, ReLU) pada model Fashion MNIST adalah embedding
+produk yang siap pakai: gambar yang mirip menghasilkan vektor yang mirip.
+Module ini:
+
+1. Mengekstrak embedding seluruh katalog (default: 70.000 gambar dari
+   dataset_cache) secara batch dengan NumPy (numpy_inference.py, tanpa
+   TensorFlow) ke matriks float16/float32 .npy yang di-memory-map.
+   Setiap baris dinormalisasi ke panjang 1, sehingga cosine similarity
+   cukup dihitung dengan dot product.
+2. Pencarian k-nearest-neighbour:
+   - BruteForceIndex : exact, satu perkalian matriks per potongan katalog
+   - PartitionedIndex: approximate (IVF), katalog dibagi ke beberapa
+                       cluster k-means; query hanya memeriksa `n_probe`
+                       cluster terdekat
+3. Laporan latency query dan recall@k IVF terhadap brute force.
+
+Penggunaan:
+    python embedding_index.py extract --dtype float16
+    python embedding_index.py build-index --lists 256
+    python embedding_index.py query --item 123 --k 5
+    python embedding_index.py query --image test-image/sample_1.png --k 5
+    python embedding_index.py benchmark --queries 200 --k 10 --probe 8
+
+Dibuat oleh: Fathih Apriandi
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from dataset_cache import load_all
+from numpy_inference import MODEL_PATH, WEIGHTS_PATH, NumpyFashionModel
+from predict_custom_image import LABELS, preprocess_image
+from prediction_manifest import model_fingerprint
+
+# ============================================================================
+# KONFIGURASI
+# ============================================================================
+
+# Matriks embedding katalog (N, 512), baris ke-i = gambar dataset ke-i
+EMBEDDINGS_PATH = 'fashion_mnist_embeddings.npy'
+
+# Index IVF (centroid + daftar id per cluster)
+INDEX_PATH = 'fashion_mnist_ivf.npz'
+
+# Layer Dense yang dipakai sebagai embedding (0 = Dense(512, ReLU))
+EMBEDDING_LAYER = 0
+
+# Jumlah gambar per batch saat ekstraksi
+DEFAULT_BATCH_SIZE = 4096
+
+# Jumlah baris katalog per potongan saat brute force (membatasi memori)
+DEFAULT_CHUNK_SIZE = 16384
+
+# Default IVF: jumlah cluster yang diperiksa per query
+DEFAULT_N_PROBE = 8
+
+# ============================================================================
+# FUNGSI: EKSTRAKSI EMBEDDING
+# ============================================================================
+
+def normalize_rows(x):
+    """Normalisasi setiap baris ke panjang 1 (baris nol dibiarkan nol)."""
+    x = np.asarray(x, dtype=np.float32)
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    return x / np.maximum(norms, 1e-12)
+
+
+def embed(model, images):
+    """
+    Embedding ter-normalisasi untuk sekumpulan gambar.
+
+    Parameter:
+        model: NumpyFashionModel
+        images: (N, 28, 28) uint8 [0, 255] atau float32 [0, 1]
+
+    Return:
+        float32 (N, 512)
+    """
+    return normalize_rows(model.forward(images, until_layer=EMBEDDING_LAYER))
+
+
+def stored_fingerprint(weights_path):
+    """Fingerprint model sumber yang tercatat di file weights (None jika tidak ada)."""
+    with np.load(weights_path) as data:
+        if 'model_fingerprint' not in data.files:
+            return None
+        return str(data['model_fingerprint'])
+
+
+def load_numpy_model(weights_path=WEIGHTS_PATH, model_path=MODEL_PATH):
+    """
+    Memuat model NumPy. Weights diekspor ulang dari model Keras jika belum
+    ada, atau jika fingerprint-nya tidak cocok dengan file .keras saat ini
+    (model sudah di-training ulang). Tanpa file .keras, weights dipakai apa adanya.
+    """
+    stale = not os.path.exists(weights_path)
+    if not stale and os.path.exists(model_path):
+        stale = stored_fingerprint(weights_path) != model_fingerprint(model_path)
+
+    if stale:
+        # TensorFlow hanya di-import jika weights perlu diekspor
+        from export_numpy_model import export_weights
+        print(f"🔄 Mengekspor weights '{weights_path}' dari '{model_path}'...")
+        export_weights(model_path, weights_path)
+    return NumpyFashionModel.load(weights_path)
+
+
+def extract_embeddings(model, images, output_path=EMBEDDINGS_PATH,
+                       batch_size=DEFAULT_BATCH_SIZE, dtype=np.float16):
+    """
+    Menulis embedding seluruh `images` ke file .npy batch demi batch.
+
+    File ditulis lewat np.lib.format.open_memmap, jadi memori yang dipakai
+    hanya sebesar satu batch walaupun katalog berisi puluhan ribu gambar.
+    float16 menghemat setengah ukuran file; perhitungan tetap float32.
+
+    Return:
+        array memory-map (read-only) dari file hasil
+    """
+    hidden_size = model.kernels[EMBEDDING_LAYER].shape[1]
+    tmp_path = output_path + '.tmp'
+
+    output = np.lib.format.open_memmap(
+        tmp_path, mode='w+', dtype=dtype, shape=(len(images), hidden_size)
+    )
+    for start in range(0, len(images), batch_size):
+        output[start:start + batch_size] = embed(model, images[start:start + batch_size])
+    output.flush()
+    del output
+
+    # Rename atomic: file lama tetap utuh jika proses terhenti
+    os.replace(tmp_path, output_path)
+    return load_embeddings(output_path)
+
+
+def load_embeddings(path=EMBEDDINGS_PATH):
+    """Membuka matriks embedding dengan memory-map read-only."""
+    return np.load(path, mmap_mode='r')
+
+# ============================================================================
+# FUNGSI BANTU TOP-K
+# ============================================================================
+
+def _top_k(scores, ids, k):
+    """
+    k skor tertinggi per baris (urut menurun).
+
+    Parameter:
+        scores: (Q, M) similarity
+        ids: (M,) atau (Q, M) id katalog untuk setiap kolom
+    """
+    k = min(k, scores.shape[1])
+    # argpartition O(M) lalu sort hanya k elemen
+    part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    part_scores = np.take_along_axis(scores, part, axis=1)
+    order = np.argsort(-part_scores, axis=1)
+    best = np.take_along_axis(part, order, axis=1)
+
+    if ids.ndim == 1:
+        best_ids = ids[best]
+    else:
+        best_ids = np.take_along_axis(ids, best, axis=1)
+    return best_ids, np.take_along_axis(scores, best, axis=1)
+
+# ============================================================================
+# CLASS: BRUTE FORCE (EXACT)
+# ============================================================================
+
+class BruteForceIndex:
+    """
+    Pencarian exact: similarity query dengan SELURUH katalog.
+    Katalog diproses per potongan `chunk_size` baris agar file memory-map
+    float16 tidak perlu dikonversi ke float32 sekaligus.
+    """
+
+    def __init__(self, embeddings, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.embeddings = embeddings
+        self.chunk_size = chunk_size
+
+    def search(self, queries, k=10):
+        """
+        Parameter:
+            queries: (Q, 512) embedding ter-normalisasi (lihat embed())
+
+        Return:
+            ids (Q, k), scores (Q, k) urut dari yang paling mirip
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        best_ids, best_scores = [], []
+
+        for start in range(0, len(self.embeddings), self.chunk_size):
+            chunk = np.asarray(self.embeddings[start:start + self.chunk_size], dtype=np.float32)
+            ids = np.arange(start, start + len(chunk))
+            chunk_ids, chunk_scores = _top_k(queries @ chunk.T, ids, k)
+            best_ids.append(chunk_ids)
+            best_scores.append(chunk_scores)
+
+        # Gabungkan kandidat top-k dari setiap potongan
+        return _top_k(np.hstack(best_scores), np.hstack(best_ids), k)
+
+# ============================================================================
+# CLASS: PARTITIONED / IVF (APPROXIMATE)
+# ============================================================================
+
+class PartitionedIndex:
+    """
+    Inverted file index: katalog dibagi ke `n_lists` cluster dengan
+    spherical k-means. Query hanya menghitung similarity dengan anggota
+    `n_probe` cluster yang centroid-nya paling mirip, sehingga biaya per
+    query kira-kira n_probe / n_lists dari brute force.
+
+    Daftar anggota cluster disimpan dalam format CSR:
+        ids[offsets[c]:offsets[c + 1]] = id katalog di cluster c
+    """
+
+    def __init__(self, embeddings, centroids, ids, offsets, n_probe=DEFAULT_N_PROBE):
+        self.embeddings = embeddings
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self.ids = np.asarray(ids)
+        self.offsets = np.asarray(offsets)
+        self.n_probe = n_probe
+
+    @property
+    def n_lists(self):
+        return len(self.centroids)
+
+    @classmethod
+    def build(cls, embeddings, n_lists=None, n_iter=10, sample_size=20000, seed=0,
+              chunk_size=DEFAULT_CHUNK_SIZE, n_probe=DEFAULT_N_PROBE):
+        """
+        Melatih centroid k-means pada sample katalog, lalu menempatkan
+        setiap item ke cluster terdekat.
+
+        Parameter:
+            n_lists: jumlah cluster (default: ±sqrt(N)); dibatasi jumlah
+                     item sample, karena setiap centroid awal adalah satu item
+            sample_size: jumlah item untuk melatih centroid
+        """
+        n = len(embeddings)
+        if n == 0:
+            raise ValueError("katalog embedding kosong")
+        if n_lists is not None and n_lists < 1:
+            raise ValueError(f"n_lists harus >= 1, didapat: {n_lists}")
+        rng = np.random.default_rng(seed)
+
+        sample_ids = np.sort(rng.choice(n, size=min(sample_size, n), replace=False))
+        sample = np.asarray(embeddings[sample_ids], dtype=np.float32)
+
+        n_lists = n_lists or max(1, int(np.sqrt(n)))
+        if n_lists > len(sample):
+            print(f"   ⚠️  {n_lists} cluster melebihi {len(sample)} item sample, "
+                  f"dipakai {len(sample)} cluster")
+            n_lists = len(sample)
+        centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)]
+
+        for _ in range(n_iter):
+            assign = np.argmax(sample @ centroids.T, axis=1)
+            # Jumlahkan anggota per cluster sekaligus (tanpa loop per cluster)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, sample)
+            empty = np.bincount(assign, minlength=n_lists) == 0
+            # Cluster kosong diisi ulang dengan item acak dari sample
+            sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()))]
+            centroids = normalize_rows(sums)
+
+        assign = np.concatenate([
+            np.argmax(np.asarray(embeddings[start:start + chunk_size], dtype=np.float32)
+                      @ centroids.T, axis=1)
+            for start in range(0, n, chunk_size)
+        ])
+        ids = np.argsort(assign, kind='stable')
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(assign, minlength=n_lists))])
+        return cls(embeddings, centroids, ids, offsets, n_probe)
+
+    def save(self, path=INDEX_PATH):
+        np.savez(path, centroids=self.centroids, ids=self.ids, offsets=self.offsets)
+
+    @classmethod
+    def load(cls, embeddings, path=INDEX_PATH, n_probe=DEFAULT_N_PROBE):
+        with np.load(path) as data:
+            return cls(embeddings, data['centroids'], data['ids'], data['offsets'], n_probe)
+
+    def search(self, queries, k=10, n_probe=None):
+        """Sama dengan BruteForceIndex.search(), tetapi approximate."""
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        n_probe = min(n_probe or self.n_probe, self.n_lists)
+
+        # Cluster terdekat untuk semua query sekaligus
+        probes, _ = _top_k(queries @ self.centroids.T, np.arange(self.n_lists), n_probe)
+
+        all_ids = np.full((len(queries), k), -1, dtype=np.int64)
+        all_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        for row, (query, clusters) in enumerate(zip(queries, probes)):
+            candidates = np.concatenate(
+                [self.ids[self.offsets[c]:self.offsets[c + 1]] for c in clusters]
+            )
+            if len(candidates) == 0:
+                continue
+            # Urutkan id agar pembacaan file memory-map lebih berurutan
+            candidates.sort()
+            vectors = np.asarray(self.embeddings[candidates], dtype=np.float32)
+            ids, scores = _top_k((vectors @ query)[None, :], candidates, k)
+            all_ids[row, :ids.shape[1]] = ids[0]
+            all_scores[row, :scores.shape[1]] = scores[0]
+        return all_ids, all_scores
+
+# ============================================================================
+# LAPORAN: LATENCY & RECALL
+# ============================================================================
+
+def search_image(model, index, img_path, k=10):
+    """
+    Item katalog yang paling mirip dengan satu file gambar. Gambar
+    di-preprocess seperti predict_custom_image.py lalu di-embed dengan
+    model yang sama dengan katalog.
+
+    Return:
+        (ids, scores) untuk k hasil teratas
+    """
+    _, img_array = preprocess_image(img_path)
+    ids, scores = index.search(embed(model, img_array[None]), k)
+    return ids[0], scores[0]
+
+
+def recall_at_k(approx_ids, exact_ids):
+    """Rata-rata proporsi hasil exact yang juga ditemukan index approximate."""
+    hits = [len(np.intersect1d(a, e)) / len(e) for a, e in zip(approx_ids, exact_ids)]
+    return float(np.mean(hits))
+
+
+def _latencies(search, queries, k):
+    # Satu query per panggilan: mensimulasikan permintaan "cari yang mirip"
+    results, durations = [], []
+    for query in queries:
+        start = time.perf_counter()
+        ids, _ = search(query[None, :], k)
+        durations.append(time.perf_counter() - start)
+        results.append(ids[0])
+    return np.array(results), np.array(durations) * 1000
+
+
+def benchmark(embeddings, index, n_queries=200, k=10, n_probe_values=(1, 4, 8, 16), seed=1):
+    """
+    Membandingkan latency per query dan recall@k IVF terhadap brute force.
+    Query diambil dari katalog sendiri (seed tetap).
+
+    Return:
+        list dictionary hasil, baris pertama adalah brute force
+    """
+    rng = np.random.default_rng(seed)
+    query_ids = rng.choice(len(embeddings), size=min(n_queries, len(embeddings)), replace=False)
+    queries = np.asarray(embeddings[np.sort(query_ids)], dtype=np.float32)
+
+    brute = BruteForceIndex(embeddings)
+    exact_ids, brute_ms = _latencies(brute.search, queries, k)
+    rows = [{
+        'method': 'brute force', 'n_probe': None, 'recall': 1.0,
+        'p50_ms': float(np.percentile(brute_ms, 50)),
+        'p95_ms': float(np.percentile(brute_ms, 95)),
+    }]
+
+    for n_probe in n_probe_values:
+        search = lambda q, k, n_probe=n_probe: index.search(q, k, n_probe=n_probe)
+        approx_ids, ivf_ms = _latencies(search, queries, k)
+        rows.append({
+            'method': f'IVF {index.n_lists} list', 'n_probe': n_probe,
+            'recall': recall_at_k(approx_ids, exact_ids),
+            'p50_ms': float(np.percentile(ivf_ms, 50)),
+            'p95_ms': float(np.percentile(ivf_ms, 95)),
+        })
+    return rows
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Ekstraksi embedding hidden layer dan pencarian item mirip"
+    )
+    parser.add_argument("--embeddings", default=EMBEDDINGS_PATH,
+                        help=f"File matriks embedding (default: {EMBEDDINGS_PATH})")
+    parser.add_argument("--index-file", default=INDEX_PATH,
+                        help=f"File index IVF (default: {INDEX_PATH})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    extract = commands.add_parser("extract", help="Ekstrak embedding seluruh katalog")
+    extract.add_argument("--dtype", choices=("float16", "float32"), default="float16",
+                         help="Tipe data file embedding (default: float16)")
+    extract.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                         help=f"Gambar per batch (default: {DEFAULT_BATCH_SIZE})")
+
+    build = commands.add_parser("build-index", help="Bangun index IVF dari file embedding")
+    build.add_argument("--lists", type=int, default=None,
+                       help="Jumlah cluster (default: sqrt(jumlah item))")
+
+    query = commands.add_parser("query", help="Cari item katalog yang mirip dengan satu gambar")
+    source = query.add_mutually_exclusive_group(required=True)
+    source.add_argument("--image", default=None,
+                        help="File gambar (PNG/JPG, di-preprocess seperti predict_custom_image.py)")
+    source.add_argument("--item", type=int, default=None, help="Index item di katalog")
+    query.add_argument("--k", type=int, default=10, help="Jumlah hasil (default: 10)")
+    query.add_argument("--ivf", action="store_true", help="Pakai index IVF (approximate)")
+    query.add_argument("--probe", type=int, default=DEFAULT_N_PROBE,
+                       help=f"Cluster yang diperiksa untuk --ivf (default: {DEFAULT_N_PROBE})")
+
+    bench = commands.add_parser("benchmark", help="Latency query dan recall IVF vs brute force")
+    bench.add_argument("--queries", type=int, default=200, help="Jumlah query (default: 200)")
+    bench.add_argument("--k", type=int, default=10, help="k untuk recall@k (default: 10)")
+    bench.add_argument("--probe", type=int, nargs="+", default=[1, 4, 8, 16],
+                       help="Nilai n_probe yang dibandingkan (default: 1 4 8 16)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if args.command == "extract":
+        images, _ = load_all()
+        start = time.perf_counter()
+        embeddings = extract_embeddings(load_numpy_model(), images, args.embeddings,
+                                        args.batch_size, np.dtype(args.dtype))
+        print(f"✅ {embeddings.shape[0]:,} embedding {embeddings.shape[1]}-dimensi "
+              f"({args.dtype}, {embeddings.nbytes / 1024 / 1024:.1f} MB) disimpan di "
+              f"'{args.embeddings}' dalam {time.perf_counter() - start:.1f}s")
+        return
+
+    embeddings = load_embeddings(args.embeddings)
+
+    if args.command == "build-index":
+        start = time.perf_counter()
+        index = PartitionedIndex.build(embeddings, n_lists=args.lists)
+        index.save(args.index_file)
+        print(f"✅ Index IVF {index.n_lists} cluster disimpan di '{args.index_file}' "
+              f"({time.perf_counter() - start:.1f}s)")
+        return
+
+    if args.command == "query":
+        if args.ivf:
+            index = PartitionedIndex.load(embeddings, args.index_file, n_probe=args.probe)
+        else:
+            index = BruteForceIndex(embeddings)
+        _, labels = load_all()
+
+        # Model NumPy hanya dimuat untuk query gambar (di luar pengukuran waktu)
+        model = load_numpy_model() if args.image is not None else None
+        start = time.perf_counter()
+        if args.image is not None:
+            ids, scores = search_image(model, index, args.image, args.k)
+            description = f"Gambar '{args.image}'"
+        else:
+            query = np.asarray(embeddings[args.item:args.item + 1], dtype=np.float32)
+            # k + 1 karena item itu sendiri selalu menjadi hasil teratas
+            ids, scores = index.search(query, args.k + 1)
+            ids, scores = ids[0], scores[0]
+            description = f"Item {args.item} ({LABELS[labels[args.item]]})"
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        results = [(item_id, score) for item_id, score in zip(ids, scores)
+                   if item_id != args.item and item_id >= 0][:args.k]
+        print(f"🔍 {description}, {elapsed_ms:.2f} ms:")
+        for item_id, score in results:
+            print(f"   • item {item_id:>6}  {LABELS[labels[item_id]]:<12}  similarity {score:.4f}")
+        return
+
+    index = PartitionedIndex.load(embeddings, args.index_file)
+    rows = benchmark(embeddings, index, args.queries, args.k, args.probe)
+    print(f"\n📊 Pencarian {args.k}-NN pada {len(embeddings):,} item ({args.queries} query):")
+    print(f"   {'Metode':<18}{'n_probe':>8}{f'Recall@{args.k}':>12}{'p50 (ms)':>11}{'p95 (ms)':>11}")
+    for row in rows:
+        n_probe = row['n_probe'] if row['n_probe'] is not None else '-'
+        print(f"   {row['method']:<18}{n_probe:>8}{row['recall']:>12.3f}"
+              f"{row['p50_ms']:>11.3f}{row['p95_ms']:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
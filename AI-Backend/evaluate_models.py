@@ -0,0 +1,319 @@
+"""
+Fashion MNIST Multi-Model Evaluation
+====================================
+Membandingkan beberapa varian model sekaligus (contoh: model asli, hasil
+training ulang, int8 dari quantize_model.py, hasil compress_model.py)
+pada data test yang sama, dalam satu laporan.
+
+Berbeda dengan test_model.py (satu model, model.evaluate, hanya loss dan
+akurasi), di sini:
+1. Data test dibaca dalam satu pass streaming: setiap batch dinormalisasi
+   (atau di-decode, untuk folder gambar) SEKALI lalu diprediksi oleh semua
+   model, jadi biaya baca data tidak dikali jumlah model.
+2. Setiap model diprediksi per batch lewat engine-nya sendiri:
+   - .keras          : TensorFlow, build_inference_fn() dari predict_custom_image.py
+   - .npz (float32)  : NumpyFashionModel (export_numpy_model.py)
+   - .npz (int8)     : QuantizedFashionModel (quantize_model.py)
+   - .tflite (int8)  : TFLiteFashionModel (quantize_model.py)
+3. Metrics dihitung vektor NumPy per batch dan diakumulasi: confusion
+   matrix, precision/recall/F1 per kelas sesuai LABELS, top-k accuracy
+   (kelas yang seri dengan label dihitung di depannya), log loss, dan
+   throughput (gambar/detik, waktu prediksi saja).
+4. Mode --folder: gambar yang hilang atau rusak dilewati dan dihitung
+   (skipped_images di laporan JSON), tidak menghentikan evaluasi.
+
+Penggunaan:
+    python evaluate_models.py fashion_mnist_model.keras fashion_mnist_model_int8.tflite
+    python evaluate_models.py compressed-models/*.keras --top-k 2 3
+    python evaluate_models.py fashion_mnist_model.keras --folder test-image   # PNG + labels.csv
+    python evaluate_models.py fashion_mnist_model.keras --confusion --output eval_report.json
+
+Dibuat oleh: Fathih Apriandi
+"""
+
+import argparse
+import csv
+import json
+import os
+import time
+
+import numpy as np
+
+from dataset_cache import load_data
+from predict_custom_image import LABELS, iter_preprocessed_batches, preprocess_or_error
+
+# ============================================================================
+# KONFIGURASI DEFAULT
+# ============================================================================
+
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_TOP_K = (3, 5)
+
+# File label hasil download_image.py (filename, label, dataset_index)
+LABELS_FILENAME = 'labels.csv'
+
+# Mencegah log(0) pada log loss
+EPSILON = 1e-7
+
+# ============================================================================
+# FUNGSI: MEMUAT MODEL
+# ============================================================================
+
+def load_predict_fn(path):
+    """
+    Fungsi predict(images float32 (N, 28, 28)) → probabilitas (N, 10)
+    sesuai jenis file model. Engine berat hanya di-import jika dipakai.
+    """
+    if path.endswith('.keras'):
+        from predict_custom_image import build_inference_fn, load_model
+        infer = build_inference_fn(load_model(path))
+        return lambda images: infer(images).numpy()
+
+    if path.endswith('.tflite'):
+        from quantize_model import TFLiteFashionModel
+        return TFLiteFashionModel.load(path).predict
+
+    with np.load(path) as data:
+        quantized = 'scale_0' in data.files
+
+    if quantized:
+        from quantize_model import QuantizedFashionModel
+        return QuantizedFashionModel.load(path).predict
+
+    from numpy_inference import NumpyFashionModel
+    return NumpyFashionModel.load(path).predict
+
+# ============================================================================
+# CLASS: AKUMULASI METRICS
+# ============================================================================
+
+class EvaluationResult:
+    """
+    Metrics satu model yang diakumulasi batch demi batch, sehingga data
+    test tidak perlu disimpan seluruhnya di memori.
+    """
+
+    def __init__(self, name, top_k=DEFAULT_TOP_K, num_classes=len(LABELS)):
+        self.name = name
+        self.top_k = tuple(top_k)
+        self.num_classes = num_classes
+        # confusion[i, j] = jumlah gambar berlabel i yang diprediksi j
+        self.confusion = np.zeros((num_classes, num_classes), dtype=np.int64)
+        self.top_k_hits = {k: 0 for k in self.top_k}
+        self.loss_sum = 0.0
+        self.count = 0
+        self.predict_seconds = 0.0
+
+    def update(self, probabilities, labels, seconds=0.0):
+        """Menambahkan hasil satu batch (probabilitas (N, C), label (N,))."""
+        labels = np.asarray(labels, dtype=np.int64)
+        predicted = probabilities.argmax(axis=1)
+
+        # Satu bincount untuk seluruh pasangan (label, prediksi)
+        self.confusion += np.bincount(
+            labels * self.num_classes + predicted, minlength=self.num_classes ** 2
+        ).reshape(self.num_classes, self.num_classes)
+
+        # Top-k: jumlah kelas LAIN dengan probabilitas >= kelas asli (dikurangi
+        # satu untuk perbandingan kelas asli dengan dirinya sendiri). Kelas yang
+        # seri dihitung di depan label, jadi seri tidak menguntungkan model.
+        # Label masuk top-k jika peringkatnya < k (satu perbandingan untuk semua k)
+        true_prob = probabilities[np.arange(len(labels)), labels]
+        rank = (probabilities >= true_prob[:, None]).sum(axis=1) - 1
+        for k in self.top_k:
+            self.top_k_hits[k] += int((rank < k).sum())
+
+        self.loss_sum += float(-np.log(np.maximum(true_prob, EPSILON)).sum())
+        self.count += len(labels)
+        self.predict_seconds += seconds
+
+    def summary(self):
+        """Dictionary metrics akhir (siap ditulis sebagai JSON)."""
+        diagonal = np.diag(self.confusion).astype(np.float64)
+        predicted_per_class = self.confusion.sum(axis=0)
+        actual_per_class = self.confusion.sum(axis=1)
+
+        # Kelas yang tidak pernah diprediksi/muncul mendapat nilai 0, bukan NaN
+        precision = np.divide(diagonal, predicted_per_class,
+                              out=np.zeros_like(diagonal), where=predicted_per_class > 0)
+        recall = np.divide(diagonal, actual_per_class,
+                           out=np.zeros_like(diagonal), where=actual_per_class > 0)
+        f1 = np.divide(2 * precision * recall, precision + recall,
+                       out=np.zeros_like(diagonal), where=(precision + recall) > 0)
+
+        return {
+            'model': self.name,
+            'images': self.count,
+            'accuracy': float(diagonal.sum() / self.count) if self.count else 0.0,
+            'top_k_accuracy': {str(k): hits / self.count if self.count else 0.0
+                               for k, hits in self.top_k_hits.items()},
+            'log_loss': self.loss_sum / self.count if self.count else 0.0,
+            'macro_f1': float(f1.mean()),
+            'images_per_s': self.count / self.predict_seconds if self.predict_seconds else 0.0,
+            'per_class': {
+                label: {'precision': float(p), 'recall': float(r), 'f1': float(f)}
+                for label, p, r, f in zip(LABELS, precision, recall, f1)
+            },
+            'confusion_matrix': self.confusion.tolist(),
+        }
+
+# ============================================================================
+# FUNGSI: SUMBER DATA TEST
+# ============================================================================
+
+def iter_dataset_batches(batch_size=DEFAULT_BATCH_SIZE, limit=None):
+    """
+    Batch (images float32, labels) dari test split resmi (cache memory-map).
+    Normalisasi dilakukan per batch, bukan untuk seluruh test set sekaligus.
+    """
+    (_, _), (x_test, y_test) = load_data()
+    if limit is not None:
+        x_test, y_test = x_test[:limit], y_test[:limit]
+
+    for start in range(0, len(x_test), batch_size):
+        images = np.asarray(x_test[start:start + batch_size], dtype=np.float32) / 255.0
+        yield images, np.asarray(y_test[start:start + batch_size])
+
+
+def read_folder_labels(folder, limit=None):
+    """{filename: index label} dari labels.csv hasil download_image.py."""
+    with open(os.path.join(folder, LABELS_FILENAME), newline='') as f:
+        rows = list(csv.DictReader(f))
+    if limit is not None:
+        rows = rows[:limit]
+    return {row['filename']: int(row['label']) for row in rows}
+
+
+def iter_folder_batches(folder, labels, batch_size=DEFAULT_BATCH_SIZE, skipped=None):
+    """
+    Batch dari folder gambar dengan label dari read_folder_labels().
+    Decode & resize memakai pipeline predict_custom_image.py (thread pool
+    + prefetch), jadi hasilnya sama dengan yang dilihat model saat prediksi.
+
+    Gambar yang hilang atau tidak bisa di-decode dilewati (seperti
+    bulk_predict.py) dan dicatat ke list `skipped` sebagai (filename, error).
+    """
+    filenames = list(labels)
+    batches = iter_preprocessed_batches(folder, filenames, batch_size,
+                                        preprocess=preprocess_or_error)
+    for batch_files, img_arrays, errors in batches:
+        valid = []
+        for filename, img_array, error in zip(batch_files, img_arrays, errors):
+            if error is not None:
+                print(f"   ⚠️  {filename} dilewati: {error}")
+                if skipped is not None:
+                    skipped.append((filename, error))
+                continue
+            valid.append((filename, img_array))
+
+        if valid:
+            yield (np.stack([img_array for _, img_array in valid]),
+                   np.array([labels[filename] for filename, _ in valid]))
+
+# ============================================================================
+# FUNGSI: EVALUASI
+# ============================================================================
+
+def evaluate_models(model_paths, batches, top_k=DEFAULT_TOP_K):
+    """
+    Satu pass streaming: setiap batch diprediksi oleh semua model.
+
+    Return:
+        list summary() per model, urutan sama dengan model_paths
+    """
+    models = [(path, load_predict_fn(path)) for path in model_paths]
+    results = [EvaluationResult(os.path.basename(path), top_k) for path in model_paths]
+
+    # Warm-up (tracing tf.function, alokasi) agar tidak masuk throughput
+    warmup = np.zeros((1, 28, 28), dtype=np.float32)
+    for _, predict in models:
+        predict(warmup)
+
+    for images, labels in batches:
+        for (_, predict), result in zip(models, results):
+            start = time.perf_counter()
+            probabilities = np.asarray(predict(images))
+            result.update(probabilities, labels, time.perf_counter() - start)
+
+    return [result.summary() for result in results]
+
+
+def print_report(summaries, show_confusion=False):
+    """Tabel perbandingan model, lalu precision/recall per kelas per model."""
+    top_k = list(summaries[0]['top_k_accuracy'])
+    header = ''.join(f"{f'Top-{k}':>9}" for k in top_k)
+    width = max(len(s['model']) for s in summaries) + 2
+
+    print(f"\n📊 Perbandingan {len(summaries)} model pada {summaries[0]['images']:,} gambar test:")
+    print(f"   {'Model':<{width}}{'Akurasi':>9}{header}{'Log loss':>10}"
+          f"{'Macro F1':>10}{'Gambar/detik':>14}")
+    for s in summaries:
+        top = ''.join(f"{s['top_k_accuracy'][k] * 100:>8.2f}%" for k in top_k)
+        print(f"   {s['model']:<{width}}{s['accuracy'] * 100:>8.2f}%{top}"
+              f"{s['log_loss']:>10.4f}{s['macro_f1']:>10.4f}{s['images_per_s']:>14,.0f}")
+
+    for s in summaries:
+        print(f"\n📋 {s['model']}: per kelas")
+        print(f"   {'Label':<13}{'Precision':>10}{'Recall':>9}{'F1':>8}")
+        for label, metrics in s['per_class'].items():
+            print(f"   {label:<13}{metrics['precision'] * 100:>9.2f}%{metrics['recall'] * 100:>8.2f}%"
+                  f"{metrics['f1']:>8.4f}")
+
+        if show_confusion:
+            # Baris = label asli, kolom = prediksi (urutan LABELS)
+            print(f"   Confusion matrix (baris = label asli, kolom = prediksi):")
+            for label, row in zip(LABELS, s['confusion_matrix']):
+                print(f"   {label:<13}" + ''.join(f"{value:>6}" for value in row))
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Evaluasi dan bandingkan beberapa model Fashion MNIST sekaligus"
+    )
+    parser.add_argument("models", nargs="+",
+                        help="File model: .keras, .npz (float32/int8), atau .tflite (int8)")
+    parser.add_argument("--folder", default=None,
+                        help="Folder gambar + labels.csv (default: test split dataset)")
+    parser.add_argument("--limit", type=int, default=None,
+                        help="Hanya N gambar pertama (default: semua)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"Gambar per batch (default: {DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--top-k", type=int, nargs="+", default=list(DEFAULT_TOP_K),
+                        help="Nilai k untuk top-k accuracy (default: 3 5)")
+    parser.add_argument("--confusion", action="store_true",
+                        help="Tampilkan confusion matrix setiap model")
+    parser.add_argument("--output", default=None,
+                        help="Simpan laporan lengkap ke file JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    skipped = []
+    if args.folder is not None:
+        # Label dibaca sebelum model dimuat agar kesalahan folder cepat terlihat
+        labels = read_folder_labels(args.folder, args.limit)
+        batches = iter_folder_batches(args.folder, labels, args.batch_size, skipped)
+    else:
+        batches = iter_dataset_batches(args.batch_size, args.limit)
+
+    summaries = evaluate_models(args.models, batches, args.top_k)
+    for summary in summaries:
+        summary['skipped_images'] = len(skipped)
+    print_report(summaries, args.confusion)
+
+    if skipped:
+        print(f"\n⚠️  {len(skipped)} gambar tidak bisa dibaca dan tidak ikut dievaluasi")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(summaries, f, indent=2)
+        print(f"\n💾 Laporan disimpan di '{args.output}'")
+
+
+if __name__ == "__main__":
+    main()
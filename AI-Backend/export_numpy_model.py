@@ -0,0 +1,129 @@
+"""
+Fashion MNIST NumPy Weight Exporter
+===================================
+Script untuk mengekspor weights layer Dense dari model Keras ke file .npz
+yang ringkas, agar inferensi bisa dilakukan dengan NumPy saja
+(lihat numpy_inference.py) tanpa import TensorFlow.
+
+Isi file .npz:
+- kernel_0, bias_0: Dense(512) hidden layer → shape (784, 512), (512,)
+- kernel_1, bias_1: Dense(10) output layer  → shape (512, 10), (10,)
+- activations: nama aktivasi setiap layer Dense (contoh: relu, softmax)
+- model_fingerprint: sha256 file .keras sumber (lihat prediction_manifest.py),
+  untuk mendeteksi weights yang sudah tidak cocok setelah training ulang
+
+File disimpan tanpa kompresi (np.savez) agar load secepat mungkin.
+
+Penggunaan:
+    python export_numpy_model.py
+    python export_numpy_model.py --model fashion_mnist_model.keras --output fashion_mnist_weights.npz
+
+Dibuat oleh: Fathih Apriandi
+"""
+
+import argparse
+import os
+
+import tensorflow as tf
+import numpy as np
+
+from prediction_manifest import model_fingerprint
+
+# ============================================================================
+# KONFIGURASI PATH
+# ============================================================================
+
+# Model sumber hasil train_fashion_mnist_model.py
+MODEL_PATH = 'fashion_mnist_model.keras'
+
+# File tujuan weights NumPy
+WEIGHTS_PATH = 'fashion_mnist_weights.npz'
+
+# Aktivasi yang didukung oleh numpy_inference.py
+SUPPORTED_ACTIVATIONS = ('relu', 'softmax', 'linear')
+
+# ============================================================================
+# FUNGSI EXPORT
+# ============================================================================
+
+def extract_dense_weights(model):
+    """
+    Mengambil weights semua layer Dense dari model secara berurutan.
+
+    Return:
+        dictionary berisi kernel_i, bias_i (float32) dan activations
+    Raise:
+        ValueError jika model berisi layer yang tidak bisa dijalankan NumPy
+    """
+    arrays = {}
+    activations = []
+
+    for layer in model.layers:
+        # Flatten tidak punya weights, cukup reshape di sisi NumPy
+        if isinstance(layer, tf.keras.layers.Flatten):
+            continue
+        if not isinstance(layer, tf.keras.layers.Dense):
+            raise ValueError(
+                f"Layer '{layer.name}' ({type(layer).__name__}) tidak didukung"
+            )
+
+        activation = layer.activation.__name__
+        if activation not in SUPPORTED_ACTIVATIONS:
+            raise ValueError(
+                f"Aktivasi '{activation}' pada layer '{layer.name}' tidak didukung"
+            )
+
+        kernel, bias = layer.get_weights()
+        index = len(activations)
+        arrays[f"kernel_{index}"] = kernel.astype(np.float32)
+        arrays[f"bias_{index}"] = bias.astype(np.float32)
+        activations.append(activation)
+
+    if not activations:
+        raise ValueError("Model tidak memiliki layer Dense")
+
+    arrays["activations"] = np.array(activations)
+    return arrays
+
+
+def export_weights(model_path=MODEL_PATH, output_path=WEIGHTS_PATH):
+    """
+    Memuat model Keras dan menyimpan weights-nya ke file .npz.
+    Return: dictionary array yang disimpan
+    """
+    model = tf.keras.models.load_model(model_path)
+    arrays = extract_dense_weights(model)
+    arrays["model_fingerprint"] = np.array(model_fingerprint(model_path))
+
+    # np.savez (bukan savez_compressed): ukuran hampir sama untuk float32,
+    # tapi load jauh lebih cepat karena tidak perlu dekompresi
+    np.savez(output_path, **arrays)
+    return arrays
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Ekspor weights model Keras ke .npz untuk inferensi NumPy"
+    )
+    parser.add_argument("--model", default=MODEL_PATH,
+                        help=f"Path model Keras (default: {MODEL_PATH})")
+    parser.add_argument("--output", default=WEIGHTS_PATH,
+                        help=f"Path file .npz tujuan (default: {WEIGHTS_PATH})")
+    args = parser.parse_args()
+
+    print(f"🔄 Mengekspor weights dari '{args.model}'...")
+    arrays = export_weights(args.model, args.output)
+
+    for index, activation in enumerate(arrays["activations"]):
+        shape = arrays[f"kernel_{index}"].shape
+        print(f"   • Dense {index}: {shape[0]} → {shape[1]} ({activation})")
+
+    size_kb = os.path.getsize(args.output) / 1024
+    print(f"✅ Weights disimpan di '{args.output}' ({size_kb:.1f} KB)")
+
+
+if __name__ == "__main__":
+    main()
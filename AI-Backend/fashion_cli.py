@@ -0,0 +1,164 @@
+"""
+Fashion MNIST Command Line
+==========================
+Satu entry point untuk seluruh alur kerja project ini:
+
+    python fashion_cli.py download [opsi download_image.py]
+    python fashion_cli.py train    [opsi train_fashion_mnist_model.py]
+    python fashion_cli.py test     [--tier fast|full] [test_module ...]
+    python fashion_cli.py predict  [opsi predict_custom_image.py]
+    python fashion_cli.py startup  [--repeat 5]
+
+Module sebuah subcommand baru di-import saat subcommand itu dijalankan.
+Script ini sendiri hanya memakai standard library, sehingga `--help`
+(dan misalnya `download`, yang tidak butuh TensorFlow) langsung jalan
+tanpa menunggu import TensorFlow atau matplotlib.
+
+`startup` mengukur waktu startup setiap subcommand (proses Python baru
+sampai `<subcommand> --help` selesai) dibandingkan dengan interpreter
+kosong dan import TensorFlow, untuk mendeteksi import berat yang masuk
+lagi ke jalur startup.
+
+Dibuat oleh: Fathih Apriandi
+"""
+
+import argparse
+import importlib
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# ============================================================================
+# DAFTAR SUBCOMMAND
+# ============================================================================
+
+# Subcommand → (module yang menyediakan main(argv), keterangan)
+COMMANDS = {
+    'download': ('download_image', "Ekspor gambar sample dari dataset"),
+    'train': ('train_fashion_mnist_model', "Training model"),
+    'test': (None, "Jalankan unit test (semua test_*.py atau module tertentu)"),
+    'predict': ('predict_custom_image', "Prediksi gambar di folder test-image/"),
+}
+
+# Folder script ini: tempat semua module dan file test
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Jumlah pengulangan default pengukuran startup
+DEFAULT_REPEAT = 5
+
+# ============================================================================
+# FUNGSI: SUBCOMMAND
+# ============================================================================
+
+def run_tests(argv):
+    """
+    Menjalankan unit test dengan unittest (framework yang dipakai semua
+    test_*.py). Tanpa nama module, semua test_*.py ditemukan otomatis.
+    """
+    parser = argparse.ArgumentParser(
+        prog="fashion_cli.py test", description="Jalankan unit test project"
+    )
+    parser.add_argument("--tier", choices=("fast", "full"), default=None,
+                        help="Tier test_model.py (default: TEST_TIER atau full)")
+    parser.add_argument("tests", nargs="*",
+                        help="Module/test yang dijalankan, contoh: test_model "
+                             "test_prediction_cache.TestPredictionCache (default: semua)")
+    args = parser.parse_args(argv)
+
+    # Harus di-set sebelum test_model di-import (dibaca saat import)
+    if args.tier is not None:
+        os.environ['TEST_TIER'] = args.tier
+
+    import unittest
+
+    unittest_argv = args.tests or ['discover', '-s', SCRIPT_DIR, '-p', 'test_*.py']
+    unittest.main(module=None, argv=[parser.prog, *unittest_argv])
+
+
+def run_command(command, argv):
+    """Meng-import module subcommand (baru sekarang) lalu memanggil main(argv)."""
+    if command == 'test':
+        return run_tests(argv)
+    module_name, _ = COMMANDS[command]
+    return importlib.import_module(module_name).main(argv)
+
+# ============================================================================
+# FUNGSI: LAPORAN WAKTU STARTUP
+# ============================================================================
+
+def measure_startup(args, repeat=DEFAULT_REPEAT):
+    """
+    Median waktu (detik) proses Python baru yang menjalankan `args`.
+    Sama seperti measure_cold_start() di numpy_inference.py: diukur dari
+    luar proses agar waktu start interpreter ikut terhitung.
+    """
+    env = dict(os.environ, TF_CPP_MIN_LOG_LEVEL='3')
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, *args], check=True, env=env, cwd=SCRIPT_DIR,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+def startup_report(repeat=DEFAULT_REPEAT):
+    """
+    Return:
+        list (nama, detik): pembanding, lalu `<subcommand> --help` per subcommand
+    """
+    script = os.path.abspath(__file__)
+    rows = [
+        ('python (kosong)', measure_startup(['-c', 'pass'], repeat)),
+        ('import tensorflow', measure_startup(['-c', 'import tensorflow'], repeat)),
+        ('fashion_cli.py --help', measure_startup([script, '--help'], repeat)),
+    ]
+    for command in COMMANDS:
+        rows.append((f"{command} --help", measure_startup([script, command, '--help'], repeat)))
+    return rows
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def parse_args(argv=None):
+    commands = "\n".join(
+        f"  {name:<10}{description}"
+        for name, (_, description) in [*COMMANDS.items(),
+                                       ('startup', (None, "Laporan waktu startup per subcommand"))]
+    )
+    parser = argparse.ArgumentParser(
+        description="Fashion MNIST: download, train, test, dan predict dalam satu perintah",
+        epilog=f"subcommand:\n{commands}\n\n"
+               f"Opsi setiap subcommand: python fashion_cli.py <subcommand> --help",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("command", choices=[*COMMANDS, 'startup'], metavar="subcommand",
+                        help="Salah satu subcommand di bawah")
+    # Sisa argumen diteruskan apa adanya ke parser milik subcommand
+    parser.add_argument("args", nargs=argparse.REMAINDER, help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.command != 'startup':
+        return run_command(args.command, args.args)
+
+    parser = argparse.ArgumentParser(prog="fashion_cli.py startup")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help=f"Pengulangan per pengukuran, diambil median (default: {DEFAULT_REPEAT})")
+    startup_args = parser.parse_args(args.args)
+
+    print(f"⏱️  Waktu startup (median {startup_args.repeat}x, proses baru):")
+    for name, seconds in startup_report(startup_args.repeat):
+        print(f"   {name:<24}{seconds * 1000:>9.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+"""
+Fashion MNIST Inference Server
+==============================
+HTTP server lokal untuk prediksi gambar Fashion MNIST.
+Model dimuat SEKALI saat server start, sehingga setiap request tidak perlu
+import TensorFlow dan load_model() ulang seperti predict_custom_image.py.
+
+Fitur:
+1. Request satu gambar atau banyak gambar sekaligus (base64 dalam JSON)
+2. Dynamic micro-batching: request yang datang bersamaan digabung menjadi
+   satu forward pass, dibatasi max batch size dan max waktu tunggu
+3. Response berisi label dan confidence untuk setiap gambar
+4. Body request dibatasi --max-body-bytes; request tanpa Content-Length
+   ditolak (411), body terlalu besar ditolak (413), gambar rusak atau
+   melebihi batas pixel PIL ditolak (400)
+
+Endpoint:
+    GET  /health   -> {"status": "ok"}
+    POST /predict  -> body: {"image": "<base64>"} atau {"images": ["<base64>", ...]}
+                      response: {"predictions": [{"label": ..., "confidence": ...}]}
+
+Penggunaan:
+    python inference_server.py --port 8000 --max-batch-size 64 --max-wait-ms 5
+
+Contoh client:
+    curl -X POST localhost:8000/predict \\
+         -d "{\\"image\\": \\"$(base64 -w0 test-image/sample_1.png)\\"}"
+
+Dibuat oleh: Fathih Apriandi
+"""
+
+import argparse
+import base64
+import binascii
+import io
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from predict_custom_image import (
+    IMAGE_ERRORS,
+    LABELS,
+    MODEL_PATH,
+    build_inference_fn,
+    decode_prediction,
+    load_model,
+    preprocess_image,
+)
+
+# ============================================================================
+# KONFIGURASI DEFAULT SERVER
+# ============================================================================
+
+# Hanya listen di localhost secara default (server untuk penggunaan lokal)
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8000
+
+# Jumlah gambar maksimal dalam satu forward pass
+DEFAULT_MAX_BATCH_SIZE = 64
+
+# Waktu tunggu maksimal (ms) untuk mengumpulkan request sebelum forward pass
+# Semakin besar: batch semakin penuh, tapi latency request pertama naik
+DEFAULT_MAX_WAIT_MS = 5.0
+
+# Ukuran body request maksimal (byte). Satu gambar 28x28 PNG dalam base64
+# hanya ±1 KB, jadi 16 MB cukup untuk ribuan gambar per request
+DEFAULT_MAX_BODY_BYTES = 16 * 1024 * 1024
+
+# ============================================================================
+# CLASS: DYNAMIC MICRO-BATCHER
+# ============================================================================
+
+class MicroBatcher:
+    """
+    Menggabungkan gambar dari banyak request menjadi satu forward pass.
+
+    Setiap gambar masuk ke antrian bersama sebuah Future. Satu worker thread
+    mengambil gambar pertama, lalu menunggu gambar lain sampai batch penuh
+    (max_batch_size) atau batas waktu (max_wait_ms) habis, kemudian
+    menjalankan infer_fn satu kali untuk seluruh batch.
+    """
+
+    def __init__(self, infer_fn, max_batch_size=DEFAULT_MAX_BATCH_SIZE,
+                 max_wait_ms=DEFAULT_MAX_WAIT_MS):
+        """
+        Parameter:
+            infer_fn: callable numpy (N, 28, 28) float32 -> numpy (N, 10)
+            max_batch_size: jumlah gambar maksimal per forward pass
+            max_wait_ms: waktu tunggu maksimal untuk mengisi batch (milidetik)
+        """
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size harus >= 1, didapat: {max_batch_size}")
+
+        self.infer_fn = infer_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        # Antrian berisi (img_array, Future); None = sinyal berhenti
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+        # Statistik sederhana untuk monitoring ukuran batch
+        self.batch_count = 0
+        self.image_count = 0
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Menghentikan worker setelah semua gambar di antrian selesai."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def submit(self, img_array):
+        """
+        Memasukkan satu gambar (28, 28) float32 ke antrian.
+        Return: Future yang berisi baris probabilitas (10,) untuk gambar ini.
+        """
+        future = Future()
+        self._queue.put((img_array, future))
+        return future
+
+    def predict(self, img_arrays):
+        """
+        Memprediksi beberapa gambar dan menunggu hasilnya.
+        Gambar-gambar ini bisa tergabung dengan gambar dari request lain.
+        """
+        futures = [self.submit(img_array) for img_array in img_arrays]
+        return [future.result() for future in futures]
+
+    def _collect_batch(self, first_item):
+        """Mengumpulkan item sampai batch penuh atau waktu tunggu habis."""
+        batch = [first_item]
+        deadline = time.monotonic() + self.max_wait
+        stop = False
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                # Ambil tanpa menunggu jika waktu sudah habis,
+                # supaya item yang sudah antri tetap ikut batch ini
+                item = self._queue.get(timeout=remaining) if remaining > 0 \
+                    else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                stop = True
+                break
+            batch.append(item)
+
+        return batch, stop
+
+    def _run(self):
+        """Loop worker thread: kumpulkan batch → forward pass → isi Future."""
+        stop = False
+        while not stop:
+            first_item = self._queue.get()
+            if first_item is None:
+                break
+
+            batch, stop = self._collect_batch(first_item)
+            futures = [future for _, future in batch]
+
+            try:
+                # Satu forward pass untuk seluruh gambar dalam batch
+                images = np.stack([img_array for img_array, _ in batch])
+                predictions = self.infer_fn(images.astype(np.float32, copy=False))
+            except Exception as error:
+                # Error inferensi diteruskan ke semua request di batch ini
+                for future in futures:
+                    future.set_exception(error)
+                continue
+
+            self.batch_count += 1
+            self.image_count += len(batch)
+            for future, probabilities in zip(futures, predictions):
+                future.set_result(probabilities)
+
+# ============================================================================
+# HTTP REQUEST HANDLER
+# ============================================================================
+
+def decode_request_images(payload):
+    """
+    Mengambil daftar gambar dari body JSON dan mem-preprocess-nya.
+    Format yang diterima: {"image": "<base64>"} atau {"images": [...]}.
+
+    Return: list numpy array (28, 28) float32
+    Raise: ValueError jika format request tidak valid
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("Body harus berupa JSON object")
+
+    if "images" in payload:
+        encoded_images = payload["images"]
+        if not isinstance(encoded_images, list) or not encoded_images:
+            raise ValueError("'images' harus berupa list base64 yang tidak kosong")
+    elif "image" in payload:
+        encoded_images = [payload["image"]]
+    else:
+        raise ValueError("Body harus berisi 'image' atau 'images'")
+
+    img_arrays = []
+    for index, encoded in enumerate(encoded_images):
+        try:
+            raw = base64.b64decode(encoded, validate=True)
+            # Preprocessing sama persis dengan predict_custom_image.py
+            _, img_array = preprocess_image(io.BytesIO(raw))
+        except (TypeError, binascii.Error, *IMAGE_ERRORS) as error:
+            raise ValueError(f"Gambar ke-{index} tidak valid: {error}")
+        img_arrays.append(img_array)
+
+    return img_arrays
+
+
+def make_handler(batcher, max_body_bytes=DEFAULT_MAX_BODY_BYTES):
+    """Membuat class handler HTTP yang memakai batcher tertentu."""
+
+    class PredictionHandler(BaseHTTPRequestHandler):
+        # Log default BaseHTTPRequestHandler terlalu ramai untuk load test
+        def log_message(self, format, *args):
+            pass
+
+        def _read_body(self):
+            """
+            Membaca body sesuai Content-Length.
+            Return: bytes body, atau None jika request sudah ditolak
+            """
+            header = self.headers.get('Content-Length')
+            if header is None:
+                self._send_error_and_close(411, "Header Content-Length wajib ada")
+                return None
+            try:
+                length = int(header)
+            except ValueError:
+                length = -1
+            if length < 0:
+                self._send_error_and_close(400, f"Content-Length tidak valid: {header!r}")
+                return None
+            if length > max_body_bytes:
+                self._send_error_and_close(
+                    413, f"Body {length} byte melebihi batas {max_body_bytes} byte")
+                return None
+            return self.rfile.read(length)
+
+        def _send_error_and_close(self, status, message):
+            # Body tidak dibaca, jadi koneksi tidak boleh dipakai ulang
+            self.close_connection = True
+            self._send_json(status, {"error": message})
+
+        def _send_json(self, status, body):
+            data = json.dumps(body).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path == '/health':
+                self._send_json(200, {"status": "ok"})
+            else:
+                self._send_json(404, {"error": f"Path '{self.path}' tidak ditemukan"})
+
+        def do_POST(self):
+            if self.path != '/predict':
+                self._send_json(404, {"error": f"Path '{self.path}' tidak ditemukan"})
+                return
+
+            body = self._read_body()
+            if body is None:
+                return
+
+            try:
+                payload = json.loads(body)
+                img_arrays = decode_request_images(payload)
+            except (ValueError, json.JSONDecodeError) as error:
+                self._send_json(400, {"error": str(error)})
+                return
+
+            try:
+                predictions = batcher.predict(img_arrays)
+            except Exception as error:
+                self._send_json(500, {"error": f"Inferensi gagal: {error}"})
+                return
+
+            results = []
+            for probabilities in predictions:
+                pred_label, confidence = decode_prediction(probabilities)
+                results.append({"label": pred_label, "confidence": confidence})
+
+            self._send_json(200, {"predictions": results})
+
+    return PredictionHandler
+
+
+def create_server(batcher, host=DEFAULT_HOST, port=DEFAULT_PORT,
+                  max_body_bytes=DEFAULT_MAX_BODY_BYTES):
+    """
+    Membuat ThreadingHTTPServer: setiap request ditangani thread sendiri,
+    sehingga request yang bersamaan bisa digabung oleh MicroBatcher.
+    Gunakan port=0 agar OS memilih port kosong (berguna untuk testing).
+    """
+    return ThreadingHTTPServer((host, port), make_handler(batcher, max_body_bytes))
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="HTTP inference server Fashion MNIST dengan dynamic micro-batching"
+    )
+    parser.add_argument("--model", default=MODEL_PATH,
+                        help=f"Path file model (default: {MODEL_PATH})")
+    parser.add_argument("--host", default=DEFAULT_HOST,
+                        help=f"Alamat listen (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT,
+                        help=f"Port listen (default: {DEFAULT_PORT})")
+    parser.add_argument("--max-batch-size", type=int, default=DEFAULT_MAX_BATCH_SIZE,
+                        help=f"Gambar maksimal per forward pass (default: {DEFAULT_MAX_BATCH_SIZE})")
+    parser.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT_MS,
+                        help=f"Waktu tunggu maksimal pengisian batch (default: {DEFAULT_MAX_WAIT_MS})")
+    parser.add_argument("--max-body-bytes", type=int, default=DEFAULT_MAX_BODY_BYTES,
+                        help=f"Ukuran body request maksimal (default: {DEFAULT_MAX_BODY_BYTES})")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    # Model dimuat sekali dan dipakai selama server hidup
+    model = load_model(args.model)
+    infer = build_inference_fn(model)
+
+    batcher = MicroBatcher(
+        lambda images: infer(images).numpy(),
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+    ).start()
+
+    server = create_server(batcher, args.host, args.port, args.max_body_bytes)
+    print(f"🚀 Server berjalan di http://{args.host}:{server.server_port}")
+    print(f"   Label: {', '.join(LABELS)}")
+    print(f"   Max batch size: {args.max_batch_size}, max wait: {args.max_wait_ms} ms")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Menghentikan server...")
+    finally:
+        server.server_close()
+        batcher.stop()
+        print(f"📊 Total {batcher.image_count} gambar dalam {batcher.batch_count} batch")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""
+Fashion MNIST NumPy Inference Engine
+====================================
+Inferensi model Flatten → Dense(512, ReLU) → Dense(10, Softmax) hanya dengan
+NumPy, menggunakan weights hasil export_numpy_model.py.
+
+Model ini hanya dua perkalian matriks, sehingga tidak perlu import
+TensorFlow (beberapa detik) dan graph Keras untuk melakukan prediksi.
+Module ini sengaja TIDAK meng-import TensorFlow; TensorFlow hanya
+di-import di dalam fungsi benchmark untuk perbandingan.
+
+Penggunaan sebagai library:
+    from numpy_inference import NumpyFashionModel
+    model = NumpyFashionModel.load('fashion_mnist_weights.npz')
+    probabilitas = model.predict(batch_gambar)   # (N, 28, 28) → (N, 10)
+
+Laporan cold start & latency (NumPy vs TensorFlow):
+    python numpy_inference.py --batch-size 256 --repeat 50
+
+Dibuat oleh: Fathih Apriandi
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+# ============================================================================
+# KONFIGURASI PATH
+# ============================================================================
+
+# File weights hasil export_numpy_model.py
+WEIGHTS_PATH = 'fashion_mnist_weights.npz'
+
+# Model Keras asli (hanya untuk perbandingan benchmark)
+MODEL_PATH = 'fashion_mnist_model.keras'
+
+# ============================================================================
+# FUNGSI AKTIVASI
+# ============================================================================
+
+def relu(x):
+    # In-place agar tidak membuat salinan matriks hidden (N, 512)
+    return np.maximum(x, 0.0, out=x)
+
+
+def softmax(x):
+    # Kurangi nilai maksimum per baris agar exp() tidak overflow
+    x = x - x.max(axis=1, keepdims=True)
+    np.exp(x, out=x)
+    x /= x.sum(axis=1, keepdims=True)
+    return x
+
+
+def linear(x):
+    return x
+
+
+ACTIVATIONS = {
+    'relu': relu,
+    'softmax': softmax,
+    'linear': linear,
+}
+
+# ============================================================================
+# CLASS: MODEL NUMPY
+# ============================================================================
+
+class NumpyFashionModel:
+    """
+    Model feed-forward Fashion MNIST yang dijalankan dengan NumPy float32.
+    """
+
+    def __init__(self, kernels, biases, activations):
+        self.kernels = [np.ascontiguousarray(k, dtype=np.float32) for k in kernels]
+        self.biases = [np.asarray(b, dtype=np.float32) for b in biases]
+        self.activations = [ACTIVATIONS[str(name)] for name in activations]
+        self.activation_names = [str(name) for name in activations]
+
+    @classmethod
+    def load(cls, weights_path=WEIGHTS_PATH):
+        """Memuat weights dari file .npz hasil export_numpy_model.py."""
+        with np.load(weights_path) as data:
+            activations = list(data["activations"])
+            kernels = [data[f"kernel_{i}"] for i in range(len(activations))]
+            biases = [data[f"bias_{i}"] for i in range(len(activations))]
+        return cls(kernels, biases, activations)
+
+    @property
+    def input_size(self):
+        return self.kernels[0].shape[0]
+
+    def _matmul(self, x, index):
+        """Perkalian input dengan kernel layer ke-`index` (di-override model int8)."""
+        return x @ self.kernels[index]
+
+    def forward(self, images, until_layer=None):
+        """
+        Forward pass sampai layer Dense ke-`until_layer` (default: semua).
+
+        Parameter:
+            images: array (N, 28, 28) atau (N, 784); float32 [0, 1]
+                    atau uint8 [0, 255] (dinormalisasi otomatis)
+        """
+        x = np.asarray(images)
+        if x.dtype == np.uint8:
+            x = x.astype(np.float32) / 255.0
+
+        # Flatten: (N, 28, 28) → (N, 784)
+        x = x.reshape(len(x), self.input_size).astype(np.float32, copy=False)
+
+        layers = zip(self.biases, self.activations)
+        for index, (bias, activation) in enumerate(layers):
+            if until_layer is not None and index > until_layer:
+                break
+            # x @ W + b lalu aktivasi (hasil matmul adalah array baru,
+            # sehingga aktivasi in-place tidak mengubah input)
+            x = self._matmul(x, index)
+            x += bias
+            x = activation(x)
+        return x
+
+    def predict(self, images):
+        """
+        Return: numpy array (N, 10) berisi probabilitas 10 kelas.
+        """
+        return self.forward(images)
+
+# ============================================================================
+# BENCHMARK: NUMPY VS TENSORFLOW
+# ============================================================================
+
+# Script kecil yang dijalankan di proses baru untuk mengukur cold start:
+# waktu dari proses mulai sampai prediksi pertama selesai
+_COLD_START_SCRIPTS = {
+    'numpy': (
+        "import numpy as np\n"
+        "from numpy_inference import NumpyFashionModel\n"
+        "model = NumpyFashionModel.load({path!r})\n"
+        "model.predict(np.zeros((1, 28, 28), np.float32))\n"
+    ),
+    'tensorflow': (
+        "import numpy as np\n"
+        "import tensorflow as tf\n"
+        "model = tf.keras.models.load_model({path!r})\n"
+        "model.predict(np.zeros((1, 28, 28), np.float32), verbose=0)\n"
+    ),
+}
+
+
+def measure_cold_start(engine, path):
+    """Mengukur waktu (detik) proses Python baru sampai prediksi pertama."""
+    script = _COLD_START_SCRIPTS[engine].format(path=path)
+    env = dict(os.environ, TF_CPP_MIN_LOG_LEVEL='3')
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, '-c', script], check=True, env=env,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    return time.perf_counter() - start
+
+
+def measure_latency(predict_fn, images, repeat):
+    """Menjalankan predict_fn berulang kali, return list latency (detik)."""
+    # Warm-up: run pertama sering lebih lambat (alokasi, tracing)
+    predict_fn(images)
+
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        predict_fn(images)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def benchmark(weights_path=WEIGHTS_PATH, model_path=MODEL_PATH, batch_size=256, repeat=50):
+    """
+    Membandingkan cold start dan latency per batch NumPy vs TensorFlow.
+    Return: dictionary hasil per engine.
+    """
+    images = np.random.default_rng(0).random((batch_size, 28, 28), dtype=np.float32)
+    results = {}
+
+    numpy_model = NumpyFashionModel.load(weights_path)
+    numpy_latencies = measure_latency(numpy_model.predict, images, repeat)
+    results['numpy'] = {
+        'cold_start_s': measure_cold_start('numpy', os.path.abspath(weights_path)),
+        'batch_latency_ms': 1000 * float(np.median(numpy_latencies)),
+    }
+
+    # TensorFlow hanya di-import di sini, khusus untuk perbandingan
+    import tensorflow as tf
+    from predict_custom_image import build_inference_fn
+
+    tf_infer = build_inference_fn(tf.keras.models.load_model(model_path))
+    tf_latencies = measure_latency(lambda x: tf_infer(x).numpy(), images, repeat)
+    results['tensorflow'] = {
+        'cold_start_s': measure_cold_start('tensorflow', os.path.abspath(model_path)),
+        'batch_latency_ms': 1000 * float(np.median(tf_latencies)),
+    }
+
+    # Selisih maksimum probabilitas antar engine sebagai sanity check
+    max_diff = float(np.abs(numpy_model.predict(images) - tf_infer(images).numpy()).max())
+    for engine in results.values():
+        engine['batch_size'] = batch_size
+        engine['images_per_s'] = batch_size / (engine['batch_latency_ms'] / 1000)
+    results['max_abs_diff'] = max_diff
+    return results
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Laporan cold start & latency inferensi NumPy vs TensorFlow"
+    )
+    parser.add_argument("--weights", default=WEIGHTS_PATH,
+                        help=f"File .npz dari export_numpy_model.py (default: {WEIGHTS_PATH})")
+    parser.add_argument("--model", default=MODEL_PATH,
+                        help=f"Model Keras untuk pembanding (default: {MODEL_PATH})")
+    parser.add_argument("--batch-size", type=int, default=256,
+                        help="Jumlah gambar per batch (default: 256)")
+    parser.add_argument("--repeat", type=int, default=50,
+                        help="Jumlah pengulangan pengukuran latency (default: 50)")
+    parser.add_argument("--json", action="store_true",
+                        help="Cetak hasil dalam format JSON")
+    args = parser.parse_args()
+
+    results = benchmark(args.weights, args.model, args.batch_size, args.repeat)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"\n📊 Perbandingan engine (batch size {args.batch_size}):")
+    print(f"   {'Engine':<12}{'Cold start':>14}{'Latency/batch':>16}{'Gambar/detik':>16}")
+    for engine in ('numpy', 'tensorflow'):
+        hasil = results[engine]
+        print(f"   {engine:<12}{hasil['cold_start_s']:>13.2f}s"
+              f"{hasil['batch_latency_ms']:>14.3f}ms{hasil['images_per_s']:>16,.0f}")
+    print(f"   Selisih probabilitas maksimum: {results['max_abs_diff']:.2e}")
+
+
+if __name__ == "__main__":
+    main()
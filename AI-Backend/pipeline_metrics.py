@@ -0,0 +1,190 @@
+"""
+Fashion MNIST Prediction Pipeline Metrics
+=========================================
+Instrumentasi opsional untuk pipeline prediksi (predict_custom_image.py):
+timer per stage, counter, jumlah prediksi per label, dan kedalaman antrian.
+
+Stage yang diukur:
+- rmtree : menghapus folder result lama
+- open   : Image.open + decode + convert grayscale
+- resize : resize ke 28x28 + normalisasi
+- predict: forward pass model per batch
+- save   : img.save ke result/<label>/
+
+Export:
+- tabel ringkasan di terminal
+- file metrics format JSON atau Prometheus text (berdasarkan ekstensi .prom)
+
+Jika instrumentasi tidak aktif, NULL_METRICS dipakai: semua method berupa
+no-op dan stage() mengembalikan context manager kosong yang sama, sehingga
+overhead-nya hanya satu pemanggilan method per stage.
+
+Dibuat oleh: Fathih Apriandi
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# Prefix nama metric Prometheus
+METRIC_PREFIX = 'fashion_predict'
+
+# ============================================================================
+# CLASS: METRICS AKTIF
+# ============================================================================
+
+class PipelineMetrics:
+    """
+    Pengumpul metrics yang thread-safe (stage preprocess berjalan di
+    worker thread, lihat iter_preprocessed_batches).
+    """
+
+    enabled = True
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+
+        # {stage: [total_detik, jumlah_panggilan]}
+        self.stages = {}
+        # {nama: nilai} contoh: images_processed, bytes_read, bytes_written
+        self.counters = {}
+        # {label: jumlah} (sama dengan prediction_count)
+        self.label_counts = {}
+        # {nama: [total, jumlah_observasi, maksimum]}
+        self.gauges = {}
+
+    @contextmanager
+    def stage(self, name):
+        """Context manager untuk mengukur waktu satu stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                entry = self.stages.setdefault(name, [0.0, 0])
+                entry[0] += elapsed
+                entry[1] += 1
+
+    def count(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def count_label(self, label, value=1):
+        with self._lock:
+            self.label_counts[label] = self.label_counts.get(label, 0) + value
+
+    def observe(self, name, value):
+        """Mencatat satu observasi gauge (contoh: kedalaman antrian)."""
+        with self._lock:
+            entry = self.gauges.setdefault(name, [0.0, 0, value])
+            entry[0] += value
+            entry[1] += 1
+            entry[2] = max(entry[2], value)
+
+    # ------------------------------------------------------------------------
+    # EXPORT
+    # ------------------------------------------------------------------------
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'wall_seconds': time.perf_counter() - self._start,
+                'stages': {
+                    name: {'seconds': total, 'calls': calls}
+                    for name, (total, calls) in self.stages.items()
+                },
+                'counters': dict(self.counters),
+                'labels': dict(self.label_counts),
+                'gauges': {
+                    name: {'avg': total / count if count else 0.0, 'max': maximum}
+                    for name, (total, count, maximum) in self.gauges.items()
+                },
+            }
+
+    def to_prometheus(self):
+        """Format Prometheus text exposition."""
+        data = self.to_dict()
+        p = METRIC_PREFIX
+        lines = [
+            f"# HELP {p}_wall_seconds Total waktu run prediksi",
+            f"# TYPE {p}_wall_seconds gauge",
+            f"{p}_wall_seconds {data['wall_seconds']:.6f}",
+            f"# HELP {p}_stage_seconds_total Total waktu per stage (dijumlah antar worker)",
+            f"# TYPE {p}_stage_seconds_total counter",
+        ]
+        for name, stage in data['stages'].items():
+            lines.append(f'{p}_stage_seconds_total{{stage="{name}"}} {stage["seconds"]:.6f}')
+
+        lines += [f"# TYPE {p}_stage_calls_total counter"]
+        for name, stage in data['stages'].items():
+            lines.append(f'{p}_stage_calls_total{{stage="{name}"}} {stage["calls"]}')
+
+        for name, value in data['counters'].items():
+            lines += [f"# TYPE {p}_{name}_total counter", f"{p}_{name}_total {value}"]
+
+        lines += [f"# TYPE {p}_label_total counter"]
+        for label, value in data['labels'].items():
+            escaped = label.replace('\\', '\\\\').replace('"', '\\"')
+            lines.append(f'{p}_label_total{{label="{escaped}"}} {value}')
+
+        for name, gauge in data['gauges'].items():
+            lines += [
+                f"# TYPE {p}_{name} gauge",
+                f'{p}_{name}{{stat="avg"}} {gauge["avg"]:.3f}',
+                f'{p}_{name}{{stat="max"}} {gauge["max"]}',
+            ]
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Menyimpan metrics ke file: .prom = Prometheus text, selain itu JSON."""
+        with open(path, 'w') as f:
+            if path.endswith('.prom'):
+                f.write(self.to_prometheus())
+            else:
+                json.dump(self.to_dict(), f, indent=2)
+
+    def print_summary(self):
+        """Menampilkan tabel ringkasan per stage dan counter."""
+        data = self.to_dict()
+        wall = data['wall_seconds']
+
+        print(f"\n⏱️  Instrumentasi pipeline (wall time {wall:.3f}s):")
+        print(f"   {'Stage':<10}{'Total (s)':>12}{'Panggilan':>12}{'Rata-rata (ms)':>16}")
+        for name, stage in data['stages'].items():
+            avg_ms = 1000 * stage['seconds'] / stage['calls'] if stage['calls'] else 0.0
+            print(f"   {name:<10}{stage['seconds']:>12.3f}{stage['calls']:>12}{avg_ms:>16.3f}")
+        print("   (total stage open/resize dijumlah antar worker, bisa melebihi wall time)")
+
+        for name, value in data['counters'].items():
+            print(f"   • {name}: {value:,}")
+        for name, gauge in data['gauges'].items():
+            print(f"   • {name}: rata-rata {gauge['avg']:.2f}, maksimum {gauge['max']}")
+
+# ============================================================================
+# CLASS: METRICS NON-AKTIF (NO-OP)
+# ============================================================================
+
+class NullMetrics:
+    """Pengganti PipelineMetrics saat instrumentasi tidak aktif."""
+
+    enabled = False
+    _context = nullcontext()
+
+    def stage(self, name):
+        return self._context
+
+    def count(self, name, value=1):
+        pass
+
+    def count_label(self, label, value=1):
+        pass
+
+    def observe(self, name, value):
+        pass
+
+
+# Instance tunggal yang dipakai sebagai default parameter
+NULL_METRICS = NullMetrics()
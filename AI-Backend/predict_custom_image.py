@@ -5,18 +5,62 @@ Script untuk melakukan prediksi pada gambar custom menggunakan model yang sudah
 Fitur:
 1. Klasifikasi gambar ke 10 kategori fashion
 2. Organisasi hasil ke folder berdasarkan label
-3. Visualisasi distribusi prediksi dengan bar chart
+3. Visualisasi distribusi prediksi dengan bar chart (disimpan ke file PNG,
+   tanpa jendela GUI sehingga aman untuk batch job headless)
 4. Confidence score untuk setiap prediksi
+5. Mode batch: banyak gambar diprediksi sekaligus dalam satu forward pass
+6. Preprocessing paralel: decode & resize gambar dikerjakan worker pool
+   sementara batch sebelumnya diprediksi
+7. Instrumentasi opsional: timer per stage, counter, dan export metrics
+8. Mode incremental: hanya gambar baru/berubah yang diproses (lihat
+   prediction_manifest.py)
+9. Cache prediksi berbasis isi gambar: duplikat tidak di-decode dan tidak
+   diprediksi ulang (lihat prediction_cache.py)
+10. Watch mode: proses long-running yang memprediksi gambar begitu masuk
+    ke folder input
+11. Pipeline asyncio: baca, inferensi, dan tulis file berjalan tumpang
+    tindih dengan antrian terbatas (backpressure)
+12. Mode output murah: hardlink/symlink file asli atau hanya file prediksi
+    JSONL/CSV (lihat prediction_output.py)
+
+Penggunaan:
+    python predict_custom_image.py                   # batch size default (32)
+    python predict_custom_image.py --batch-size 256  # batch lebih besar
+    python predict_custom_image.py --workers 8 --prefetch 4
+    python predict_custom_image.py --metrics --metrics-file metrics.prom
+    python predict_custom_image.py --incremental
+    python predict_custom_image.py --cache --cache-file prediction-cache.db
+    python predict_custom_image.py --watch --max-latency 0.5
+    python predict_custom_image.py --async-io --max-in-flight 512
+    python predict_custom_image.py --output-mode hardlink --predictions-file result/predictions.jsonl
+    python predict_custom_image.py --chart distribusi.png   # atau --no-chart
 
 Dibuat oleh: Fathih Apriandi
 """
 
-import tensorflow as tf
 import numpy as np
 from PIL import Image
+import argparse
+import asyncio
+import io
 import os
 import shutil
-import matplotlib.pyplot as plt
+import signal
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from pipeline_metrics import NULL_METRICS, PipelineMetrics
+from prediction_cache import DEFAULT_MAX_ENTRIES, PredictionCache
+from prediction_manifest import MANIFEST_FILENAME, PredictionManifest, model_fingerprint
+from prediction_output import OUTPUT_MODES, PredictionWriter, rewrite_predictions_file
+
+# TensorFlow dan matplotlib sengaja tidak di-import di sini: keduanya butuh
+# beberapa detik untuk di-import, padahal --help, dry run, atau module lain
+# yang hanya memakai LABELS/preprocess_image() tidak membutuhkannya.
+# Keduanya di-import di dalam fungsi yang memakainya.
 
 # ============================================================================
 # KONFIGURASI LABEL FASHION MNIST
@@ -38,19 +82,11 @@ LABELS = [
 ]
 
 # ============================================================================
-# LOAD MODEL YANG SUDAH DILATIH
+# KONFIGURASI PATH & FOLDER
 # ============================================================================
 
-# Memuat model Fashion MNIST yang sudah dilatih
-# Model berisi arsitektur neural network dan weights hasil training
-# Format .keras: format modern TensorFlow untuk model saving/loading
-print("🔄 Memuat model yang sudah dilatih...")
-model = tf.keras.models.load_model('fashion_mnist_model.keras')
-print("✅ Model berhasil dimuat!")
-
-# ============================================================================
-# KONFIGURASI FOLDER INPUT & OUTPUT
-# ============================================================================
+# Path ke file model hasil train_fashion_mnist_model.py
+MODEL_PATH = 'fashion_mnist_model.keras'
 
 # Folder input: berisi gambar yang akan diprediksi
 # Expected: gambar PNG/JPG/JPEG dari download_image.py
@@ -60,158 +96,1097 @@ INPUT_FOLDER = 'test-image'
 # Struktur: result/label/gambar.png
 OUTPUT_FOLDER = 'result'
 
-# ============================================================================
-# SETUP FOLDER OUTPUT
-# ============================================================================
+# File bar chart distribusi prediksi
+CHART_PATH = os.path.join(OUTPUT_FOLDER, 'distribution.png')
+
+# Ekstensi file gambar yang didukung (dibandingkan dalam huruf kecil)
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+# Ukuran input model (sesuai Flatten(input_shape=(28, 28)) saat training)
+IMAGE_SIZE = (28, 28)
+
+# Error satu gambar yang dicatat lalu dilewati (bukan menghentikan run):
+# IO (hilang, permission), decode PIL (UnidentifiedImageError turunan
+# OSError), dan gambar raksasa yang ditolak PIL
+IMAGE_ERRORS = (OSError, ValueError, Image.DecompressionBombError)
+
+# Jumlah gambar default yang diprediksi dalam satu forward pass
+# Nilai 1 menghasilkan perilaku yang sama dengan prediksi satu per satu
+DEFAULT_BATCH_SIZE = 32
+
+# Jumlah worker thread untuk decode/resize gambar
+# 0 = preprocessing serial di main thread (tanpa pool)
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
 
-# Hapus folder result jika sudah ada (clean start)
-# shutil.rmtree: menghapus recursive seluruh isi folder
-# Tujuan: menghindari duplikasi file dari run sebelumnya
-if os.path.exists(OUTPUT_FOLDER):
-    shutil.rmtree(OUTPUT_FOLDER)
-    print(f"🗑️  Folder '{OUTPUT_FOLDER}' lama dihapus")
+# Jumlah batch maksimal yang boleh diproses di depan (kapasitas antrian)
+# Membatasi memori: paling banyak prefetch × batch_size gambar di RAM
+DEFAULT_PREFETCH = 2
 
-# Buat folder result utama
-os.makedirs(OUTPUT_FOLDER)
-print(f"📁 Folder '{OUTPUT_FOLDER}' dibuat")
+# Pipeline asyncio: jumlah gambar maksimal yang sedang diproses sekaligus
+# (dibaca → diprediksi → ditulis). Membatasi memori saat disk lambat
+DEFAULT_MAX_IN_FLIGHT = 256
 
-# Buat subfolder untuk setiap label fashion
-# Setiap kategori mendapat folder terpisah untuk organisasi hasil
-for label in LABELS:
-    label_path = os.path.join(OUTPUT_FOLDER, label)
-    os.makedirs(label_path, exist_ok=True)
-    print(f"   📂 Subfolder '{label}' dibuat")
+# Watch mode: interval polling folder input (detik)
+DEFAULT_POLL_INTERVAL = 0.5
 
-print("✅ Struktur folder output siap!")
+# Watch mode: waktu tunggu maksimal file yang sudah siap sebelum batch-nya
+# diprediksi, walaupun batch belum penuh (detik)
+DEFAULT_MAX_LATENCY = 1.0
 
 # ============================================================================
-# INISIALISASI STATISTIK PREDIKSI
+# FUNGSI: LOAD MODEL
 # ============================================================================
 
-# Dictionary untuk melacak jumlah prediksi per label
-# Format: {label: count} dengan initial value 0 untuk semua label
-# Digunakan untuk analisis distribusi hasil klasifikasi
-prediction_count = {label: 0 for label in LABELS}
+def load_model(model_path=MODEL_PATH):
+    """
+    Memuat model Fashion MNIST yang sudah dilatih.
+    Model berisi arsitektur neural network dan weights hasil training.
+    """
+    import tensorflow as tf
+
+    print("🔄 Memuat model yang sudah dilatih...")
+    model = tf.keras.models.load_model(model_path)
+    print("✅ Model berhasil dimuat!")
+    return model
 
 # ============================================================================
-# PROSES PREDIKSI UNTUK SETIAP GAMBAR
+# FUNGSI: SETUP FOLDER OUTPUT
 # ============================================================================
 
-print(f"\n🔍 Memindai folder '{INPUT_FOLDER}' untuk gambar...")
+def prepare_output_folder(output_folder=OUTPUT_FOLDER, metrics=NULL_METRICS, clean=True):
+    """
+    Menyiapkan folder result dan subfolder untuk setiap label.
+    Jika clean=True, folder lama dihapus terlebih dahulu (clean start) agar
+    tidak ada duplikasi file dari run sebelumnya. Mode incremental memakai
+    clean=False agar hasil run sebelumnya tetap dipakai.
+    """
+    # shutil.rmtree: menghapus recursive seluruh isi folder
+    if clean and os.path.exists(output_folder):
+        with metrics.stage('rmtree'):
+            shutil.rmtree(output_folder)
+        print(f"🗑️  Folder '{output_folder}' lama dihapus")
+
+    # Buat folder result utama
+    os.makedirs(output_folder, exist_ok=True)
+    print(f"📁 Folder '{output_folder}' siap")
+
+    # Buat subfolder untuk setiap label fashion
+    # Setiap kategori mendapat folder terpisah untuk organisasi hasil
+    for label in LABELS:
+        label_path = os.path.join(output_folder, label)
+        os.makedirs(label_path, exist_ok=True)
+        print(f"   📂 Subfolder '{label}' siap")
+
+    print("✅ Struktur folder output siap!")
+
+
+def remove_previous_output(output_folder, filename, entry):
+    """
+    Menghapus hasil lama sebuah file (dari entry manifest) sebelum file
+    tersebut diprediksi ulang atau setelah file dihapus dari folder input.
+    """
+    if entry is None:
+        return
+    old_path = os.path.join(output_folder, entry['label'], filename)
+    # lexists: symlink yang targetnya sudah dihapus juga ikut dibersihkan
+    if os.path.lexists(old_path):
+        os.remove(old_path)
 
-# Loop melalui semua file di folder input
-for filename in os.listdir(INPUT_FOLDER):
-    # Filter hanya file gambar dengan ekstensi yang didukung
+# ============================================================================
+# FUNGSI: SCAN & PREPROCESS GAMBAR
+# ============================================================================
+
+def list_images(input_folder=INPUT_FOLDER):
+    """
+    Mengembalikan daftar nama file gambar di folder input.
+    Urutan mengikuti os.listdir() agar output sama dengan versi sebelumnya.
+    """
     # .lower() untuk handle case sensitivity (PNG vs png)
-    if filename.lower().endswith(('.png', '.jpg', '.jpeg')):
-        # Construct full path ke gambar
-        img_path = os.path.join(INPUT_FOLDER, filename)
-        
-        # ====================================================================
-        # PREPROCESS GAMBAR
-        # ====================================================================
-        
-        # Buka gambar dengan PIL (Python Imaging Library)
-        # .convert('L'): Convert ke grayscale (sesuai format Fashion MNIST)
+    return [
+        filename for filename in os.listdir(input_folder)
+        if filename.lower().endswith(IMAGE_EXTENSIONS)
+    ]
+
+
+def preprocess_image(img_path, metrics=NULL_METRICS):
+    """
+    Membaca satu gambar dan menyiapkannya untuk model.
+
+    Parameter:
+        img_path: path file gambar atau file-like object (contoh: io.BytesIO)
+        metrics: PipelineMetrics untuk instrumentasi (default: non-aktif)
+
+    Return:
+        img: PIL Image grayscale 28x28 (untuk disimpan ke folder result)
+        img_array: numpy array float32 shape (28, 28) dengan range [0, 1]
+    """
+    # .convert('L'): Convert ke grayscale (sesuai format Fashion MNIST)
+    # Decode file sebenarnya terjadi di sini (Image.open bersifat lazy)
+    with metrics.stage('open'):
+        img = Image.open(img_path).convert('L')
+
+    with metrics.stage('resize'):
         # .resize((28, 28)): Ubah ukuran ke 28x28 pixels (input model requirement)
-        img = Image.open(img_path).convert('L').resize((28, 28))
-        
-        # ====================================================================
-        # PREPARE INPUT UNTUK MODEL
-        # ====================================================================
-        
-        # Konversi PIL Image ke numpy array
-        # Nilai pixel: 0-255 (hitam-putih)
-        img_array = np.array(img)
-        
+        img = img.resize(IMAGE_SIZE)
+
         # Normalisasi: ubah range [0, 255] → [0, 1]
         # Harus sama dengan normalisasi saat training!
-        img_array = img_array / 255.0
-        
-        # Reshape untuk model: (28, 28) → (1, 28, 28)
-        # Dimension: (batch_size, height, width)
-        # batch_size=1 karena kita prediksi satu gambar per waktu
-        img_array = img_array.reshape(1, 28, 28)
-        
-        # ====================================================================
-        # PREDIKSI DENGAN MODEL
-        # ====================================================================
-        
-        # Model.predict: melakukan forward propagation
-        # Output: array 2D dengan shape (1, 10) - probabilitas 10 kelas
-        # verbose=0: matikan progress bar (output lebih clean)
-        prediction = model.predict(img_array, verbose=0)
-        
-        # Ambil index dengan probabilitas tertinggi
-        # np.argmax: return index of maximum value
-        pred_index = np.argmax(prediction)
-        
-        # Konversi index ke label text
-        pred_label = LABELS[pred_index]
-        
-        # Hitung confidence score (probabilitas maksimal)
-        # Convert ke percent dengan × 100
-        confidence = float(np.max(prediction)) * 100
-        
-        # ====================================================================
-        # OUTPUT DAN PENYIMPANAN HASIL
-        # ====================================================================
-        
-        # Tampilkan hasil di terminal
-        print(f"   📸 {filename}: {pred_label} ({confidence:.2f}%)")
-        
-        # Simpan gambar ke folder sesuai label prediksi
-        output_path = os.path.join(OUTPUT_FOLDER, pred_label, filename)
-        img.save(output_path)
-        
-        # Update statistik prediksi
-        prediction_count[pred_label] += 1
-
-# ============================================================================
-# VISUALISASI DISTRIBUSI PREDIKSI
-# ============================================================================
-
-print(f"\n📊 Membuat visualisasi distribusi prediksi...")
-
-# Extract data untuk plotting
-labels = list(prediction_count.keys())
-values = list(prediction_count.values())
-
-# Buat figure dan axis untuk plotting
-plt.figure(figsize=(10, 5))
-
-# Buat bar chart
-bars = plt.bar(labels, values, color='skyblue', edgecolor='navy', alpha=0.7)
-
-# Konfigurasi chart
-plt.title("Distribusi Prediksi Fashion MNIST", fontsize=14, fontweight='bold')
-plt.xlabel("Kategori Fashion", fontsize=12)
-plt.ylabel("Jumlah Gambar", fontsize=12)
-plt.xticks(rotation=45, ha='right')  # Rotasi label x untuk readability
-plt.grid(axis='y', linestyle='--', alpha=0.6)  # Grid horizontal
-
-# Tambahkan nilai di atas setiap bar
-for bar in bars:
-    yval = bar.get_height()
-    # Text position: center of bar, slightly above height
-    plt.text(bar.get_x() + bar.get_width()/2, yval + 0.1, int(yval),
-             ha='center', va='bottom', fontsize=9, fontweight='bold')
-
-# Adjust layout untuk prevent label cutoff
-plt.tight_layout()
-
-# Tampilkan plot
-plt.show()
-
-# ============================================================================
-# SUMMARY FINAL
-# ============================================================================
-
-total_images = sum(prediction_count.values())
-print(f"\n🎉 PROSES SELESAI!")
-print(f"📈 Total gambar diproses: {total_images}")
-print(f"📁 Hasil disimpan di folder: '{OUTPUT_FOLDER}/'")
-print(f"📊 Distribusi prediksi:")
-for label, count in prediction_count.items():
-    if count > 0:
-        print(f"   • {label}: {count} gambar")
\ No newline at end of file
+        # float32 langsung dipakai agar tidak ada konversi ulang dari float64
+        img_array = np.asarray(img, dtype=np.float32) / 255.0
+
+    if metrics.enabled and isinstance(img_path, (str, os.PathLike)):
+        metrics.count('bytes_read', os.path.getsize(img_path))
+
+    return img, img_array
+
+
+def preprocess_or_error(img_path, metrics=NULL_METRICS):
+    """
+    preprocess_image() untuk pemrosesan massal: satu gambar rusak atau
+    hilang tidak boleh menghentikan seluruh run.
+
+    Return:
+        (img_array, None) jika berhasil, (None, pesan error) jika gagal
+    """
+    try:
+        _, img_array = preprocess_image(img_path, metrics)
+    except IMAGE_ERRORS as error:
+        return None, f"{type(error).__name__}: {error}"
+    return img_array, None
+
+
+def skip_unreadable(preprocess):
+    """
+    Membungkus fungsi preprocess (preprocess_image / preprocess_image_cached)
+    agar gambar yang gagal dibaca tidak menghentikan run.
+
+    Return:
+        fungsi yang menghasilkan (tuple hasil preprocess, None) jika
+        berhasil, atau (None, pesan error) jika gagal; pasangkan dengan
+        split_unreadable()
+    """
+    def preprocess_or_skip(img_path, metrics=NULL_METRICS):
+        try:
+            return preprocess(img_path, metrics), None
+        except IMAGE_ERRORS as error:
+            return None, f"{type(error).__name__}: {error}"
+    return preprocess_or_skip
+
+
+def split_unreadable(batch_files, outputs, errors, skipped=None, metrics=NULL_METRICS):
+    """
+    Memisahkan file yang gagal dibaca dari batch hasil skip_unreadable().
+    File yang gagal ditampilkan dan dicatat ke list `skipped` sebagai
+    (filename, error); file itu tidak diprediksi dan tidak masuk manifest.
+
+    Return:
+        batch dengan format iter_preprocessed_batches(), atau None jika
+        semua file di batch gagal dibaca
+    """
+    readable = []
+    for i, (filename, error) in enumerate(zip(batch_files, errors)):
+        if error is None:
+            readable.append(i)
+            continue
+        print(f"   ⚠️  {filename} dilewati: {error}")
+        metrics.count('images_skipped')
+        if skipped is not None:
+            skipped.append((filename, error))
+
+    if not readable:
+        return None
+    return ([batch_files[i] for i in readable], *map(list, zip(*[outputs[i] for i in readable])))
+
+
+def preprocess_image_cached(img_path, metrics=NULL_METRICS, *, cache):
+    """
+    Seperti preprocess_image(), tetapi cek cache prediksi dulu.
+
+    File dibaca sekali sebagai bytes untuk menghitung key cache. Jika hit,
+    decode & resize dilewati: gambar hasil dibangun dari pixel di cache.
+
+    Return:
+        img: PIL Image grayscale 28x28
+        img_array: numpy array float32 (28, 28), atau None jika hit
+        key: key cache untuk isi file ini
+        cached: CachedPrediction jika hit, atau None jika miss
+    """
+    with open(img_path, 'rb') as f:
+        data = f.read()
+    metrics.count('bytes_read', len(data))
+
+    key = cache.key_for(data)
+    cached = cache.get(key)
+    if cached is not None:
+        return Image.fromarray(cached.pixels), None, key, cached
+
+    img, img_array = preprocess_image(io.BytesIO(data), metrics)
+    return img, img_array, key, None
+
+
+def iter_preprocessed_batches(input_folder, filenames, batch_size=DEFAULT_BATCH_SIZE,
+                              workers=DEFAULT_WORKERS, prefetch=DEFAULT_PREFETCH,
+                              metrics=NULL_METRICS, preprocess=preprocess_image):
+    """
+    Generator yang menghasilkan batch gambar yang sudah di-preprocess.
+
+    Jika workers > 0, decode & resize dikerjakan oleh thread pool
+    (PIL melepas GIL saat decode/resize sehingga bisa berjalan paralel).
+    Batch berikutnya sudah dikirim ke pool SEBELUM batch saat ini
+    di-yield, jadi CPU men-decode batch berikutnya selagi model
+    memprediksi batch saat ini.
+
+    Antrian dibatasi `prefetch` batch agar memori tetap terkendali.
+    Urutan output selalu sama dengan urutan `filenames` (deterministik).
+
+    `preprocess` dipanggil sebagai preprocess(path, metrics) untuk setiap
+    file; setiap elemen tuple hasilnya menjadi satu list di output.
+
+    Yield:
+        (batch_files, images, img_arrays) untuk setiap batch
+        (ditambah list key & cached jika preprocess=preprocess_image_cached)
+    """
+    if prefetch < 1:
+        raise ValueError(f"prefetch harus >= 1, didapat: {prefetch}")
+
+    # Potong daftar file menjadi batch-batch sebesar batch_size
+    batches = (
+        filenames[start:start + batch_size]
+        for start in range(0, len(filenames), batch_size)
+    )
+
+    # Mode serial: preprocessing langsung di main thread
+    if workers <= 0:
+        for batch_files in batches:
+            results = [
+                preprocess(os.path.join(input_folder, f), metrics)
+                for f in batch_files
+            ]
+            yield (batch_files, *map(list, zip(*results)))
+        return
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # Antrian FIFO berisi (batch_files, futures) yang sedang dikerjakan
+        pending = deque()
+
+        def submit_next():
+            # Kirim batch berikutnya ke pool; False jika file sudah habis
+            batch_files = next(batches, None)
+            if batch_files is None:
+                return False
+            futures = [
+                pool.submit(preprocess, os.path.join(input_folder, f), metrics)
+                for f in batch_files
+            ]
+            pending.append((batch_files, futures))
+            return True
+
+        # Isi antrian sampai penuh sebelum batch pertama dikonsumsi
+        while len(pending) < prefetch and submit_next():
+            pass
+
+        while pending:
+            batch_files, futures = pending.popleft()
+
+            # Jaga antrian tetap penuh selagi batch ini diprediksi
+            submit_next()
+            metrics.observe('queue_depth', len(pending))
+
+            # .result() menunggu sesuai urutan submit → urutan deterministik
+            results = [future.result() for future in futures]
+            yield (batch_files, *map(list, zip(*results)))
+
+# ============================================================================
+# FUNGSI: INFERENSI BATCH
+# ============================================================================
+
+def build_inference_fn(model):
+    """
+    Membuat fungsi inferensi ter-trace (tf.function) dengan signature tetap.
+
+    Signature (None, 28, 28) float32 membuat graph hanya di-trace sekali
+    dan dipakai ulang untuk semua batch, termasuk batch terakhir yang
+    ukurannya lebih kecil. Ini menghindari overhead model.predict()
+    yang membangun loop prediksi baru di setiap panggilan.
+    """
+    import tensorflow as tf
+
+    @tf.function(input_signature=[
+        tf.TensorSpec(shape=(None,) + IMAGE_SIZE, dtype=tf.float32)
+    ])
+    def infer(images):
+        # training=False: forward pass mode inferensi
+        return model(images, training=False)
+
+    return infer
+
+
+def predict_batch(infer, img_arrays):
+    """
+    Menjalankan satu forward pass untuk sekumpulan gambar.
+
+    Parameter:
+        infer: fungsi dari build_inference_fn()
+        img_arrays: list numpy array (28, 28) hasil preprocess_image()
+
+    Return:
+        numpy array shape (N, 10) berisi probabilitas 10 kelas
+    """
+    # Tumpuk semua gambar menjadi satu tensor (N, 28, 28) float32
+    # (tf.function dengan input_signature menerima numpy array langsung)
+    batch = np.stack(img_arrays).astype(np.float32, copy=False)
+    return infer(batch).numpy()
+
+
+def decode_prediction(probabilities):
+    """
+    Mengubah satu baris probabilitas menjadi (label, confidence %).
+    """
+    # np.argmax: index dengan probabilitas tertinggi
+    pred_index = int(np.argmax(probabilities))
+    pred_label = LABELS[pred_index]
+
+    # Confidence = probabilitas maksimal × 100
+    confidence = float(np.max(probabilities)) * 100
+    return pred_label, confidence
+
+def split_cache_misses(cache, keys, results):
+    """
+    Menentukan gambar mana di satu batch yang perlu forward pass.
+
+    Lookup di worker bisa terjadi sebelum batch sebelumnya selesai
+    diprediksi (prefetch), sehingga duplikat yang berdekatan belum ada di
+    cache. Miss dicek ulang di sini, dan duplikat di dalam batch yang sama
+    hanya diprediksi sekali.
+
+    Return:
+        missing: index gambar yang perlu forward pass
+        duplicates: {index: index gambar yang sama di batch ini}
+    """
+    missing, duplicates, first_index = [], {}, {}
+    for i, result in enumerate(results):
+        if result is not None:
+            continue
+        if keys[i] in first_index:
+            duplicates[i] = first_index[keys[i]]
+            continue
+
+        cached = cache.get(keys[i])
+        if cached is not None:
+            results[i] = (cached.label, cached.confidence)
+        else:
+            first_index[keys[i]] = i
+            missing.append(i)
+    return missing, duplicates
+
+def resolve_batch(infer, batch, cache=None, metrics=NULL_METRICS):
+    """
+    Menghasilkan (label, confidence) untuk satu batch dari
+    iter_preprocessed_batches(): hit cache dipakai langsung, sisanya
+    diprediksi dalam satu forward pass.
+
+    Return:
+        batch_files, images, results (list (label, confidence) per file)
+    """
+    if cache is None:
+        batch_files, images, img_arrays = batch
+        results = [None] * len(batch_files)
+        missing, duplicates = list(range(len(batch_files))), {}
+    else:
+        batch_files, images, img_arrays, keys, cached = batch
+        results = [(c.label, c.confidence) if c is not None else None for c in cached]
+        missing, duplicates = split_cache_misses(cache, keys, results)
+
+    # Satu forward pass untuk semua gambar di batch yang belum ada di cache
+    if missing:
+        with metrics.stage('predict'):
+            predictions = predict_batch(infer, [img_arrays[i] for i in missing])
+
+        for i, probabilities in zip(missing, predictions):
+            results[i] = decode_prediction(probabilities)
+            if cache is not None:
+                cache.put(keys[i], *results[i], np.asarray(images[i]))
+
+    for i, source in duplicates.items():
+        # Dihitung sebagai hit; fallback jika entry sudah di-evict
+        cached = cache.get(keys[i])
+        results[i] = (cached.label, cached.confidence) if cached else results[source]
+
+    return batch_files, images, results
+
+# ============================================================================
+# FUNGSI: SIMPAN HASIL PREDIKSI
+# ============================================================================
+
+def save_prediction(writer, img, input_folder, filename, label, confidence,
+                    metrics=NULL_METRICS):
+    """
+    Menyimpan hasil satu gambar lewat PredictionWriter (gambar 28x28, link
+    ke file asli, dan/atau baris file prediksi) dan mencatat metrics.
+    Aman dipanggil dari worker thread.
+    """
+    input_path = os.path.join(input_folder, filename)
+    with metrics.stage('save'):
+        output_path = writer.write(img, input_path, filename, label, confidence)
+
+    metrics.count('images_processed')
+    metrics.count_label(label)
+    # Mode link tidak menulis data gambar baru
+    if metrics.enabled and writer.mode == 'image':
+        metrics.count('bytes_written', os.path.getsize(output_path))
+    return output_path
+
+# ============================================================================
+# FUNGSI: PROSES PREDIKSI SELURUH FOLDER
+# ============================================================================
+
+def predict_files(infer, input_folder, filenames, output_folder=OUTPUT_FOLDER,
+                  batch_size=DEFAULT_BATCH_SIZE, workers=DEFAULT_WORKERS,
+                  prefetch=DEFAULT_PREFETCH, metrics=NULL_METRICS,
+                  manifest=None, cache=None, writer=None, skipped=None):
+    """
+    Memprediksi daftar file tertentu secara batch dan menyimpan hasilnya
+    ke result/<label>/. Dipakai oleh predict_folder() dan watch_folder().
+
+    Parameter:
+        infer: fungsi dari build_inference_fn()
+        manifest: PredictionManifest yang mencatat hasil (opsional)
+        cache: PredictionCache; gambar yang isinya sudah pernah diprediksi
+               tidak di-decode dan tidak masuk forward pass (opsional)
+        writer: PredictionWriter untuk mode output lain (default: simpan
+                gambar 28x28 ke output_folder)
+        skipped: list yang diisi (filename, error) untuk gambar yang gagal
+                 dibaca; gambar itu dilewati, run tetap berjalan (opsional)
+
+    Return:
+        prediction_count: dictionary {label: jumlah gambar} untuk file ini
+    """
+    # Dictionary untuk melacak jumlah prediksi per label
+    # Format: {label: count} dengan initial value 0 untuk semua label
+    prediction_count = {label: 0 for label in LABELS}
+    writer = writer or PredictionWriter(output_folder)
+
+    # Preprocessing berjalan di worker pool, batch keluar sesuai urutan file
+    preprocess = preprocess_image if cache is None else partial(preprocess_image_cached, cache=cache)
+    batches = iter_preprocessed_batches(
+        input_folder, filenames, batch_size=batch_size, workers=workers,
+        prefetch=prefetch, metrics=metrics, preprocess=skip_unreadable(preprocess)
+    )
+
+    try:
+        for batch_files, outputs, errors in batches:
+            batch = split_unreadable(batch_files, outputs, errors, skipped, metrics)
+            if batch is None:
+                continue
+            batch_files, images, results = resolve_batch(infer, batch, cache, metrics)
+
+            # Output per file tetap sama seperti prediksi satu per satu
+            for filename, img, (pred_label, confidence) in zip(batch_files, images, results):
+                # Tampilkan hasil di terminal
+                print(f"   📸 {filename}: {pred_label} ({confidence:.2f}%)")
+
+                # Simpan gambar ke folder sesuai label prediksi
+                save_prediction(writer, img, input_folder, filename, pred_label,
+                                confidence, metrics)
+
+                # Update statistik prediksi
+                prediction_count[pred_label] += 1
+                if manifest is not None:
+                    manifest.record(filename, pred_label, confidence)
+            writer.flush()
+    finally:
+        # Manifest disimpan meskipun run terhenti di tengah jalan,
+        # sehingga gambar yang sudah selesai tidak diproses ulang
+        if manifest is not None:
+            manifest.save()
+
+    return prediction_count
+
+
+def predict_folder(model, input_folder=INPUT_FOLDER, output_folder=OUTPUT_FOLDER,
+                   batch_size=DEFAULT_BATCH_SIZE, workers=DEFAULT_WORKERS,
+                   prefetch=DEFAULT_PREFETCH, metrics=NULL_METRICS,
+                   manifest=None, use_hash=False, cache=None, async_io=False,
+                   max_in_flight=DEFAULT_MAX_IN_FLIGHT, writer=None):
+    """
+    Memprediksi semua gambar di folder input secara batch dan menyimpan
+    hasilnya ke result/<label>/.
+
+    Jika async_io=True, dipakai pipeline asyncio (predict_files_async)
+    dengan maksimal `max_in_flight` gambar di memori; `prefetch` diabaikan.
+
+    Jika `manifest` diberikan (mode incremental), hanya gambar baru atau
+    berubah yang diproses; hasil gambar lain diambil dari manifest.
+
+    Jika `cache` (PredictionCache) diberikan, gambar yang isinya sudah
+    pernah diprediksi tidak di-decode dan tidak masuk forward pass.
+
+    Return:
+        prediction_count: dictionary {label: jumlah gambar}
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size harus >= 1, didapat: {batch_size}")
+
+    # Fungsi inferensi di-trace sekali dan dipakai ulang untuk semua batch
+    infer = build_inference_fn(model)
+
+    print(f"\n🔍 Memindai folder '{input_folder}' untuk gambar...")
+    filenames = list_images(input_folder)
+
+    if manifest is not None:
+        filenames, unchanged, removed = manifest.plan(input_folder, filenames, use_hash)
+
+        # Hapus hasil lama untuk file yang berubah atau sudah tidak ada di input
+        for filename in filenames + removed:
+            remove_previous_output(output_folder, filename, manifest.forget(filename))
+
+        print(f"   ♻️  {len(unchanged)} gambar tidak berubah dilewati, "
+              f"{len(filenames)} gambar baru/berubah, {len(removed)} gambar dihapus")
+
+    if async_io:
+        prediction_count = asyncio.run(predict_files_async(
+            infer, input_folder, filenames, output_folder, batch_size=batch_size,
+            workers=workers, max_in_flight=max_in_flight, metrics=metrics,
+            manifest=manifest, cache=cache, writer=writer
+        ))
+    else:
+        prediction_count = predict_files(
+            infer, input_folder, filenames, output_folder, batch_size=batch_size,
+            workers=workers, prefetch=prefetch, metrics=metrics,
+            manifest=manifest, cache=cache, writer=writer
+        )
+
+    if manifest is not None:
+        # Distribusi mencakup gambar yang dilewati karena tidak berubah
+        return manifest.label_counts(LABELS)
+    return prediction_count
+
+# ============================================================================
+# FUNGSI: PIPELINE ASYNCIO (BACA → PREPROCESS → INFERENSI → TULIS)
+# ============================================================================
+
+async def predict_files_async(infer, input_folder, filenames, output_folder=OUTPUT_FOLDER,
+                              batch_size=DEFAULT_BATCH_SIZE, workers=DEFAULT_WORKERS,
+                              max_in_flight=DEFAULT_MAX_IN_FLIGHT, metrics=NULL_METRICS,
+                              manifest=None, cache=None, writer=None, skipped=None):
+    """
+    Versi asyncio dari predict_files() dengan hasil yang sama.
+
+    Di predict_files(), main thread menunggu img.save() setiap file
+    sebelum batch berikutnya diprediksi. Di sini ketiga stage berjalan
+    tumpang tindih:
+        baca + decode (read pool) → inferensi batch (1 thread) → tulis (write pool)
+    sehingga disk/network yang lambat tidak menghentikan inferensi.
+
+    Backpressure: setiap gambar memegang satu slot dari saat mulai dibaca
+    sampai selesai ditulis. Paling banyak `max_in_flight` gambar berada
+    di memori; stage baca berhenti sementara jika slot habis.
+
+    Gambar yang gagal dibaca dilewati seperti di predict_files(). Jika satu
+    stage gagal, stage lain dihentikan, tetapi penulisan yang sudah dimulai
+    ditunggu sampai selesai agar tercatat di manifest.
+
+    Parameter:
+        workers: jumlah thread baca/decode dan jumlah thread tulis (minimal 1)
+        max_in_flight: batas gambar di memori, harus >= batch_size
+        skipped: lihat predict_files()
+
+    Return:
+        prediction_count: dictionary {label: jumlah gambar} untuk file ini
+    """
+    if max_in_flight < batch_size:
+        raise ValueError(f"max_in_flight ({max_in_flight}) harus >= batch_size ({batch_size})")
+
+    loop = asyncio.get_running_loop()
+    prediction_count = {label: 0 for label in LABELS}
+    writer = writer or PredictionWriter(output_folder)
+    preprocess = preprocess_image if cache is None else partial(preprocess_image_cached, cache=cache)
+    preprocess = skip_unreadable(preprocess)
+
+    slots = asyncio.Semaphore(max_in_flight)
+    # (filename, future preprocess) sesuai urutan file; ukurannya dibatasi slots
+    loaded = asyncio.Queue()
+    writes = set()
+
+    # Pool baca dan tulis terpisah agar penulisan tidak antre di belakang pembacaan
+    read_pool = ThreadPoolExecutor(max_workers=max(1, workers))
+    write_pool = ThreadPoolExecutor(max_workers=max(1, workers))
+    # Satu thread inferensi: forward pass tidak memblokir event loop
+    infer_pool = ThreadPoolExecutor(max_workers=1)
+
+    async def read_stage():
+        for filename in filenames:
+            await slots.acquire()
+            path = os.path.join(input_folder, filename)
+            await loaded.put((filename, loop.run_in_executor(read_pool, preprocess, path, metrics)))
+        await loaded.put(None)
+
+    async def write_one(filename, img, label, confidence):
+        try:
+            await loop.run_in_executor(
+                write_pool, save_prediction, writer, img, input_folder, filename,
+                label, confidence, metrics
+            )
+        finally:
+            slots.release()
+        # Dijalankan di event loop (satu thread), jadi manifest tidak perlu lock
+        prediction_count[label] += 1
+        if manifest is not None:
+            manifest.record(filename, label, confidence)
+
+    async def flush_batch(batch_writes):
+        await asyncio.gather(*batch_writes)
+        await loop.run_in_executor(write_pool, writer.flush)
+
+    async def infer_stage():
+        pending, done = [], False
+        while not done:
+            item = await loaded.get()
+            if item is None:
+                done = True
+            else:
+                filename, future = item
+                output, error = await future
+                if error is None:
+                    pending.append((filename, output))
+                else:
+                    # Gambar dilewati: slot-nya langsung dikembalikan
+                    split_unreadable([filename], [output], [error], skipped, metrics)
+                    slots.release()
+
+            if pending and (len(pending) >= batch_size or done):
+                metrics.observe('queue_depth', loaded.qsize())
+                # Susun ke format yang sama dengan iter_preprocessed_batches()
+                batch = ([f for f, _ in pending], *map(list, zip(*[r for _, r in pending])))
+                pending = []
+
+                batch_files, images, results = await loop.run_in_executor(
+                    infer_pool, resolve_batch, infer, batch, cache, metrics
+                )
+                batch_writes = []
+                for filename, img, (label, confidence) in zip(batch_files, images, results):
+                    print(f"   📸 {filename}: {label} ({confidence:.2f}%)")
+                    batch_writes.append(asyncio.create_task(
+                        write_one(filename, img, label, confidence)
+                    ))
+
+                # Seperti predict_files(): file prediksi di-flush per batch,
+                # jadi hasil batch yang selesai tetap ada jika run terhenti
+                task = asyncio.create_task(flush_batch(batch_writes))
+                writes.add(task)
+                task.add_done_callback(writes.discard)
+
+    stages = [asyncio.create_task(read_stage()), asyncio.create_task(infer_stage())]
+    try:
+        await asyncio.gather(*stages)
+        # Tunggu semua file selesai ditulis (di luar infer_stage, agar
+        # membatalkan stage tidak ikut membatalkan penulisan)
+        await asyncio.gather(*writes)
+    finally:
+        # Jika satu stage gagal, stage lain (misal read_stage yang menunggu
+        # slot) dihentikan; penulisan yang sudah dimulai tetap ditunggu agar
+        # manifest.record() berjalan untuk file yang sudah ada di disk
+        for stage in stages:
+            stage.cancel()
+        await asyncio.gather(*stages, *writes, return_exceptions=True)
+
+        # shutdown() dan flush() memblokir: jalankan di luar event loop
+        for pool in (read_pool, infer_pool, write_pool):
+            await loop.run_in_executor(None, pool.shutdown)
+        await loop.run_in_executor(None, writer.flush)
+        if manifest is not None:
+            manifest.save()
+
+    return prediction_count
+
+# ============================================================================
+# FUNGSI: WATCH MODE (PROSES GAMBAR YANG BARU MASUK)
+# ============================================================================
+
+def scan_image_stats(input_folder):
+    """
+    Mengembalikan {filename: (size, mtime_ns)} untuk semua gambar di folder.
+    os.scandir dipakai agar satu kali polling cukup satu pembacaan folder.
+    """
+    stats = {}
+    with os.scandir(input_folder) as entries:
+        for entry in entries:
+            if entry.name.lower().endswith(IMAGE_EXTENSIONS) and entry.is_file():
+                stat = entry.stat()
+                stats[entry.name] = (stat.st_size, stat.st_mtime_ns)
+    return stats
+
+
+def watch_folder(model, manifest, input_folder=INPUT_FOLDER, output_folder=OUTPUT_FOLDER,
+                 batch_size=DEFAULT_BATCH_SIZE, workers=DEFAULT_WORKERS,
+                 prefetch=DEFAULT_PREFETCH, metrics=NULL_METRICS, use_hash=False,
+                 cache=None, poll_interval=DEFAULT_POLL_INTERVAL,
+                 max_latency=DEFAULT_MAX_LATENCY, stop_event=None, writer=None):
+    """
+    Mode long-running: model tetap di memori dan folder input dipantau
+    dengan polling. Gambar baru/berubah diprediksi dan disimpan ke
+    result/<label>/ tanpa memuat ulang model atau memindai ulang semua hasil.
+
+    - File dianggap siap jika size & mtime sama pada dua polling berturut-
+      turut (file yang masih ditulis upstream tidak ikut diproses).
+    - File yang siap dikumpulkan menjadi satu batch; batch diprediksi saat
+      berisi batch_size gambar atau file tertua sudah menunggu max_latency.
+    - SIGINT/SIGTERM (atau stop_event) menghentikan polling; file yang
+      sudah siap tetap diprediksi sebelum fungsi selesai.
+
+    Parameter:
+        manifest: PredictionManifest pencatat file yang sudah diproses
+                  (path None = hanya di memori)
+
+    Return:
+        prediction_count: dictionary {label: jumlah gambar} dari manifest
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size harus >= 1, didapat: {batch_size}")
+
+    infer = build_inference_fn(model)
+    stop_event = stop_event or threading.Event()
+
+    # Signal handler hanya bisa dipasang dari main thread
+    previous_handlers = {}
+    if threading.current_thread() is threading.main_thread():
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            previous_handlers[signum] = signal.signal(signum, lambda *_: stop_event.set())
+
+    last_seen = {}   # {filename: (size, mtime_ns)} dari polling sebelumnya
+    failed = {}      # {filename: (size, mtime_ns)} file yang gagal diproses
+    pending = []     # file siap yang menunggu diprediksi (urutan kedatangan)
+    pending_since = None
+
+    def is_processed(filename, sig):
+        entry = manifest.files.get(filename)
+        return entry is not None and (entry['size'], entry['mtime_ns']) == sig
+
+    def enqueue_ready(current):
+        # File siap = size & mtime tidak berubah sejak polling sebelumnya
+        queued = set(pending)
+        for filename, sig in current.items():
+            if (filename in queued or last_seen.get(filename) != sig
+                    or failed.get(filename) == sig or is_processed(filename, sig)):
+                continue
+            pending.append(filename)
+
+    def process(files, **options):
+        # plan() membaca stat setiap file, jadi file yang dihapus/di-rename
+        # setelah polling sudah bisa gagal di sini (harus di dalam try)
+        files, _, _ = manifest.plan(input_folder, files, use_hash)
+        for filename in files:
+            remove_previous_output(output_folder, filename, manifest.forget(filename))
+        if files:
+            skipped = []
+            predict_files(infer, input_folder, files, output_folder, metrics=metrics,
+                          manifest=manifest, cache=cache, writer=writer,
+                          skipped=skipped, **options)
+            for filename, _ in skipped:
+                # File rusak dilewati sampai isinya berubah. File yang dihapus/
+                # di-rename setelah polling akan muncul sebagai file baru
+                if os.path.exists(os.path.join(input_folder, filename)):
+                    failed[filename] = last_seen.get(filename)
+
+    def flush():
+        files = list(pending)
+        pending.clear()
+
+        try:
+            process(files, batch_size=batch_size, workers=workers, prefetch=prefetch)
+        except IMAGE_ERRORS:
+            # Satu file rusak/hilang/terlalu besar tidak boleh menghentikan
+            # watcher: ulangi per file (file yang sudah tercatat dilewati plan())
+            for filename in files:
+                try:
+                    process([filename], workers=0)
+                except FileNotFoundError:
+                    # Dihapus/di-rename setelah polling: nama baru akan
+                    # muncul sebagai file baru di polling berikutnya
+                    print(f"   ⚠️  {filename} dilewati: file sudah tidak ada")
+                except IMAGE_ERRORS as error:
+                    # Lewati file rusak sampai isinya berubah
+                    print(f"   ⚠️  {filename} dilewati: {type(error).__name__}: {error}")
+                    failed[filename] = last_seen.get(filename)
+
+    print(f"\n👀 Memantau folder '{input_folder}' (polling {poll_interval}s, "
+          f"latency batch maks {max_latency}s). Tekan Ctrl+C untuk berhenti.")
+
+    try:
+        while not stop_event.is_set():
+            current = scan_image_stats(input_folder)
+            enqueue_ready(current)
+            if pending and pending_since is None:
+                pending_since = time.monotonic()
+            last_seen = current
+
+            if pending and (len(pending) >= batch_size
+                            or time.monotonic() - pending_since >= max_latency):
+                flush()
+                pending_since = None
+
+            stop_event.wait(poll_interval)
+    finally:
+        # Selesaikan pekerjaan sebelum berhenti: antrian + file yang sudah
+        # stabil sejak polling terakhir
+        enqueue_ready(scan_image_stats(input_folder))
+        if pending:
+            flush()
+        manifest.save()
+        for signum, handler in previous_handlers.items():
+            signal.signal(signum, handler)
+
+    print("\n🛑 Watch mode dihentikan")
+    return manifest.label_counts(LABELS)
+
+# ============================================================================
+# FUNGSI: VISUALISASI DISTRIBUSI PREDIKSI
+# ============================================================================
+
+def plot_distribution(prediction_count, output_path=CHART_PATH):
+    """
+    Menyimpan bar chart distribusi prediksi per label ke file gambar.
+
+    Memakai matplotlib.figure.Figure langsung (bukan pyplot): tidak ada
+    backend GUI yang dipilih dan tidak ada plt.show() yang menahan proses,
+    jadi aman dijalankan di server/CI tanpa display.
+    """
+    # Import di sini: matplotlib hanya dibutuhkan jika chart dibuat
+    from matplotlib.figure import Figure
+
+    print(f"\n📊 Membuat visualisasi distribusi prediksi...")
+
+    # Extract data untuk plotting
+    labels = list(prediction_count.keys())
+    values = list(prediction_count.values())
+
+    # Buat figure dan axis untuk plotting
+    fig = Figure(figsize=(10, 5))
+    ax = fig.subplots()
+
+    # Buat bar chart
+    bars = ax.bar(labels, values, color='skyblue', edgecolor='navy', alpha=0.7)
+
+    # Konfigurasi chart
+    ax.set_title("Distribusi Prediksi Fashion MNIST", fontsize=14, fontweight='bold')
+    ax.set_xlabel("Kategori Fashion", fontsize=12)
+    ax.set_ylabel("Jumlah Gambar", fontsize=12)
+    ax.tick_params(axis='x', labelrotation=45)  # Rotasi label x untuk readability
+    for tick in ax.get_xticklabels():
+        tick.set_horizontalalignment('right')
+    ax.grid(axis='y', linestyle='--', alpha=0.6)  # Grid horizontal
+
+    # Tambahkan nilai di atas setiap bar
+    for bar in bars:
+        yval = bar.get_height()
+        # Text position: center of bar, slightly above height
+        ax.text(bar.get_x() + bar.get_width()/2, yval + 0.1, int(yval),
+                ha='center', va='bottom', fontsize=9, fontweight='bold')
+
+    # Adjust layout untuk prevent label cutoff
+    fig.tight_layout()
+
+    # Simpan ke file (backend Agg non-interaktif dipakai otomatis)
+    folder = os.path.dirname(output_path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    fig.savefig(output_path)
+    print(f"🖼️  Chart disimpan di '{output_path}'")
+
+# ============================================================================
+# FUNGSI: SUMMARY FINAL
+# ============================================================================
+
+def print_summary(prediction_count, output_folder=OUTPUT_FOLDER):
+    """
+    Menampilkan ringkasan jumlah gambar per label di terminal.
+    """
+    total_images = sum(prediction_count.values())
+    print(f"\n🎉 PROSES SELESAI!")
+    print(f"📈 Total gambar diproses: {total_images}")
+    print(f"📁 Hasil disimpan di folder: '{output_folder}/'")
+    print(f"📊 Distribusi prediksi:")
+    for label, count in prediction_count.items():
+        if count > 0:
+            print(f"   • {label}: {count} gambar")
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def parse_args(argv=None):
+    """
+    Membaca argumen command line (argv=None: dari sys.argv).
+    """
+    parser = argparse.ArgumentParser(
+        description="Prediksi gambar custom dengan model Fashion MNIST"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+        help=f"Jumlah gambar per forward pass (default: {DEFAULT_BATCH_SIZE})"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=DEFAULT_WORKERS,
+        help=f"Jumlah worker thread untuk decode/resize, 0 = serial (default: {DEFAULT_WORKERS})"
+    )
+    parser.add_argument(
+        "--prefetch", type=int, default=DEFAULT_PREFETCH,
+        help=f"Jumlah batch yang di-preprocess di depan (default: {DEFAULT_PREFETCH})"
+    )
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="Jangan hapus result/, hanya proses gambar baru/berubah (pakai manifest)"
+    )
+    parser.add_argument(
+        "--hash", action="store_true",
+        help="Mode incremental: deteksi perubahan dengan sha256 isi file, bukan mtime"
+    )
+    parser.add_argument(
+        "--output-mode", choices=OUTPUT_MODES, default='image',
+        help="Cara menyimpan hasil per gambar: image (simpan ulang 28x28), "
+             "hardlink/symlink (file asli), none (default: image)"
+    )
+    parser.add_argument(
+        "--predictions-file", default=None,
+        help="Tulis semua prediksi ke satu file streaming (.csv atau JSON Lines)"
+    )
+    parser.add_argument(
+        "--async-io", action="store_true",
+        help="Pipeline asyncio: baca, inferensi, dan tulis file berjalan tumpang tindih"
+    )
+    parser.add_argument(
+        "--max-in-flight", type=int, default=DEFAULT_MAX_IN_FLIGHT,
+        help=f"Pipeline asyncio: batas gambar di memori/backpressure (default: {DEFAULT_MAX_IN_FLIGHT})"
+    )
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="Long-running: pantau folder input dan prediksi gambar yang baru masuk"
+    )
+    parser.add_argument(
+        "--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL,
+        help=f"Watch mode: interval polling folder dalam detik (default: {DEFAULT_POLL_INTERVAL})"
+    )
+    parser.add_argument(
+        "--max-latency", type=float, default=DEFAULT_MAX_LATENCY,
+        help=f"Watch mode: waktu tunggu maksimal batch yang belum penuh (default: {DEFAULT_MAX_LATENCY})"
+    )
+    parser.add_argument(
+        "--cache", action="store_true",
+        help="Aktifkan cache prediksi berbasis isi gambar (duplikat tidak diprediksi ulang)"
+    )
+    parser.add_argument(
+        "--cache-size", type=int, default=DEFAULT_MAX_ENTRIES,
+        help=f"Jumlah entry maksimal cache di memori, LRU (default: {DEFAULT_MAX_ENTRIES})"
+    )
+    parser.add_argument(
+        "--cache-file", default=None,
+        help="File SQLite untuk tier disk cache, bertahan antar run (mengaktifkan --cache)"
+    )
+    parser.add_argument(
+        "--metrics", action="store_true",
+        help="Aktifkan instrumentasi per stage dan tampilkan tabel ringkasan"
+    )
+    parser.add_argument(
+        "--metrics-file", default=None,
+        help="Simpan metrics ke file (.prom = Prometheus text, selain itu JSON)"
+    )
+    parser.add_argument(
+        "--chart", default=CHART_PATH,
+        help=f"File PNG bar chart distribusi prediksi (default: {CHART_PATH})"
+    )
+    parser.add_argument(
+        "--no-chart", action="store_true",
+        help="Jangan buat chart (matplotlib tidak di-import sama sekali)"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # Instrumentasi hanya aktif jika diminta; default no-op tanpa overhead
+    metrics = PipelineMetrics() if (args.metrics or args.metrics_file) else NULL_METRICS
+
+    model = load_model(MODEL_PATH)
+
+    # Fingerprint model: hasil lama tidak dipakai jika file model berubah
+    fingerprint = None
+    if args.incremental or args.cache or args.cache_file:
+        fingerprint = model_fingerprint(MODEL_PATH)
+
+    manifest = None
+    if args.incremental:
+        manifest = PredictionManifest.load(
+            os.path.join(OUTPUT_FOLDER, MANIFEST_FILENAME), fingerprint
+        )
+        if manifest.model_changed:
+            print("🔁 Model atau manifest berubah, semua gambar akan diprediksi ulang")
+
+    # Folder result hanya dihapus jika tidak ada hasil lama yang bisa dipakai
+    prepare_output_folder(OUTPUT_FOLDER, metrics,
+                          clean=manifest is None or not manifest.files)
+
+    cache = None
+    if args.cache or args.cache_file:
+        cache = PredictionCache(fingerprint, max_entries=args.cache_size,
+                                disk_path=args.cache_file)
+
+    # Tanpa --incremental, watch mode mencatat file yang sudah diproses di
+    # memori saja (semua gambar di folder tetap diprediksi sekali)
+    if args.watch and manifest is None:
+        manifest = PredictionManifest(None, fingerprint)
+
+    # Dibuat setelah prepare_output_folder agar file prediksi di dalam
+    # result/ tidak ikut terhapus. Incremental/watch hanya memprediksi
+    # sebagian gambar, jadi file lama dilanjutkan (bukan dikosongkan)
+    writer = PredictionWriter(OUTPUT_FOLDER, mode=args.output_mode,
+                              predictions_path=args.predictions_file,
+                              append=manifest is not None)
+
+    try:
+        if args.watch:
+            prediction_count = watch_folder(
+                model, manifest, INPUT_FOLDER, OUTPUT_FOLDER, batch_size=args.batch_size,
+                workers=args.workers, prefetch=args.prefetch, metrics=metrics,
+                use_hash=args.hash, cache=cache, poll_interval=args.poll_interval,
+                max_latency=args.max_latency, writer=writer
+            )
+        else:
+            prediction_count = predict_folder(
+                model, INPUT_FOLDER, OUTPUT_FOLDER, batch_size=args.batch_size,
+                workers=args.workers, prefetch=args.prefetch, metrics=metrics,
+                manifest=manifest, use_hash=args.hash, cache=cache,
+                async_io=args.async_io, max_in_flight=args.max_in_flight, writer=writer
+            )
+    finally:
+        writer.close()
+        if cache is not None:
+            cache.close()
+        # Susun ulang dari manifest: satu baris per gambar, termasuk gambar
+        # yang dilewati karena tidak berubah, tanpa baris lama yang dobel
+        if args.predictions_file and manifest is not None:
+            rewrite_predictions_file(args.predictions_file, manifest.records())
+
+    # Watch mode berjalan sebagai service, jadi tidak membuat chart
+    if not args.watch and not args.no_chart:
+        plot_distribution(prediction_count, args.chart)
+    print_summary(prediction_count, OUTPUT_FOLDER)
+    if args.predictions_file:
+        print(f"📝 Daftar prediksi disimpan di '{args.predictions_file}'")
+
+    if cache is not None:
+        cache.print_summary()
+        for name in ('hits', 'misses', 'evictions'):
+            metrics.count(f'cache_{name}', cache.stats()[name])
+
+    if metrics.enabled:
+        metrics.print_summary()
+        if args.metrics_file:
+            metrics.write(args.metrics_file)
+            print(f"💾 Metrics disimpan di '{args.metrics_file}'")
+
+
+# Block ini dijalankan hanya jika script dieksekusi langsung
+# Tidak dijalankan jika script di-import sebagai module
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Fashion MNIST Prediction Cache
+==============================
+Cache hasil prediksi berbasis isi gambar (content-addressed) untuk
+predict_custom_image.py.
+
+Gambar produk yang sama sering muncul dengan nama file berbeda. Tanpa
+cache, setiap duplikat membayar biaya decode + resize + forward pass
+penuh. Di sini key cache adalah:
+    sha256(fingerprint model + isi file gambar)
+sehingga duplikat dengan nama apa pun langsung mendapat hasil yang sama,
+dan hasil dari model lama tidak pernah terpakai oleh model baru.
+
+Dua tingkat penyimpanan:
+- memori: OrderedDict dengan eviction LRU, dibatasi `max_entries`
+- disk (opsional): database SQLite, bertahan antar run; entry milik
+  model lain dihapus saat database dibuka
+
+Nilai yang disimpan: label, confidence, dan pixel 28x28 uint8 (784 byte)
+agar gambar hasil bisa langsung disimpan ke result/<label>/ tanpa decode.
+
+Dibuat oleh: Fathih Apriandi
+"""
+
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+# Jumlah entry maksimal di memori (±1 KB per entry termasuk pixel)
+DEFAULT_MAX_ENTRIES = 10000
+
+# Ukuran gambar yang disimpan di cache (sama dengan input model)
+PIXEL_SHAPE = (28, 28)
+
+# Satu hasil prediksi yang tersimpan di cache
+CachedPrediction = namedtuple('CachedPrediction', ['label', 'confidence', 'pixels'])
+
+# ============================================================================
+# CLASS: CACHE PREDIKSI
+# ============================================================================
+
+class PredictionCache:
+    """
+    Cache LRU hasil prediksi dengan tier disk opsional.
+
+    Thread-safe: lookup dilakukan oleh worker preprocessing
+    (lihat iter_preprocessed_batches) sebelum gambar di-decode.
+
+    Statistik: hit dihitung oleh get(), miss dihitung oleh put() (satu put
+    = satu gambar yang benar-benar masuk forward pass). Lookup yang gagal
+    boleh diulang tanpa mengubah statistik.
+    """
+
+    def __init__(self, model_fingerprint, max_entries=DEFAULT_MAX_ENTRIES, disk_path=None):
+        if max_entries < 1:
+            raise ValueError(f"max_entries harus >= 1, didapat: {max_entries}")
+
+        self.model_fingerprint = model_fingerprint
+        self.max_entries = max_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Statistik untuk menentukan ukuran cache yang tepat
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._db = None
+        if disk_path is not None:
+            # check_same_thread=False: akses dari worker thread dijaga oleh self._lock
+            self._db = sqlite3.connect(disk_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS predictions ("
+                "key TEXT PRIMARY KEY, model TEXT, label TEXT, confidence REAL, pixels BLOB)"
+            )
+            # Entry dari model lain tidak akan pernah hit lagi
+            self._db.execute("DELETE FROM predictions WHERE model != ?", (model_fingerprint,))
+            self._db.commit()
+
+    def key_for(self, data):
+        """Key cache untuk isi file gambar (bytes)."""
+        digest = hashlib.sha256(self.model_fingerprint.encode('ascii'))
+        digest.update(data)
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Mengembalikan CachedPrediction atau None jika belum ada."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                # Tandai sebagai paling baru dipakai
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return entry
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT label, confidence, pixels FROM predictions WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    label, confidence, pixels = row
+                    entry = CachedPrediction(
+                        label, confidence,
+                        np.frombuffer(pixels, dtype=np.uint8).reshape(PIXEL_SHAPE)
+                    )
+                    # Naikkan ke tier memori untuk lookup berikutnya
+                    self._store_memory(key, entry)
+                    self.disk_hits += 1
+                    return entry
+
+            return None
+
+    def put(self, key, label, confidence, pixels):
+        """Menyimpan hasil prediksi (pixels: array uint8 28x28)."""
+        entry = CachedPrediction(label, confidence, np.asarray(pixels, dtype=np.uint8))
+        with self._lock:
+            self.misses += 1
+            self._store_memory(key, entry)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?, ?)",
+                    (key, self.model_fingerprint, label, confidence, entry.pixels.tobytes())
+                )
+
+    def _store_memory(self, key, entry):
+        # Dipanggil dengan self._lock sudah dipegang
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            # Buang entry yang paling lama tidak dipakai
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        """Statistik hit/miss/eviction sejak cache dibuat."""
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            hits = self.memory_hits + self.disk_hits
+            return {
+                'hits': hits,
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._memory),
+                'hit_rate': hits / lookups if lookups else 0.0,
+            }
+
+    def print_summary(self):
+        stats = self.stats()
+        print(f"\n🗃️  Cache prediksi: {stats['hits']} hit "
+              f"({stats['memory_hits']} memori, {stats['disk_hits']} disk), "
+              f"{stats['misses']} miss, hit rate {stats['hit_rate']:.1%}")
+        print(f"   • {stats['entries']}/{self.max_entries} entry di memori, "
+              f"{stats['evictions']} eviction")
+
+    def close(self):
+        """Commit tier disk dan tutup koneksi database."""
+        with self._lock:
+            if self._db is not None:
+                self._db.commit()
+                self._db.close()
+                self._db = None
@@ -0,0 +1,180 @@
+"""
+Fashion MNIST Prediction Manifest
+=================================
+Manifest persisten untuk mode incremental predict_custom_image.py.
+
+Tanpa manifest, setiap run menghapus folder result/ lalu memprediksi ulang
+SEMUA gambar. Manifest mencatat setiap file yang sudah diproses:
+    filename → size, mtime, sha256 (opsional), label, confidence
+beserta fingerprint model yang dipakai. Run berikutnya hanya memproses
+file yang baru atau berubah. Jika file model berubah (fingerprint beda),
+seluruh gambar otomatis diprediksi ulang.
+
+Format file (JSON):
+    {
+      "version": 1,
+      "model_fingerprint": "<sha256 file .keras>",
+      "files": {"sample_1.png": {"size": ..., "mtime_ns": ..., "sha256": ...,
+                                 "label": "Bag", "confidence": 97.5}}
+    }
+
+Dibuat oleh: Fathih Apriandi
+"""
+
+import hashlib
+import json
+import os
+
+# Versi format manifest (naikkan jika struktur berubah)
+MANIFEST_VERSION = 1
+
+# Nama file manifest default (disimpan di dalam folder output)
+MANIFEST_FILENAME = '.manifest.json'
+
+# Ukuran blok baca saat menghitung hash (1 MB)
+_HASH_CHUNK = 1024 * 1024
+
+# ============================================================================
+# FUNGSI FINGERPRINT
+# ============================================================================
+
+def sha256_file(path):
+    """Menghitung sha256 isi file secara streaming (tidak dibaca sekaligus)."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def model_fingerprint(model_path):
+    """Fingerprint model = sha256 isi file .keras."""
+    return sha256_file(model_path)
+
+# ============================================================================
+# CLASS: MANIFEST
+# ============================================================================
+
+class PredictionManifest:
+    """
+    Catatan file yang sudah diprediksi, dipakai untuk melewati file yang
+    tidak berubah pada run berikutnya.
+    """
+
+    def __init__(self, path, model_fingerprint, files=None, model_changed=False):
+        self.path = path
+        self.model_fingerprint = model_fingerprint
+        self.files = files or {}
+        # True jika manifest lama dibuat dengan model yang berbeda
+        self.model_changed = model_changed
+        # Stat file yang sedang diproses, dicatat saat plan()
+        self._pending = {}
+
+    @classmethod
+    def load(cls, path, model_fingerprint):
+        """
+        Memuat manifest dari file. Entry lama dibuang jika file manifest
+        tidak ada, rusak, versinya berbeda, atau dibuat dengan model lain.
+        """
+        if not os.path.exists(path):
+            return cls(path, model_fingerprint)
+
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            # Manifest rusak: perlakukan seperti run pertama
+            return cls(path, model_fingerprint, model_changed=True)
+
+        if (data.get('version') != MANIFEST_VERSION
+                or data.get('model_fingerprint') != model_fingerprint):
+            return cls(path, model_fingerprint, model_changed=True)
+
+        return cls(path, model_fingerprint, files=data.get('files', {}))
+
+    def save(self):
+        """
+        Menyimpan manifest secara atomic (file sementara lalu rename).
+        Manifest dengan path None hanya disimpan di memori (watch mode
+        tanpa --incremental).
+        """
+        if self.path is None:
+            return
+
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'version': MANIFEST_VERSION,
+                'model_fingerprint': self.model_fingerprint,
+                'files': self.files,
+            }, f, indent=1)
+        os.replace(tmp_path, self.path)
+
+    def plan(self, input_folder, filenames, use_hash=False):
+        """
+        Membandingkan isi folder input dengan manifest.
+
+        Parameter:
+            use_hash: True = bandingkan juga sha256 isi file (lebih lambat,
+                      tapi tahan terhadap mtime yang berubah tanpa isi berubah)
+
+        Return:
+            to_process: file baru atau berubah (urutan sama dengan filenames)
+            unchanged: file yang bisa dilewati
+            removed: entry manifest yang filenya sudah tidak ada di input
+        """
+        to_process, unchanged = [], []
+
+        for filename in filenames:
+            path = os.path.join(input_folder, filename)
+            stat = os.stat(path)
+            current = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+            if use_hash:
+                current['sha256'] = sha256_file(path)
+
+            entry = self.files.get(filename)
+            if entry is not None and entry['size'] == current['size']:
+                if use_hash:
+                    same = entry.get('sha256') == current['sha256']
+                else:
+                    same = entry['mtime_ns'] == current['mtime_ns']
+                if same:
+                    # Isi sama tapi mtime berubah (contoh: file di-touch):
+                    # catat mtime baru agar tidak di-hash ulang terus di watch mode
+                    entry['mtime_ns'] = current['mtime_ns']
+                    unchanged.append(filename)
+                    continue
+
+            self._pending[filename] = current
+            to_process.append(filename)
+
+        present = set(filenames)
+        removed = [filename for filename in self.files if filename not in present]
+        return to_process, unchanged, removed
+
+    def record(self, filename, label, confidence):
+        """Mencatat hasil prediksi file yang sebelumnya dikembalikan plan()."""
+        entry = dict(self._pending.pop(filename, {}))
+        entry['label'] = label
+        entry['confidence'] = confidence
+        self.files[filename] = entry
+
+    def forget(self, filename):
+        """Menghapus entry file; return entry lama atau None."""
+        return self.files.pop(filename, None)
+
+    def records(self):
+        """(filename, label, confidence) untuk setiap file di manifest."""
+        return [(filename, entry['label'], entry['confidence'])
+                for filename, entry in self.files.items()]
+
+    def label_counts(self, labels):
+        """Jumlah file per label berdasarkan isi manifest."""
+        counts = {label: 0 for label in labels}
+        for entry in self.files.values():
+            counts[entry['label']] = counts.get(entry['label'], 0) + 1
+        return counts
@@ -0,0 +1,149 @@
+"""
+Fashion MNIST Prediction Output
+===============================
+Cara menyimpan hasil prediksi predict_custom_image.py ke folder result/.
+
+Mode default ("image") menyimpan ulang gambar 28x28 grayscale sebagai file
+baru di result/<label>/: satu encode + satu file kecil per gambar, dan
+resolusi asli hilang. Untuk batch besar tersedia mode yang lebih murah:
+
+- image    : img.save() gambar 28x28 (perilaku lama)
+- hardlink : os.link file asli ke result/<label>/ (tanpa encode, tanpa copy
+             data; fallback copy byte asli jika beda filesystem)
+- symlink  : symlink ke file asli (path absolut)
+- none     : tidak ada file per gambar, cukup file prediksi di bawah
+
+Selain itu hasil bisa ditulis ke satu file prediksi streaming:
+- .csv  : header filename,label,confidence
+- lainnya: JSON Lines, satu objek {"filename", "label", "confidence"} per baris
+
+Pada mode incremental/watch hanya sebagian gambar yang diprediksi ulang,
+jadi file prediksi dilanjutkan (append) selama run lalu disusun ulang dari
+manifest dengan rewrite_predictions_file() agar tetap berisi semua gambar.
+
+Dibuat oleh: Fathih Apriandi
+"""
+
+import csv
+import errno
+import json
+import os
+import shutil
+import threading
+
+# Mode output yang didukung (lihat docstring module)
+OUTPUT_MODES = ('image', 'hardlink', 'symlink', 'none')
+
+# ============================================================================
+# CLASS: PENULIS HASIL PREDIKSI
+# ============================================================================
+
+class PredictionWriter:
+    """
+    Menulis hasil satu gambar sesuai mode output, dan (opsional) satu baris
+    ke file prediksi streaming.
+
+    Thread-safe: pipeline asyncio memanggil write() dari beberapa thread tulis.
+    """
+
+    def __init__(self, output_folder, mode='image', predictions_path=None, append=False):
+        if mode not in OUTPUT_MODES:
+            raise ValueError(f"mode output tidak dikenal: {mode} (pilihan: {OUTPUT_MODES})")
+
+        self.output_folder = output_folder
+        self.mode = mode
+        self.predictions_path = predictions_path
+        self._lock = threading.Lock()
+
+        self._file = None
+        self._csv = None
+        if predictions_path is not None:
+            # newline='' sesuai anjuran modul csv
+            # append=True: lanjutkan file lama (job yang di-resume, lihat bulk_predict.py)
+            self._file = open(predictions_path, 'a' if append else 'w', newline='')
+            if predictions_path.endswith('.csv'):
+                self._csv = csv.writer(self._file)
+                # Header hanya untuk file yang masih kosong
+                if self._file.tell() == 0:
+                    self._csv.writerow(['filename', 'label', 'confidence'])
+
+    def write(self, img, input_path, filename, label, confidence):
+        """
+        Menyimpan hasil satu gambar.
+
+        Return:
+            path file di result/<label>/, atau None untuk mode "none"
+        """
+        output_path = None
+        if self.mode != 'none':
+            output_path = os.path.join(self.output_folder, label, filename)
+            if self.mode == 'image':
+                img.save(output_path)
+            else:
+                self._link(input_path, output_path)
+
+        if self._file is not None:
+            confidence = round(confidence, 4)
+            with self._lock:
+                if self._csv is not None:
+                    self._csv.writerow([filename, label, confidence])
+                else:
+                    self._file.write(json.dumps(
+                        {'filename': filename, 'label': label, 'confidence': confidence}
+                    ) + "\n")
+        return output_path
+
+    def _link(self, input_path, output_path):
+        # Link lama (run incremental/watch sebelumnya) diganti
+        if os.path.lexists(output_path):
+            os.remove(output_path)
+
+        if self.mode == 'symlink':
+            os.symlink(os.path.abspath(input_path), output_path)
+            return
+
+        try:
+            os.link(input_path, output_path)
+        except OSError as error:
+            # Hardlink tidak bisa lintas filesystem: copy byte asli (tetap tanpa encode)
+            if error.errno != errno.EXDEV:
+                raise
+            shutil.copyfile(input_path, output_path)
+
+    def flush(self):
+        """Memastikan baris prediksi sudah ditulis ke disk (dipanggil per batch)."""
+        if self._file is not None:
+            with self._lock:
+                self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            with self._lock:
+                self._file.close()
+                self._file = None
+                self._csv = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+# ============================================================================
+# FUNGSI: SUSUN ULANG FILE PREDIKSI
+# ============================================================================
+
+def rewrite_predictions_file(path, records):
+    """
+    Menulis ulang file prediksi dari (filename, label, confidence), contoh
+    isi manifest, sehingga file berisi tepat satu baris per gambar: baris
+    dari run sebelumnya dan baris lama gambar yang diprediksi ulang tidak
+    dobel. Ditulis ke file sementara lalu rename (atomic).
+    """
+    # Ekstensi dipertahankan agar format (.csv / JSON Lines) tetap sama
+    base, extension = os.path.splitext(path)
+    tmp_path = f"{base}.tmp{extension}"
+    with PredictionWriter(None, mode='none', predictions_path=tmp_path) as writer:
+        for filename, label, confidence in records:
+            writer.write(None, None, filename, label, confidence)
+    os.replace(tmp_path, path)
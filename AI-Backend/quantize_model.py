@@ -0,0 +1,362 @@
+"""
+Fashion MNIST Int8 Post-Training Quantization
+=============================================
+Script untuk mengkuantisasi model Fashion MNIST dari float32 ke int8
+(post-training, tanpa training ulang). Ada dua format hasil:
+
+1. Full-integer TFLite (.tflite) → untuk inferensi yang lebih cepat
+   Weights DAN aktivasi int8: converter TFLite mengkalibrasi range aktivasi
+   dari sampel gambar training (representative dataset), lalu kernel
+   FullyConnected TFLite menghitung int8 × int8 dengan akumulasi int32.
+   Data yang dibaca per batch 4x lebih kecil dan instruksi SIMD int8
+   dipakai, sehingga gambar/detik naik dibanding float32.
+
+2. Weight-only int8 NumPy (.npz) → HANYA untuk ukuran file
+   W ≈ q × scale, q ∈ [-127, 127] (simetris), scale per-channel (satu per
+   neuron output) atau per-tensor. Saat inferensi kernel dikonversi ke
+   float32 dan dikalikan dengan BLAS float32, jadi TIDAK lebih cepat dari
+   numpy float32. Gunanya: file 4x lebih kecil dan engine tetap tanpa
+   TensorFlow (cukup NumPy).
+
+Penggunaan:
+    python quantize_model.py                          # simpan .tflite dan .npz int8
+    python quantize_model.py --granularity per-tensor
+    python quantize_model.py --compare                # laporan float32 vs int8
+
+Dibuat oleh: Fathih Apriandi
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import tensorflow as tf
+import numpy as np
+
+from dataset_cache import load_data
+from export_numpy_model import extract_dense_weights
+from numpy_inference import NumpyFashionModel
+
+# ============================================================================
+# KONFIGURASI PATH
+# ============================================================================
+
+# Model float32 hasil train_fashion_mnist_model.py
+MODEL_PATH = 'fashion_mnist_model.keras'
+
+# File model int8 weight-only (NumPy, hanya mengecilkan file)
+QUANTIZED_PATH = 'fashion_mnist_model_int8.npz'
+
+# File model full-integer TFLite (weights + aktivasi int8)
+TFLITE_PATH = 'fashion_mnist_model_int8.tflite'
+
+# Jumlah gambar training untuk kalibrasi range aktivasi int8
+DEFAULT_CALIBRATION_SAMPLES = 500
+
+# Nilai maksimal int8 simetris (-127..127, -128 tidak dipakai)
+INT8_MAX = 127
+
+# ============================================================================
+# FUNGSI KUANTISASI
+# ============================================================================
+
+def quantize_kernel(kernel, per_channel=True):
+    """
+    Kuantisasi simetris satu kernel float32 ke int8.
+
+    Return:
+        q: kernel int8 dengan shape sama
+        scale: float32 shape (out,) untuk per-channel, (1,) untuk per-tensor
+    """
+    if per_channel:
+        # Nilai absolut maksimal per kolom (per neuron output)
+        max_abs = np.abs(kernel).max(axis=0)
+    else:
+        max_abs = np.array([np.abs(kernel).max()])
+
+    # Hindari pembagian dengan nol untuk kolom yang seluruhnya nol
+    scale = np.where(max_abs > 0, max_abs / INT8_MAX, 1.0).astype(np.float32)
+    q = np.clip(np.rint(kernel / scale), -INT8_MAX, INT8_MAX).astype(np.int8)
+    return q, scale
+
+
+def quantize_weights(arrays, per_channel=True):
+    """
+    Mengkuantisasi semua kernel dari extract_dense_weights() ke int8.
+    Bias tetap float32 (ukurannya kecil dan sensitif terhadap error).
+    """
+    quantized = {"activations": arrays["activations"]}
+    for index in range(len(arrays["activations"])):
+        q, scale = quantize_kernel(arrays[f"kernel_{index}"], per_channel)
+        quantized[f"kernel_{index}"] = q
+        quantized[f"scale_{index}"] = scale
+        quantized[f"bias_{index}"] = arrays[f"bias_{index}"]
+    return quantized
+
+
+def quantize_model(model_path=MODEL_PATH, output_path=QUANTIZED_PATH, per_channel=True):
+    """Memuat model Keras, mengkuantisasi weights, dan menyimpan ke file .npz."""
+    model = tf.keras.models.load_model(model_path)
+    quantized = quantize_weights(extract_dense_weights(model), per_channel)
+    np.savez(output_path, **quantized)
+    return quantized
+
+
+def convert_tflite_int8(model, calibration_images):
+    """
+    Konversi model Keras ke TFLite full-integer (weights + aktivasi int8).
+
+    Parameter:
+        calibration_images: float32 (N, 28, 28) [0, 1] untuk mengukur range
+                            aktivasi setiap layer (tanpa label)
+
+    Return:
+        bytes flatbuffer .tflite dengan input/output int8
+    """
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.representative_dataset = lambda: (
+        [image[None]] for image in calibration_images
+    )
+    # Gagal jika ada op yang tidak bisa int8 (tidak diam-diam kembali ke float)
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    converter.inference_input_type = tf.int8
+    converter.inference_output_type = tf.int8
+    return converter.convert()
+
+
+def export_tflite_int8(model_path=MODEL_PATH, output_path=TFLITE_PATH,
+                       calibration_samples=DEFAULT_CALIBRATION_SAMPLES, seed=0):
+    """
+    Memuat model Keras dan menyimpan versi full-integer TFLite.
+    Kalibrasi memakai sampel acak (seed tetap) dari split training,
+    bukan data test, agar akurasi test tetap jujur.
+    """
+    (x_train, _), (_, _) = load_data()
+    rng = np.random.default_rng(seed)
+    indices = np.sort(rng.choice(len(x_train), size=calibration_samples, replace=False))
+    calibration_images = np.asarray(x_train[indices], dtype=np.float32) / 255.0
+
+    flatbuffer = convert_tflite_int8(tf.keras.models.load_model(model_path), calibration_images)
+    with open(output_path, 'wb') as f:
+        f.write(flatbuffer)
+    return flatbuffer
+
+# ============================================================================
+# CLASS: MODEL INT8
+# ============================================================================
+
+class QuantizedFashionModel(NumpyFashionModel):
+    """
+    Model NumPy yang menyimpan kernel dalam int8 (weight-only quantization).
+    Aktivasi tetap float32; hasil matmul dikali scale per kolom.
+
+    Hanya mengecilkan file dan weights di memori: setiap matmul tetap
+    float32 (NumPy tidak punya matmul int8 yang memakai BLAS), jadi
+    throughput sama dengan NumpyFashionModel. Untuk kecepatan pakai
+    TFLiteFashionModel.
+    """
+
+    def __init__(self, kernels, scales, biases, activations):
+        super().__init__([], biases, activations)
+        # Kernel disimpan apa adanya dalam int8 (tidak dikonversi ke float32)
+        self.kernels = [np.ascontiguousarray(k, dtype=np.int8) for k in kernels]
+        self.scales = [np.asarray(s, dtype=np.float32) for s in scales]
+
+    @classmethod
+    def load(cls, weights_path=QUANTIZED_PATH):
+        """Memuat model int8 dari file .npz hasil quantize_model()."""
+        with np.load(weights_path) as data:
+            activations = list(data["activations"])
+            count = len(activations)
+            kernels = [data[f"kernel_{i}"] for i in range(count)]
+            scales = [data[f"scale_{i}"] for i in range(count)]
+            biases = [data[f"bias_{i}"] for i in range(count)]
+        return cls(kernels, scales, biases, activations)
+
+    def _matmul(self, x, index):
+        # (x @ q) × scale == x @ (q × scale) karena scale per kolom output
+        out = x @ self.kernels[index].astype(np.float32)
+        out *= self.scales[index]
+        return out
+
+
+class TFLiteFashionModel:
+    """
+    Inferensi model full-integer .tflite dengan interface yang sama seperti
+    NumpyFashionModel: predict(images (N, 28, 28)) → probabilitas (N, 10).
+
+    Input float [0, 1] (atau uint8 [0, 255]) dikuantisasi dengan scale &
+    zero point input model; output int8 dikembalikan ke float32.
+    Satu instance tidak thread-safe (satu interpreter).
+    """
+
+    def __init__(self, model_content, num_threads=None):
+        self.interpreter = _interpreter_class()(model_content=model_content,
+                                                num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+        self._batch_size = int(self._input['shape'][0])
+
+    @classmethod
+    def load(cls, path=TFLITE_PATH, num_threads=None):
+        """Memuat model dari file .tflite hasil export_tflite_int8()."""
+        with open(path, 'rb') as f:
+            return cls(f.read(), num_threads)
+
+    def _resize(self, batch_size):
+        # Tensor dialokasikan ulang hanya jika ukuran batch berubah
+        if batch_size != self._batch_size:
+            self.interpreter.resize_tensor_input(
+                self._input['index'], [batch_size, *self._input['shape'][1:]]
+            )
+            self.interpreter.allocate_tensors()
+            self._batch_size = batch_size
+
+    def predict(self, images):
+        x = np.asarray(images)
+        if x.dtype == np.uint8:
+            x = x.astype(np.float32) / 255.0
+
+        scale, zero_point = self._input['quantization']
+        q = np.clip(np.rint(x / scale) + zero_point, -128, 127).astype(np.int8)
+
+        self._resize(len(q))
+        self.interpreter.set_tensor(self._input['index'], q)
+        self.interpreter.invoke()
+        output = self.interpreter.get_tensor(self._output['index'])
+
+        scale, zero_point = self._output['quantization']
+        return (output.astype(np.float32) - zero_point) * scale
+
+
+def _interpreter_class():
+    """
+    Interpreter TFLite: paket LiteRT (ai_edge_litert) jika terpasang,
+    selain itu tf.lite.Interpreter bawaan TensorFlow.
+    """
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+    except ImportError:
+        Interpreter = tf.lite.Interpreter
+    return Interpreter
+
+# ============================================================================
+# PERBANDINGAN FLOAT32 VS INT8
+# ============================================================================
+
+def measure_throughput(predict_fn, images, batch_size=256, repeat=5):
+    """
+    Mengukur gambar/detik untuk memprediksi seluruh `images` per batch.
+    Return: (probabilitas seluruh gambar, gambar per detik)
+    """
+    def run():
+        return np.concatenate([
+            predict_fn(images[start:start + batch_size])
+            for start in range(0, len(images), batch_size)
+        ])
+
+    # Warm-up sekaligus mengambil hasil prediksi untuk akurasi
+    probabilities = run()
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        run()
+    elapsed = (time.perf_counter() - start) / repeat
+    return probabilities, len(images) / elapsed
+
+
+def compare(model_path=MODEL_PATH, quantized_path=QUANTIZED_PATH, tflite_path=TFLITE_PATH,
+            batch_size=256):
+    """
+    Membandingkan akurasi, ukuran file, dan throughput float32 vs int8
+    pada 10.000 gambar test yang sama dengan test_model.py.
+    """
+    # Test split resmi Fashion MNIST (sama dengan test_model.py)
+    (_, _), (x_test, y_test) = load_data()
+    x_test = x_test.astype(np.float32) / 255.0
+
+    keras_model = tf.keras.models.load_model(model_path)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # Weights float32 diekspor ulang dari model yang sama agar perbandingan
+        # adil, tapi ke folder sementara: fashion_mnist_weights.npz milik
+        # user (dipakai numpy_inference.py, embedding_index.py) tidak ditimpa
+        float_weights_path = os.path.join(tmpdir, 'float32.npz')
+        np.savez(float_weights_path, **extract_dense_weights(keras_model))
+
+        engines = [
+            ("keras float32", model_path,
+             lambda x: keras_model.predict_on_batch(x)),
+            ("numpy float32", float_weights_path,
+             NumpyFashionModel.load(float_weights_path).predict),
+            ("numpy int8 (weights)", quantized_path,
+             QuantizedFashionModel.load(quantized_path).predict),
+            ("tflite int8", tflite_path,
+             TFLiteFashionModel.load(tflite_path).predict),
+        ]
+
+        rows = []
+        for name, path, predict_fn in engines:
+            probabilities, images_per_s = measure_throughput(predict_fn, x_test, batch_size)
+            accuracy = float((np.asarray(probabilities).argmax(axis=1) == y_test).mean())
+            rows.append({
+                'engine': name,
+                'accuracy': accuracy,
+                'file_size_kb': os.path.getsize(path) / 1024,
+                'images_per_s': images_per_s,
+            })
+    return rows
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Kuantisasi int8 model Fashion MNIST dan laporan perbandingan"
+    )
+    parser.add_argument("--model", default=MODEL_PATH,
+                        help=f"Model Keras float32 (default: {MODEL_PATH})")
+    parser.add_argument("--output", default=QUANTIZED_PATH,
+                        help=f"File model int8 weight-only NumPy (default: {QUANTIZED_PATH})")
+    parser.add_argument("--tflite-output", default=TFLITE_PATH,
+                        help=f"File model full-integer TFLite (default: {TFLITE_PATH})")
+    parser.add_argument("--granularity", choices=("per-channel", "per-tensor"),
+                        default="per-channel",
+                        help="Granularitas scale kuantisasi .npz (default: per-channel)")
+    parser.add_argument("--calibration-samples", type=int, default=DEFAULT_CALIBRATION_SAMPLES,
+                        help=f"Gambar training untuk kalibrasi aktivasi TFLite "
+                             f"(default: {DEFAULT_CALIBRATION_SAMPLES})")
+    parser.add_argument("--compare", action="store_true",
+                        help="Bandingkan akurasi, ukuran, dan throughput float32 vs int8")
+    parser.add_argument("--batch-size", type=int, default=256,
+                        help="Batch size untuk pengukuran throughput (default: 256)")
+    args = parser.parse_args()
+
+    print(f"🔄 Kuantisasi full-integer TFLite dari '{args.model}' "
+          f"(kalibrasi {args.calibration_samples} gambar)...")
+    export_tflite_int8(args.model, args.tflite_output, args.calibration_samples)
+    print(f"✅ Model int8 (weights + aktivasi) disimpan di '{args.tflite_output}'")
+
+    print(f"🔄 Kuantisasi weight-only int8 ({args.granularity}) dari '{args.model}'...")
+    quantize_model(args.model, args.output, per_channel=args.granularity == "per-channel")
+    print(f"✅ Model int8 weight-only disimpan di '{args.output}' "
+          f"(hanya file lebih kecil, compute tetap float32)")
+
+    if not args.compare:
+        return
+
+    print(f"\n📊 Evaluasi pada 10.000 gambar test (batch size {args.batch_size})...")
+    rows = compare(args.model, args.output, args.tflite_output, batch_size=args.batch_size)
+
+    print(f"   {'Engine':<22}{'Akurasi':>10}{'Ukuran file':>14}{'Gambar/detik':>16}")
+    for row in rows:
+        print(f"   {row['engine']:<22}{row['accuracy'] * 100:>9.2f}%"
+              f"{row['file_size_kb']:>11.1f} KB{row['images_per_s']:>16,.0f}")
+
+
+if __name__ == "__main__":
+    main()
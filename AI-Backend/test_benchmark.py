@@ -0,0 +1,112 @@
+"""
+Fashion MNIST Benchmark Suite Unit Testing
+==========================================
+Unit test untuk logika perbandingan baseline di benchmark.py: deteksi
+regresi per arah metric, penolakan baseline yang tidak sebanding, dan
+exit code check_against_baseline().
+
+Hasil benchmark berupa dictionary sintetis, jadi tidak ada pengukuran
+yang dijalankan dan model tidak diperlukan.
+
+Framework: unittest (bawaan Python)
+
+Dibuat oleh: Fathih Apriandi
+"""
+
+import contextlib
+import copy
+import io
+import unittest
+
+from benchmark import (
+    BENCHMARK_VERSION, baseline_mismatch, check_against_baseline, compare_with_baseline, metric,
+)
+
+# ============================================================================
+# FUNGSI BANTU
+# ============================================================================
+
+def make_results(quick=False, version=BENCHMARK_VERSION, latency=10.0, throughput=1000.0):
+    """Hasil benchmark sintetis dengan satu metric 'lower' dan satu 'higher'."""
+    return {
+        'timestamp': '2026-01-01T00:00:00',
+        'benchmark_version': version,
+        'environment': {'quick': quick},
+        'metrics': {
+            'single_image_latency.p50': metric(latency, 'ms', 'lower'),
+            'throughput.batch_32': metric(throughput, 'images/s', 'higher'),
+        },
+    }
+
+
+def check(results, baseline, tolerance=0.15):
+    """check_against_baseline() tanpa output terminal. Return: (exit code, output)"""
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        code = check_against_baseline(results, baseline, tolerance)
+    return code, output.getvalue()
+
+# ============================================================================
+# CLASS UNIT TEST
+# ============================================================================
+
+class TestBaselineComparison(unittest.TestCase):
+    """
+    Class untuk testing perbandingan hasil benchmark dengan baseline.
+    """
+
+    def test_regression_direction(self):
+        """Latency naik dan throughput turun melebihi toleransi dihitung regresi."""
+        baseline = make_results()['metrics']
+        current = make_results(latency=12.0, throughput=900.0)['metrics']
+        rows = {row[0]: row for row in compare_with_baseline(current, baseline, 0.15)}
+
+        self.assertAlmostEqual(rows['single_image_latency.p50'][3], 0.2)
+        self.assertTrue(rows['single_image_latency.p50'][4])
+        self.assertFalse(rows['throughput.batch_32'][4])   # -10%, masih dalam toleransi
+
+        # Perbaikan di kedua arah bukan regresi
+        better = make_results(latency=5.0, throughput=2000.0)['metrics']
+        self.assertFalse(any(row[4] for row in compare_with_baseline(better, baseline, 0.15)))
+
+    def test_metrics_missing_from_baseline_are_skipped(self):
+        """Metric baru (atau baseline bernilai 0) tidak dibandingkan."""
+        current = make_results()['metrics']
+        current['startup.fashion_cli'] = metric(0.1, 's', 'lower')
+        baseline = make_results()['metrics']
+        baseline['throughput.batch_32']['value'] = 0.0
+
+        names = [row[0] for row in compare_with_baseline(current, baseline, 0.15)]
+        self.assertEqual(names, ['single_image_latency.p50'])
+
+    def test_baseline_mismatch(self):
+        """Mode --quick atau versi benchmark yang berbeda membuat baseline tidak sebanding."""
+        results = make_results(quick=True)
+        self.assertIsNone(baseline_mismatch(results, make_results(quick=True)))
+        self.assertIn('--quick', baseline_mismatch(results, make_results(quick=False)))
+        self.assertIn('versi', baseline_mismatch(results, make_results(quick=True, version=1)))
+
+        # Baseline lama tanpa benchmark_version maupun environment
+        legacy = copy.deepcopy(make_results(quick=True))
+        del legacy['benchmark_version'], legacy['environment']
+        self.assertIsNotNone(baseline_mismatch(results, legacy))
+
+    def test_exit_codes(self):
+        """0 tanpa regresi, 1 jika ada regresi, 2 jika baseline tidak sebanding."""
+        baseline = make_results()
+
+        code, output = check(make_results(latency=10.5), baseline)
+        self.assertEqual(code, 0)
+        self.assertIn('Tidak ada regresi', output)
+
+        code, output = check(make_results(throughput=500.0), baseline)
+        self.assertEqual(code, 1)
+        self.assertIn('REGRESI', output)
+
+        # Regresi besar pun tidak dilaporkan jika mode berbeda: perbandingan ditolak
+        code, output = check(make_results(quick=True, throughput=500.0), baseline)
+        self.assertEqual(code, 2)
+        self.assertNotIn('REGRESI', output)
+
+
+if __name__ == "__main__":
+    unittest.main()
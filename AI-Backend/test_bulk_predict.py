@@ -0,0 +1,149 @@
+"""
+Fashion MNIST Bulk Prediction Unit Testing
+==========================================
+Unit test untuk bagian bulk_predict.py yang tidak membutuhkan model:
+pembagian shard, pemulihan file shard yang terpotong, merge, dan shard
+dengan gambar rusak (model diganti fake_infer dari testing_fakes.py).
+
+Framework: unittest (bawaan Python)
+
+Dibuat oleh: Fathih Apriandi
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import bulk_predict
+from bulk_predict import (
+    ERRORS_SUFFIX, group_by_shard, job_status, merge_job, open_job, parse_shard_ids,
+    read_shard_results, run_shard, shard_is_done, shard_path,
+)
+from testing_fakes import fake_infer, write_image
+
+# ============================================================================
+# CLASS UNIT TEST
+# ============================================================================
+
+class TestBulkPredict(unittest.TestCase):
+    """
+    Class untuk testing sharding dan resume job prediksi massal.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.job = self.tmpdir.name
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_sharding_is_deterministic(self):
+        """Setiap path masuk tepat satu shard, tidak bergantung urutan input."""
+        paths = [f"sample_{i}.png" for i in range(1000)]
+        shards = group_by_shard(paths, 8)
+
+        self.assertEqual(sorted(p for shard in shards for p in shard), sorted(paths))
+        self.assertEqual(group_by_shard(list(reversed(paths)), 8), shards)
+        self.assertEqual(parse_shard_ids("0-2,5", 8), [0, 1, 2, 5])
+        with self.assertRaises(ValueError):
+            parse_shard_ids("6-8", 8)
+
+    def test_truncated_line_is_dropped(self):
+        """Baris terakhir yang terpotong dibuang agar append berikutnya valid."""
+        path = shard_path(self.job, 0)
+        with open(path, 'w') as f:
+            f.write('{"filename": "a.png", "label": "Bag", "confidence": 99.0}\n{"filena')
+
+        results = read_shard_results(path)
+        self.assertEqual([r['filename'] for r in results], ['a.png'])
+        with open(path) as f:
+            self.assertTrue(f.read().endswith('}\n'))
+
+    def test_merge_requires_all_shards(self):
+        """Merge gagal jika ada shard belum selesai, dan menjumlahkan prediction_count."""
+        open_job(self.job, 2, 'model')
+        with self.assertRaises(ValueError):
+            open_job(self.job, 4, 'model')
+
+        for i, label in enumerate(['Bag', 'Coat']):
+            with open(shard_path(self.job, i), 'w') as f:
+                f.write(json.dumps({'filename': f'{i}.png', 'label': label, 'confidence': 90.0}) + "\n")
+            if i == 0:
+                with open(shard_path(self.job, i, '.done'), 'w') as f:
+                    json.dump({'count': 1, 'prediction_count': {'Bag': 1, 'Coat': 0}}, f)
+
+        with self.assertRaises(RuntimeError):
+            merge_job(self.job)
+
+        with open(shard_path(self.job, 1, '.done'), 'w') as f:
+            json.dump({'count': 1, 'prediction_count': {'Bag': 0, 'Coat': 1}}, f)
+        self.assertEqual(merge_job(self.job), {'Bag': 1, 'Coat': 1})
+        with open(os.path.join(self.job, 'predictions.jsonl')) as f:
+            self.assertEqual(len(f.readlines()), 2)
+
+    def test_corrupt_image_does_not_stop_shard(self):
+        """Gambar rusak/hilang dicatat ke file errors; shard tetap selesai dan bisa di-resume."""
+        folder = os.path.join(self.job, 'input')
+        os.makedirs(folder)
+        filenames = [f"sample_{i}.png" for i in range(3)]
+        for i, filename in enumerate(filenames):
+            write_image(os.path.join(folder, filename), i)
+        with open(os.path.join(folder, "broken.png"), 'wb') as f:
+            f.write(b'bukan gambar')
+        filenames += ["broken.png", "missing.png"]
+
+        with mock.patch.object(bulk_predict, 'load_worker_model', return_value=fake_infer):
+            _, count, prediction_count, error_count = run_shard(
+                self.job, 0, folder, filenames, batch_size=2)
+            self.assertEqual((count, error_count), (5, 2))
+            self.assertEqual(sum(prediction_count.values()), 3)
+            errors = read_shard_results(shard_path(self.job, 0, ERRORS_SUFFIX))
+            self.assertEqual(sorted(e['filename'] for e in errors), ["broken.png", "missing.png"])
+            self.assertTrue(shard_is_done(self.job, 0, filenames))
+
+            # Resume: gambar yang gagal tidak dicoba ulang
+            self.assertEqual(run_shard(self.job, 0, folder, filenames)[1], 0)
+
+            # Input baru di shard yang sudah selesai: penanda .done tidak berlaku lagi
+            write_image(os.path.join(folder, "sample_3.png"), 3)
+            filenames.append("sample_3.png")
+            self.assertFalse(shard_is_done(self.job, 0, filenames))
+            self.assertEqual(run_shard(self.job, 0, folder, filenames)[1], 1)
+
+            # Input yang dihapus dari daftar ikut dibuang dari hasil shard
+            filenames.remove("sample_0.png")
+            _, count, prediction_count, _ = run_shard(self.job, 0, folder, filenames)
+            self.assertEqual((count, sum(prediction_count.values())), (0, 3))
+            self.assertEqual(len(read_shard_results(shard_path(self.job, 0))), 3)
+
+    def test_status_and_merge_detect_changed_inputs(self):
+        """Shard dengan .done untuk daftar input lama tidak dihitung selesai dan tidak di-merge."""
+        folder = os.path.join(self.job, 'input')
+        os.makedirs(folder)
+        for i in range(4):
+            write_image(os.path.join(folder, f"sample_{i}.png"), i)
+
+        open_job(self.job, 2, 'model', folder)
+        shards = group_by_shard(os.listdir(folder), 2)
+        with mock.patch.object(bulk_predict, 'load_worker_model', return_value=fake_infer):
+            for i in range(2):
+                run_shard(self.job, i, folder, shards[i])
+        self.assertEqual(job_status(self.job)[1:3], ([0, 1], []))
+
+        # File baru masuk ke salah satu shard setelah semua shard selesai
+        write_image(os.path.join(folder, "sample_4.png"), 4)
+        changed = bulk_predict.shard_of("sample_4.png", 2)
+        _, done, stale, _ = job_status(self.job)
+        self.assertEqual((done, stale), ([1 - changed], [changed]))
+        with self.assertRaises(RuntimeError):
+            merge_job(self.job)
+
+        with mock.patch.object(bulk_predict, 'load_worker_model', return_value=fake_infer):
+            run_shard(self.job, changed, folder, group_by_shard(os.listdir(folder), 2)[changed])
+        self.assertEqual(sum(merge_job(self.job).values()), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+Fashion MNIST Model Compression Unit Testing
+============================================
+Unit test untuk compress_model.py: mask magnitude pruning dan structured
+pruning neuron hidden. Model dibangun dengan weights acak, jadi file
+model dan dataset tidak diperlukan.
+
+Framework: unittest (bawaan Python)
+
+Dibuat oleh: Fathih Apriandi
+"""
+
+import unittest
+
+import numpy as np
+
+from compress_model import dense_layers, magnitude_mask, prune_hidden_units, prune_magnitude
+from train_fashion_mnist_model import build_model
+
+# ============================================================================
+# CLASS UNIT TEST
+# ============================================================================
+
+class TestCompressModel(unittest.TestCase):
+    """
+    Class untuk testing pruning model Fashion MNIST.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.model = build_model(hidden_units=32)
+        cls.images = np.random.default_rng(0).random((8, 28, 28), dtype=np.float32)
+
+    def test_magnitude_pruning_sparsity(self):
+        """Sparsity tercapai dan weights yang tersisa adalah yang terbesar."""
+        kernel = np.random.default_rng(1).standard_normal((100, 50))
+        mask = magnitude_mask(kernel, 0.8)
+        self.assertEqual(int(mask.sum()), 1000)
+        self.assertGreater(np.abs(kernel[mask == 1]).min(), np.abs(kernel[mask == 0]).max())
+
+        pruned, _ = prune_magnitude(self.model, 0.5)
+        for layer in dense_layers(pruned):
+            self.assertAlmostEqual(np.mean(layer.get_weights()[0] == 0), 0.5, places=2)
+
+    def test_structured_pruning_keeps_outputs_of_dead_units(self):
+        """Membuang neuron yang weights keluarnya nol tidak mengubah output."""
+        (kernel_in, bias_in), (kernel_out, bias_out) = (
+            layer.get_weights() for layer in dense_layers(self.model)
+        )
+        kernel_out = kernel_out.copy()
+        kernel_out[16:] = 0
+        self.model.set_weights([kernel_in, bias_in, kernel_out, bias_out])
+
+        pruned = prune_hidden_units(self.model, 16)
+        self.assertEqual(pruned.count_params(), 784 * 16 + 16 + 16 * 10 + 10)
+        np.testing.assert_allclose(pruned.predict(self.images, verbose=0),
+                                   self.model.predict(self.images, verbose=0), atol=1e-6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+"""
+Fashion MNIST Dataset Cache Unit Testing
+========================================
+Unit test untuk dataset_cache.py: pembuatan cache .npy yang atomic,
+load dengan memory-map read-only, dan split train/test sebagai view
+tanpa salinan.
+
+Loader dataset Keras diganti array kecil buatan sendiri, jadi dataset
+asli tidak di-download.
+
+Framework: unittest (bawaan Python)
+
+Dibuat oleh: Fathih Apriandi
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import dataset_cache
+from dataset_cache import IMAGES_FILE, LABELS_FILE, build_cache, load_all, load_data
+
+# Ukuran dataset palsu: 6 gambar "train" dan 4 gambar "test"
+NUM_FAKE_TRAIN = 6
+NUM_FAKE_TEST = 4
+
+# ============================================================================
+# FUNGSI BANTU
+# ============================================================================
+
+def fake_keras_load_data():
+    """Pengganti fashion_mnist.load_data(): pixel gambar ke-i bernilai i."""
+    total = NUM_FAKE_TRAIN + NUM_FAKE_TEST
+    images = np.repeat(np.arange(total, dtype=np.uint8), 28 * 28).reshape(total, 28, 28)
+    labels = np.arange(total, dtype=np.uint8) % 10
+    return ((images[:NUM_FAKE_TRAIN], labels[:NUM_FAKE_TRAIN]),
+            (images[NUM_FAKE_TRAIN:], labels[NUM_FAKE_TRAIN:]))
+
+
+def patch_keras_loader():
+    """Mengganti loader dataset Keras; mock yang dikembalikan mencatat jumlah panggilan."""
+    import tensorflow as tf
+    return mock.patch.object(tf.keras.datasets.fashion_mnist, 'load_data',
+                             side_effect=fake_keras_load_data)
+
+# ============================================================================
+# CLASS UNIT TEST
+# ============================================================================
+
+class TestDatasetCache(unittest.TestCase):
+    """
+    Class untuk testing cache dataset memory-map.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = os.path.join(self.tmpdir.name, 'cache')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_cache_built_once_as_uint8(self):
+        """Cache dibuat sekali (train lalu test, uint8); load berikutnya tidak memanggil Keras."""
+        with patch_keras_loader() as loader:
+            images, labels = load_all(self.cache)
+            load_all(self.cache)
+        self.assertEqual(loader.call_count, 1)
+
+        self.assertEqual(images.shape, (NUM_FAKE_TRAIN + NUM_FAKE_TEST, 28, 28))
+        self.assertEqual((images.dtype, labels.dtype), (np.uint8, np.uint8))
+        np.testing.assert_array_equal(images[:, 0, 0], np.arange(10))
+        self.assertEqual(sorted(os.listdir(self.cache)), sorted([IMAGES_FILE, LABELS_FILE]))
+
+    def test_interrupted_build_keeps_old_cache(self):
+        """np.save yang gagal di tengah tidak menimpa cache lama dan tidak meninggalkan .tmp."""
+        with patch_keras_loader():
+            build_cache(self.cache)
+        images_path = os.path.join(self.cache, IMAGES_FILE)
+        with open(images_path, 'rb') as f:
+            before = f.read()
+
+        def broken_save(f, array):
+            f.write(b'sebagian')
+            raise OSError(28, 'No space left on device')
+
+        with patch_keras_loader(), mock.patch.object(dataset_cache.np, 'save', broken_save):
+            with self.assertRaises(OSError):
+                build_cache(self.cache)
+
+        with open(images_path, 'rb') as f:
+            self.assertEqual(f.read(), before)
+        self.assertEqual(sorted(os.listdir(self.cache)), sorted([IMAGES_FILE, LABELS_FILE]))
+        self.assertEqual(load_all(self.cache)[0].shape[0], NUM_FAKE_TRAIN + NUM_FAKE_TEST)
+
+    def test_mmap_is_read_only(self):
+        """mmap=True memberi memmap read-only; mmap=False memberi array biasa di RAM."""
+        with patch_keras_loader():
+            images, labels = load_all(self.cache)
+
+        self.assertIsInstance(images, np.memmap)
+        self.assertIsInstance(labels, np.memmap)
+        with self.assertRaises(ValueError):
+            images[0, 0, 0] = 255
+
+        in_memory, _ = load_all(self.cache, mmap=False)
+        self.assertNotIsInstance(in_memory, np.memmap)
+        np.testing.assert_array_equal(in_memory, images)
+
+    def test_load_data_splits_are_views(self):
+        """load_data() memotong di NUM_TRAIN tanpa menyalin array."""
+        with patch_keras_loader(), mock.patch.object(dataset_cache, 'NUM_TRAIN', NUM_FAKE_TRAIN):
+            (x_train, y_train), (x_test, y_test) = load_data(self.cache)
+
+        self.assertEqual((len(x_train), len(x_test)), (NUM_FAKE_TRAIN, NUM_FAKE_TEST))
+        np.testing.assert_array_equal(y_test, np.arange(NUM_FAKE_TRAIN, 10) % 10)
+        for split in (x_train, y_train, x_test, y_test):
+            self.assertIsInstance(split, np.memmap)
+            self.assertFalse(split.flags.owndata)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+"""
+Fashion MNIST Sample Export Unit Testing
+========================================
+Unit test untuk download_image.py: sampling index yang deterministik dan
+ekspor sample dalam format png, npz, dan tar, termasuk kecocokan
+labels.csv dengan file yang benar-benar ditulis.
+
+Dataset diganti cache palsu kecil (format sama dengan dataset_cache.py)
+yang setiap gambarnya bisa dikenali dari nilai pixel-nya, jadi TensorFlow
+dan dataset asli tidak diperlukan.
+
+Framework: unittest (bawaan Python)
+
+Dibuat oleh: Fathih Apriandi
+"""
+
+import csv
+import io
+import os
+import tarfile
+import tempfile
+import unittest
+
+import numpy as np
+from PIL import Image
+
+from dataset_cache import IMAGES_FILE, LABELS_FILE
+from download_image import (
+    LABELS_FILENAME, ekspor_npz, ekspor_png, ekspor_tar, nama_file_sample, pilih_indeks,
+)
+
+# Jumlah gambar di cache palsu
+NUM_FAKE = 40
+
+# ============================================================================
+# FUNGSI BANTU
+# ============================================================================
+
+def write_fake_cache(cache_folder):
+    """Cache palsu: gambar ke-i berisi pixel bernilai 5*i, labelnya i % 10."""
+    os.makedirs(cache_folder)
+    images = np.repeat(np.arange(NUM_FAKE, dtype=np.uint8) * 5, 28 * 28).reshape(NUM_FAKE, 28, 28)
+    labels = np.arange(NUM_FAKE, dtype=np.uint8) % 10
+    np.save(os.path.join(cache_folder, IMAGES_FILE), images)
+    np.save(os.path.join(cache_folder, LABELS_FILE), labels)
+
+
+def dataset_index_of(png_bytes):
+    """Index dataset asal sebuah PNG, dibaca kembali dari nilai pixel-nya."""
+    pixels = np.asarray(Image.open(io.BytesIO(png_bytes)))
+    return int(pixels[0, 0]) // 5
+
+
+def read_labels_csv(f):
+    """Return: {filename: (label, dataset_index)}"""
+    return {row['filename']: (int(row['label']), int(row['dataset_index']))
+            for row in csv.DictReader(f)}
+
+# ============================================================================
+# CLASS UNIT TEST
+# ============================================================================
+
+class TestDownloadImage(unittest.TestCase):
+    """
+    Class untuk testing pemilihan dan ekspor sample dataset.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = os.path.join(self.tmpdir.name, 'cache')
+        write_fake_cache(self.cache)
+        self.indeks = pilih_indeks(7, seed=3, total=NUM_FAKE)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def assert_labels_match(self, labels, files):
+        """labels.csv memuat tepat file yang ditulis, dengan label & index yang benar."""
+        self.assertEqual(sorted(labels), sorted(files))
+        self.assertEqual(sorted(labels), sorted(nama_file_sample(i) for i in range(len(self.indeks))))
+        for nama_file, data in files.items():
+            label, idx = labels[nama_file]
+            self.assertEqual(dataset_index_of(data), idx)
+            self.assertEqual(label, idx % 10)
+        self.assertEqual(sorted(idx for _, idx in labels.values()), sorted(self.indeks.tolist()))
+
+    def test_pilih_indeks(self):
+        """Seed sama memberi index sama, tanpa duplikasi; jumlah di luar rentang ditolak."""
+        self.assertEqual(self.indeks.tolist(), pilih_indeks(7, seed=3, total=NUM_FAKE).tolist())
+        self.assertEqual(len(set(self.indeks.tolist())), 7)
+        self.assertTrue(all(0 <= idx < NUM_FAKE for idx in self.indeks))
+        for jumlah in (0, NUM_FAKE + 1):
+            with self.assertRaises(ValueError):
+                pilih_indeks(jumlah, total=NUM_FAKE)
+
+    def test_ekspor_png(self):
+        """Serial maupun process pool: setiap PNG cocok dengan barisnya di labels.csv."""
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                folder = os.path.join(self.tmpdir.name, f'png_{workers}')
+                ekspor_png(self.indeks, folder, self.cache, workers=workers)
+
+                files = {}
+                for nama_file in os.listdir(folder):
+                    if nama_file != LABELS_FILENAME:
+                        with open(os.path.join(folder, nama_file), 'rb') as f:
+                            files[nama_file] = f.read()
+                with open(os.path.join(folder, LABELS_FILENAME), newline='') as f:
+                    self.assert_labels_match(read_labels_csv(f), files)
+
+    def test_ekspor_npz(self):
+        """Ekstensi .npz ditambahkan pada path yang dikembalikan; isi sesuai urutan index."""
+        path = ekspor_npz(self.indeks, os.path.join(self.tmpdir.name, 'samples'), self.cache)
+        self.assertEqual(path, os.path.join(self.tmpdir.name, 'samples.npz'))
+
+        with np.load(path) as data:
+            np.testing.assert_array_equal(data['indices'], self.indeks)
+            np.testing.assert_array_equal(data['labels'], self.indeks % 10)
+            np.testing.assert_array_equal(data['images'][:, 0, 0], self.indeks * 5)
+            self.assertEqual(data['images'].dtype, np.uint8)
+
+    def test_ekspor_tar(self):
+        """Arsip tar berisi PNG dan labels.csv yang saling cocok."""
+        path = os.path.join(self.tmpdir.name, 'samples.tar')
+        ekspor_tar(self.indeks, path, self.cache, workers=2)
+
+        with tarfile.open(path) as tar:
+            files = {member.name: tar.extractfile(member).read() for member in tar.getmembers()}
+        labels_csv = files.pop(LABELS_FILENAME).decode('utf-8')
+        self.assert_labels_match(read_labels_csv(io.StringIO(labels_csv, newline='')), files)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+"""
+Fashion MNIST Embedding Index Unit Testing
+==========================================
+Unit test untuk embedding_index.py: brute force harus exact, index IVF
+harus sama dengan brute force jika semua cluster diperiksa (juga untuk
+katalog kecil), pencarian dengan file gambar, dan weights NumPy diekspor
+ulang jika model Keras berubah.
+
+Vektor acak dengan seed tetap dan model kecil dengan weights acak, jadi
+model hasil training dan dataset tidak diperlukan.
+
+Framework: unittest (bawaan Python)
+
+Dibuat oleh: Fathih Apriandi
+"""
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from PIL import Image
+
+from embedding_index import (
+    BruteForceIndex, PartitionedIndex, embed, load_numpy_model, normalize_rows, recall_at_k,
+    search_image, stored_fingerprint,
+)
+from numpy_inference import NumpyFashionModel
+from prediction_manifest import model_fingerprint
+
+# ============================================================================
+# CLASS UNIT TEST
+# ============================================================================
+
+class TestEmbeddingIndex(unittest.TestCase):
+    """
+    Class untuk testing pencarian k-nearest-neighbour.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(0)
+        cls.embeddings = normalize_rows(rng.standard_normal((2000, 32))).astype(np.float16)
+        cls.queries = np.asarray(cls.embeddings[:20], dtype=np.float32)
+
+    def test_brute_force_matches_full_sort(self):
+        """Hasil brute force per potongan sama dengan sort seluruh similarity."""
+        ids, scores = BruteForceIndex(self.embeddings, chunk_size=300).search(self.queries, k=5)
+
+        similarity = self.queries @ np.asarray(self.embeddings, dtype=np.float32).T
+        expected = np.argsort(-similarity, axis=1, kind='stable')[:, :5]
+        np.testing.assert_allclose(scores, np.take_along_axis(similarity, expected, axis=1),
+                                   rtol=1e-6)
+        # Query berasal dari katalog: hasil teratas adalah item itu sendiri
+        np.testing.assert_array_equal(ids[:, 0], np.arange(20))
+
+    def test_ivf_all_probes_equals_brute_force(self):
+        """IVF yang memeriksa semua cluster memberi recall 1.0, dan tetap sama setelah save/load."""
+        index = PartitionedIndex.build(self.embeddings, n_lists=16)
+        self.assertEqual(index.offsets[-1], len(self.embeddings))
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'ivf.npz')
+            index.save(path)
+            index = PartitionedIndex.load(self.embeddings, path)
+
+        exact_ids, _ = BruteForceIndex(self.embeddings).search(self.queries, k=10)
+        approx_ids, _ = index.search(self.queries, k=10, n_probe=16)
+        self.assertEqual(recall_at_k(approx_ids, exact_ids), 1.0)
+
+    def test_ivf_lists_clamped_to_sample(self):
+        """Jumlah cluster melebihi sample (atau katalog kecil) dibatasi, bukan ValueError."""
+        small = self.embeddings[:10]
+        index = PartitionedIndex.build(small, n_lists=64, sample_size=5)
+        self.assertEqual(index.n_lists, 5)
+        self.assertEqual(index.offsets[-1], len(small))
+
+        ids, _ = index.search(np.asarray(small[:3], dtype=np.float32), k=1, n_probe=5)
+        np.testing.assert_array_equal(ids[:, 0], np.arange(3))
+        with self.assertRaises(ValueError):
+            PartitionedIndex.build(small, n_lists=0)
+
+    def test_search_by_image_file(self):
+        """File gambar katalog menemukan dirinya sendiri sebagai hasil teratas."""
+        rng = np.random.default_rng(1)
+        model = NumpyFashionModel(
+            [rng.standard_normal((784, 32)), rng.standard_normal((32, 10))],
+            [np.zeros(32), np.zeros(10)], ['relu', 'softmax'])
+        images = rng.integers(0, 256, size=(50, 28, 28), dtype=np.uint8)
+        index = BruteForceIndex(embed(model, images))
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'query.png')
+            Image.fromarray(images[7]).save(path)
+            ids, scores = search_image(model, index, path, k=3)
+
+        self.assertEqual(len(ids), 3)
+        self.assertEqual(ids[0], 7)
+        self.assertAlmostEqual(float(scores[0]), 1.0, places=5)
+
+    def test_weights_reexported_after_retraining(self):
+        """Weights .npz lama tidak dipakai jika fingerprint model .keras berubah."""
+        from train_fashion_mnist_model import build_model
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            model_path = os.path.join(tmpdir, 'model.keras')
+            weights_path = os.path.join(tmpdir, 'weights.npz')
+
+            model = build_model(hidden_units=8)
+            model.save(model_path)
+            first = load_numpy_model(weights_path, model_path)
+            self.assertEqual(stored_fingerprint(weights_path), model_fingerprint(model_path))
+
+            # "Training ulang": weights berubah, file .keras disimpan ulang
+            model.set_weights([w + 1 for w in model.get_weights()])
+            model.save(model_path)
+            second = load_numpy_model(weights_path, model_path)
+
+            self.assertEqual(stored_fingerprint(weights_path), model_fingerprint(model_path))
+            np.testing.assert_allclose(second.kernels[0], first.kernels[0] + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+Fashion MNIST Multi-Model Evaluation Unit Testing
+=================================================
+Unit test untuk EvaluationResult di evaluate_models.py: metrics vektor
+yang diakumulasi per batch harus sama dengan perhitungan loop biasa.
+Juga iter_folder_batches: gambar rusak dilewati dan dihitung.
+
+Probabilitas acak dengan seed tetap, jadi model dan dataset tidak diperlukan.
+
+Framework: unittest (bawaan Python)
+
+Dibuat oleh: Fathih Apriandi
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from PIL import Image
+
+from evaluate_models import EvaluationResult, iter_folder_batches
+
+# ============================================================================
+# CLASS UNIT TEST
+# ============================================================================
+
+class TestEvaluationResult(unittest.TestCase):
+    """
+    Class untuk testing metrics evaluasi multi-model.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(0)
+        logits = rng.standard_normal((500, 10))
+        cls.probabilities = np.exp(logits) / np.exp(logits).sum(axis=1, keepdims=True)
+        cls.labels = rng.integers(0, 10, size=500)
+
+        # Diakumulasi dalam beberapa batch dengan ukuran berbeda
+        cls.result = EvaluationResult('model', top_k=(1, 3))
+        for start, end in ((0, 128), (128, 256), (256, 500)):
+            cls.result.update(cls.probabilities[start:end], cls.labels[start:end])
+        cls.summary = cls.result.summary()
+
+    def test_confusion_and_per_class_metrics(self):
+        """Confusion matrix dan precision/recall sama dengan hitungan loop."""
+        predicted = self.probabilities.argmax(axis=1)
+        confusion = np.zeros((10, 10), dtype=np.int64)
+        for label, prediction in zip(self.labels, predicted):
+            confusion[label, prediction] += 1
+        np.testing.assert_array_equal(self.summary['confusion_matrix'], confusion)
+
+        self.assertAlmostEqual(self.summary['accuracy'], float((predicted == self.labels).mean()))
+        bag = self.summary['per_class']['Bag']
+        self.assertAlmostEqual(bag['precision'], confusion[8, 8] / confusion[:, 8].sum())
+        self.assertAlmostEqual(bag['recall'], confusion[8, 8] / confusion[8].sum())
+
+    def test_top_k_accuracy(self):
+        """Top-1 sama dengan akurasi; top-3 sama dengan pengecekan argsort."""
+        top3 = np.argsort(-self.probabilities, axis=1)[:, :3]
+        expected = np.mean([label in row for label, row in zip(self.labels, top3)])
+
+        self.assertAlmostEqual(self.summary['top_k_accuracy']['1'], self.summary['accuracy'])
+        self.assertAlmostEqual(self.summary['top_k_accuracy']['3'], expected)
+
+    def test_top_k_ties_do_not_favour_model(self):
+        """Kelas yang seri dengan label asli dihitung di depan label."""
+        result = EvaluationResult('model', top_k=(1, 2, 10))
+        # Semua kelas seri, lalu label seri dengan satu kelas lain di posisi teratas
+        probabilities = np.array([np.full(10, 0.1),
+                                  [0.4, 0.4, 0.2] + [0.0] * 7])
+        result.update(probabilities, [5, 1])
+
+        top_k = result.summary()['top_k_accuracy']
+        self.assertEqual(top_k['1'], 0.0)
+        self.assertEqual(top_k['2'], 0.5)
+        self.assertEqual(top_k['10'], 1.0)
+
+
+class TestFolderBatches(unittest.TestCase):
+    """
+    Class untuk testing pembacaan folder gambar + labels.csv.
+    """
+
+    def test_unreadable_images_are_skipped(self):
+        """File rusak/hilang dilewati, sisanya tetap dievaluasi dengan label benar."""
+        with tempfile.TemporaryDirectory() as folder:
+            for i in range(5):
+                Image.new('L', (28, 28), color=i * 50).save(os.path.join(folder, f"img_{i}.png"))
+            with open(os.path.join(folder, "img_2.png"), 'wb') as f:
+                f.write(b"bukan png")
+            labels = {f"img_{i}.png": i for i in range(5)}
+            labels["hilang.png"] = 9
+
+            skipped = []
+            with contextlib.redirect_stdout(io.StringIO()):
+                batches = list(iter_folder_batches(folder, labels, batch_size=2, skipped=skipped))
+
+        self.assertEqual(sorted(name for name, _ in skipped), ["hilang.png", "img_2.png"])
+        images = np.concatenate([images for images, _ in batches])
+        batch_labels = np.concatenate([labels for _, labels in batches])
+        self.assertEqual(images.shape, (4, 28, 28))
+        np.testing.assert_array_equal(batch_labels, [0, 1, 3, 4])
+        np.testing.assert_allclose(images.mean(axis=(1, 2)) * 255, [0, 50, 150, 200], atol=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+"""
+Fashion MNIST Command Line Unit Testing
+=======================================
+Unit test untuk fashion_cli.py: import dan `--help` tidak menarik
+TensorFlow atau matplotlib ke jalur startup, dan subcommand diteruskan ke
+main(argv) module yang tepat.
+
+Pengecekan import dijalankan di proses Python baru, karena proses test ini
+sendiri mungkin sudah meng-import TensorFlow lewat test lain.
+
+Framework: unittest (bawaan Python)
+
+Dibuat oleh: Fathih Apriandi
+"""
+
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import unittest
+from unittest import mock
+
+import fashion_cli
+from fashion_cli import COMMANDS, SCRIPT_DIR
+
+# Module berat yang tidak boleh ter-import saat startup CLI
+HEAVY_MODULES = ('tensorflow', 'matplotlib')
+
+# ============================================================================
+# FUNGSI BANTU
+# ============================================================================
+
+def imported_heavy_modules(code):
+    """Menjalankan `code` di proses baru, return module berat yang ter-import."""
+    check = (f"{code}\n"
+             f"import sys\n"
+             f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    result = subprocess.run(
+        [sys.executable, '-c', check], cwd=SCRIPT_DIR, check=True,
+        capture_output=True, text=True, env=dict(os.environ, TF_CPP_MIN_LOG_LEVEL='3'),
+    )
+    last_line = result.stdout.strip().splitlines()[-1] if result.stdout.strip() else ''
+    return [m for m in last_line.split(',') if m]
+
+# ============================================================================
+# CLASS UNIT TEST
+# ============================================================================
+
+class TestFashionCli(unittest.TestCase):
+    """
+    Class untuk testing entry point command line.
+    """
+
+    def test_import_and_help_stay_light(self):
+        """Import fashion_cli dan `--help` (CLI, download, predict) tanpa TensorFlow/matplotlib."""
+        self.assertEqual(imported_heavy_modules("import fashion_cli"), [])
+
+        for argv in ([], ['download'], ['predict']):
+            with self.subTest(argv=argv):
+                code = ("import contextlib, io, fashion_cli\n"
+                        "with contextlib.redirect_stdout(io.StringIO()):\n"
+                        "    try:\n"
+                        f"        fashion_cli.main({[*argv, '--help']!r})\n"
+                        "    except SystemExit:\n"
+                        "        pass")
+                self.assertEqual(imported_heavy_modules(code), [])
+
+    def test_help_lists_every_subcommand(self):
+        """`fashion_cli.py --help` keluar dengan kode 0 dan menyebut setiap subcommand."""
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            with self.assertRaises(SystemExit) as exit_info:
+                fashion_cli.main(['--help'])
+        self.assertEqual(exit_info.exception.code, 0)
+        for command in [*COMMANDS, 'startup']:
+            self.assertIn(command, output.getvalue())
+
+    def test_dispatch_passes_remaining_args(self):
+        """Subcommand meng-import module-nya dan meneruskan sisa argumen apa adanya ke main()."""
+        for command, (module_name, _) in COMMANDS.items():
+            if module_name is None:
+                continue
+            with self.subTest(command=command):
+                module = mock.Mock()
+                with mock.patch.object(fashion_cli.importlib, 'import_module',
+                                       return_value=module) as import_module:
+                    fashion_cli.main([command, '--count', '5', '--help'])
+                import_module.assert_called_once_with(module_name)
+                module.main.assert_called_once_with(['--count', '5', '--help'])
+
+    def test_test_subcommand_sets_tier(self):
+        """`test --tier fast` mengatur TEST_TIER sebelum unittest berjalan."""
+        with mock.patch.dict(os.environ), mock.patch('unittest.main') as unittest_main:
+            fashion_cli.main(['test', '--tier', 'fast', 'test_prediction_cache'])
+            self.assertEqual(os.environ['TEST_TIER'], 'fast')
+        unittest_main.assert_called_once_with(
+            module=None, argv=['fashion_cli.py test', 'test_prediction_cache'])
+
+
+if __name__ == "__main__":
+    unittest.main()
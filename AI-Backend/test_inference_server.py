@@ -0,0 +1,195 @@
+"""
+Fashion MNIST Inference Server Unit Testing
+============================================
+Unit test untuk inference_server.py menggunakan client HTTP lokal.
+Server dijalankan di port acak pada localhost, tanpa service eksternal.
+
+Model asli tidak diperlukan: MicroBatcher menerima fungsi inferensi
+sederhana berbasis NumPy yang hasilnya bisa diprediksi, sehingga test
+fokus pada protokol HTTP dan perilaku micro-batching.
+
+Framework: unittest (bawaan Python)
+
+Dibuat oleh: Fathih Apriandi
+"""
+
+import base64
+import http.client
+import io
+import json
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from unittest import mock
+
+import numpy as np
+from PIL import Image
+
+from inference_server import DEFAULT_MAX_BODY_BYTES, MicroBatcher, create_server
+from predict_custom_image import LABELS
+
+# ============================================================================
+# HELPER
+# ============================================================================
+
+def fake_infer(images):
+    """
+    Fungsi inferensi tiruan: kelas = nilai pixel rata-rata × 9 (dibulatkan).
+    Output one-hot sehingga confidence selalu 100%.
+    """
+    kelas = np.rint(images.reshape(len(images), -1).mean(axis=1) * 9).astype(int)
+    return np.eye(10, dtype=np.float32)[kelas]
+
+
+def encode_png(nilai_pixel):
+    """Membuat PNG 28x28 dengan satu nilai pixel lalu encode ke base64."""
+    buffer = io.BytesIO()
+    Image.new('L', (28, 28), color=nilai_pixel).save(buffer, format='PNG')
+    return base64.b64encode(buffer.getvalue()).decode('ascii')
+
+# ============================================================================
+# CLASS UNIT TEST
+# ============================================================================
+
+class TestInferenceServer(unittest.TestCase):
+    """
+    Class untuk testing inference server dengan client HTTP lokal.
+    """
+
+    def setUp(self):
+        # Waktu tunggu batch dibuat besar agar request bersamaan pasti tergabung
+        self.batcher = MicroBatcher(fake_infer, max_batch_size=8, max_wait_ms=200).start()
+
+        # port=0: OS memilih port kosong
+        self.server = create_server(self.batcher, '127.0.0.1', 0)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.batcher.stop()
+
+    def post(self, body):
+        """Mengirim POST /predict dan mengembalikan (status, json)."""
+        request = urllib.request.Request(
+            self.url + '/predict', data=json.dumps(body).encode('utf-8'),
+            headers={'Content-Type': 'application/json'}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as error:
+            return error.code, json.loads(error.read())
+
+    def test_health(self):
+        """Test 1: Endpoint /health harus merespon status ok."""
+        with urllib.request.urlopen(self.url + '/health', timeout=10) as response:
+            self.assertEqual(json.loads(response.read()), {"status": "ok"})
+
+    def test_predict_single_image(self):
+        """Test 2: Satu gambar menghasilkan satu label dan confidence."""
+        # Gambar putih penuh → mean 1.0 → kelas 9 (Ankle boot)
+        status, body = self.post({"image": encode_png(255)})
+
+        self.assertEqual(status, 200)
+        self.assertEqual(len(body["predictions"]), 1)
+        self.assertEqual(body["predictions"][0]["label"], LABELS[9])
+        self.assertAlmostEqual(body["predictions"][0]["confidence"], 100.0, places=3)
+
+    def test_predict_multi_image_keeps_order(self):
+        """Test 3: Banyak gambar dalam satu request, urutan hasil harus sama."""
+        status, body = self.post({"images": [encode_png(0), encode_png(255)]})
+
+        self.assertEqual(status, 200)
+        labels = [prediksi["label"] for prediksi in body["predictions"]]
+        self.assertEqual(labels, [LABELS[0], LABELS[9]])
+
+    def test_concurrent_requests_are_batched(self):
+        """Test 4: Request yang datang bersamaan digabung ke forward pass yang sama."""
+        jumlah_request = 6
+        hasil = [None] * jumlah_request
+
+        def kirim(index):
+            hasil[index] = self.post({"image": encode_png(255)})
+
+        threads = [threading.Thread(target=kirim, args=(i,)) for i in range(jumlah_request)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertTrue(all(status == 200 for status, _ in hasil))
+        self.assertEqual(self.batcher.image_count, jumlah_request)
+        self.assertLess(
+            self.batcher.batch_count, jumlah_request,
+            msg=f"Request tidak digabung: {self.batcher.batch_count} batch"
+        )
+
+    def test_invalid_request(self):
+        """Test 5: Body tanpa gambar atau base64 rusak harus ditolak dengan 400."""
+        status, body = self.post({"foo": "bar"})
+        self.assertEqual(status, 400)
+        self.assertIn("error", body)
+
+        status, body = self.post({"image": "bukan-base64!!"})
+        self.assertEqual(status, 400)
+
+    def test_decompression_bomb_is_rejected(self):
+        """Test 6: Gambar melebihi batas pixel PIL ditolak dengan 400, koneksi tidak putus."""
+        # Batas diperkecil agar PNG 28x28 sudah dianggap decompression bomb
+        # (PIL menolak gambar > 2 × MAX_IMAGE_PIXELS)
+        with mock.patch.object(Image, 'MAX_IMAGE_PIXELS', 100):
+            status, body = self.post({"image": encode_png(255)})
+
+        self.assertEqual(status, 400)
+        self.assertIn("decompression bomb", body["error"])
+
+    def test_content_length_is_validated(self):
+        """Test 7: Content-Length hilang (411), negatif (400), atau terlalu besar (413) ditolak."""
+        for content_length, expected in ((None, 411), ('-1', 400),
+                                         (str(DEFAULT_MAX_BODY_BYTES + 1), 413)):
+            with self.subTest(content_length=content_length):
+                # Body tidak dikirim: server harus menolak dari header saja, tanpa menunggu EOF
+                connection = http.client.HTTPConnection(
+                    '127.0.0.1', self.server.server_port, timeout=10)
+                try:
+                    connection.putrequest('POST', '/predict')
+                    if content_length is not None:
+                        connection.putheader('Content-Length', content_length)
+                    connection.endheaders()
+                    response = connection.getresponse()
+                    self.assertEqual(response.status, expected)
+                    self.assertIn("error", json.loads(response.read()))
+                finally:
+                    connection.close()
+
+
+class TestMicroBatcher(unittest.TestCase):
+    """
+    Class untuk testing batas ukuran batch pada MicroBatcher.
+    """
+
+    def test_max_batch_size(self):
+        """Ukuran setiap forward pass tidak boleh melebihi max_batch_size."""
+        ukuran_batch = []
+
+        def infer(images):
+            ukuran_batch.append(len(images))
+            return fake_infer(images)
+
+        batcher = MicroBatcher(infer, max_batch_size=4, max_wait_ms=50).start()
+        try:
+            hasil = batcher.predict([np.zeros((28, 28), np.float32)] * 10)
+        finally:
+            batcher.stop()
+
+        self.assertEqual(len(hasil), 10)
+        self.assertEqual(sum(ukuran_batch), 10)
+        self.assertLessEqual(max(ukuran_batch), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
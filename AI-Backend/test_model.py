@@ -4,13 +4,31 @@ Fashion MNIST Model Unit Testing
 Script untuk melakukan unit testing terhadap model yang sudah dilatih.
 Testing mencakup evaluasi akurasi, loss, dan validasi output prediksi.
 
+Tier test (environment variable TEST_TIER):
+- full (default): evaluasi pada seluruh 10.000 gambar test
+- fast          : evaluasi pada subset tetap 1.000 gambar test pertama,
+                  selesai dalam hitungan detik
+
+Di kedua tier, data dibaca dari cache memory-map, dinormalisasi langsung
+ke float32 (bukan float64), dan TensorFlow + model baru di-load saat test
+pertama membutuhkannya.
+
+Penggunaan:
+    python -m unittest test_model.py
+    TEST_TIER=fast python -m unittest test_model.py test_performance.py
+
 Framework: unittest (bawaan Python)
 
 Dibuat oleh: Fathih Apriandi
 """
 
+import os
 import unittest
-import tensorflow as tf
+from functools import lru_cache
+
+import numpy as np
+
+from dataset_cache import load_data
 
 # ============================================================================
 # KONFIGURASI PATH MODEL
@@ -20,6 +38,30 @@ import tensorflow as tf
 # File ini harus sudah ada (hasil dari train_fashion_mnist_model.py)
 PATH_MODEL = 'fashion_mnist_model.keras'
 
+# ============================================================================
+# KONFIGURASI TIER TEST
+# ============================================================================
+
+# "fast" = subset kecil, selain itu seluruh test set
+TEST_TIER = os.environ.get('TEST_TIER', 'full')
+
+# Jumlah gambar test yang dipakai di tier fast (subset tetap, bukan acak)
+FAST_SUBSET = 1000
+
+# ============================================================================
+# FUNGSI: LOAD MODEL (LAZY)
+# ============================================================================
+
+@lru_cache(maxsize=None)
+def muat_model(path_model=PATH_MODEL):
+    """
+    Load model sekali, saat pertama kali dibutuhkan.
+    TensorFlow juga baru di-import di sini, jadi test yang tidak memakai
+    model (atau di-skip) tidak membayar biaya import TensorFlow.
+    """
+    import tensorflow as tf
+    return tf.keras.models.load_model(path_model)
+
 # ============================================================================
 # CLASS UNIT TEST
 # ============================================================================
@@ -40,24 +82,29 @@ class TestFashionMNISTModel(unittest.TestCase):
         cls parameter mengacu ke class itu sendiri (seperti self untuk instance).
         """
         
-        # Load dataset Fashion MNIST dari Keras
-        mnist = tf.keras.datasets.fashion_mnist
-        
+        # Load dataset Fashion MNIST dari cache .npy (memory-mapped)
         # Kita hanya butuh test data untuk validasi model
         # _ (underscore) adalah konvensi Python untuk variabel yang tidak digunakan
         # Di sini kita abaikan training data karena hanya butuh test data
-        (_, _), (cls.x_test, cls.y_test) = mnist.load_data()
+        (_, _), (x_test, y_test) = load_data()
+
+        # Tier fast: slice dari file memory-map, hanya bagian ini yang dibaca
+        if TEST_TIER == 'fast':
+            x_test, y_test = x_test[:FAST_SUBSET], y_test[:FAST_SUBSET]
         
         # Normalisasi pixel values ke range [0, 1]
         # Harus sama dengan normalisasi saat training untuk hasil konsisten
         # Jika tidak dinormalisasi, model akan memberikan prediksi yang salah
-        cls.x_test = cls.x_test / 255.0
+        # dtype float32: tanpa salinan float64 yang dikonversi ulang oleh Keras
+        cls.x_test = np.asarray(x_test, dtype=np.float32) / 255.0
+        cls.y_test = y_test
         
-        # Load model yang sudah dilatih dari file
-        # Model ini berisi arsitektur dan weights hasil training
-        cls.model = tf.keras.models.load_model(PATH_MODEL)
-        
-        print(f"\n✅ Setup selesai: Model dan test data berhasil dimuat")
+        print(f"\n✅ Setup selesai: {len(cls.x_test)} gambar test dimuat (tier {TEST_TIER})")
+
+    @property
+    def model(self):
+        # Model yang sudah dilatih, di-load saat pertama kali dipakai
+        return muat_model()
     
     def test_model_evaluate(self):
         """
@@ -68,10 +115,13 @@ class TestFashionMNISTModel(unittest.TestCase):
         2. Loss bernilai non-negatif (≥ 0)
         """
         
-        # Evaluasi model menggunakan 10.000 gambar test
+        # Evaluasi model menggunakan gambar test (10.000, atau subset di tier fast)
         # verbose=0 mematikan output progress bar
+        # batch_size=256 mengurangi jumlah step tanpa mengubah hasil
         # Return: (loss_value, accuracy_value)
-        loss, akurasi = self.model.evaluate(self.x_test, self.y_test, verbose=0)
+        loss, akurasi = self.model.evaluate(
+            self.x_test, self.y_test, batch_size=256, verbose=0
+        )
         
         # Assertion 1: Akurasi harus >= 0.0
         # assertGreaterEqual berarti "pastikan nilai >= threshold"
@@ -114,7 +164,7 @@ class TestFashionMNISTModel(unittest.TestCase):
         # Kita ambil 10 sample untuk testing (cukup dan cepat)
         # Output: array 2D dengan shape (10, 10)
         # Baris = gambar, Kolom = probabilitas untuk setiap kelas (0-9)
-        prediksi = self.model.predict(self.x_test[:10])
+        prediksi = self.model.predict(self.x_test[:10], verbose=0)
         
         # Assertion 1: Shape output harus (10, 10)
         # 10 gambar input -> 10 baris output
@@ -127,16 +177,14 @@ class TestFashionMNISTModel(unittest.TestCase):
         
         # Assertion 2: Setiap row harus sum = 1.0 (properti softmax)
         # Softmax memastikan output adalah distribusi probabilitas
-        # Loop setiap baris (setiap prediksi gambar)
-        for idx_baris, baris in enumerate(prediksi):
-            # assertAlmostEqual untuk perbandingan float (toleransi pembulatan)
-            # places=3 berarti toleransi sampai 3 digit desimal (0.001)
-            self.assertAlmostEqual(
-                sum(baris), 
-                1.0, 
-                places=3,
-                msg=f"Sum probabilitas baris {idx_baris} bukan 1.0: {sum(baris)}"
-            )
+        # Vectorized: .sum(axis=1) menjumlahkan semua baris sekaligus
+        # atol=1e-3 setara toleransi 3 digit desimal (0.001)
+        np.testing.assert_allclose(
+            prediksi.sum(axis=1),
+            1.0,
+            atol=1e-3,
+            err_msg="Ada baris yang sum probabilitasnya bukan 1.0"
+        )
         
         # Assertion 3: Semua probabilitas harus dalam range [0, 1]
         # Probabilitas tidak boleh negatif atau lebih dari 1
@@ -0,0 +1,100 @@
+"""
+Fashion MNIST NumPy Inference Parity Testing
+=============================================
+Unit test untuk memastikan hasil numpy_inference.py sama dengan model Keras
+(dalam batas toleransi floating point), dan hasil model full-integer TFLite
+dari quantize_model.py mendekati model Keras.
+
+File model harus sudah ada (hasil dari train_fashion_mnist_model.py).
+
+Framework: unittest (bawaan Python)
+
+Dibuat oleh: Fathih Apriandi
+"""
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import tensorflow as tf
+
+from dataset_cache import load_data
+from export_numpy_model import export_weights
+from numpy_inference import NumpyFashionModel
+from quantize_model import TFLiteFashionModel, convert_tflite_int8
+
+# ============================================================================
+# KONFIGURASI PATH MODEL
+# ============================================================================
+
+PATH_MODEL = 'fashion_mnist_model.keras'
+
+# ============================================================================
+# CLASS UNIT TEST
+# ============================================================================
+
+class TestNumpyInferenceParity(unittest.TestCase):
+    """
+    Class untuk membandingkan output NumPy engine dengan model Keras.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        # Export weights ke folder sementara agar tidak menimpa file asli
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        weights_path = os.path.join(cls.tmpdir.name, 'weights.npz')
+        export_weights(PATH_MODEL, weights_path)
+
+        cls.keras_model = tf.keras.models.load_model(PATH_MODEL)
+        cls.numpy_model = NumpyFashionModel.load(weights_path)
+
+        # 256 gambar acak dengan seed tetap (hasil test reproducible)
+        rng = np.random.default_rng(42)
+        cls.images = rng.integers(0, 256, size=(256, 28, 28), dtype=np.uint8)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmpdir.cleanup()
+
+    def test_probabilities_match_keras(self):
+        """Test 1: Probabilitas NumPy sama dengan Keras (toleransi 1e-5)."""
+        x = self.images.astype(np.float32) / 255.0
+        expected = self.keras_model.predict(x, verbose=0)
+        actual = self.numpy_model.predict(x)
+
+        self.assertEqual(actual.shape, expected.shape)
+        np.testing.assert_allclose(actual, expected, atol=1e-5, rtol=1e-4)
+
+        # Label hasil argmax juga harus identik
+        np.testing.assert_array_equal(actual.argmax(axis=1), expected.argmax(axis=1))
+
+    def test_uint8_input_is_normalized(self):
+        """Test 2: Input uint8 dinormalisasi sama seperti input float32 / 255."""
+        from_uint8 = self.numpy_model.predict(self.images)
+        from_float = self.numpy_model.predict(self.images.astype(np.float32) / 255.0)
+
+        np.testing.assert_allclose(from_uint8, from_float, atol=1e-6)
+        np.testing.assert_allclose(from_uint8.sum(axis=1), 1.0, atol=1e-5)
+
+    def test_tflite_int8_matches_keras(self):
+        """Test 3: Model full-integer TFLite memberi label yang hampir selalu sama."""
+        # Gambar asli (bukan noise acak): noise sering menghasilkan kelas yang
+        # probabilitasnya hampir seri, sehingga tidak mewakili error kuantisasi
+        (x_train, _), (x_test, _) = load_data()
+        calibration = np.asarray(x_train[:200], dtype=np.float32) / 255.0
+        images = np.asarray(x_test[:256])
+        expected = self.keras_model.predict(images.astype(np.float32) / 255.0, verbose=0)
+
+        tflite_model = TFLiteFashionModel(convert_tflite_int8(self.keras_model, calibration))
+        actual = tflite_model.predict(images)
+
+        self.assertEqual(actual.shape, expected.shape)
+        # Error kuantisasi int8: probabilitas tidak identik, label hampir selalu sama
+        self.assertLess(np.abs(actual - expected).max(), 0.1)
+        self.assertGreaterEqual((actual.argmax(axis=1) == expected.argmax(axis=1)).mean(), 0.98)
+        # Ukuran batch berbeda memakai interpreter yang sama (tensor di-resize)
+        np.testing.assert_allclose(tflite_model.predict(images[:3]), actual[:3])
+
+if __name__ == "__main__":
+    unittest.main()
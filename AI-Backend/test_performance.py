@@ -0,0 +1,106 @@
+"""
+Fashion MNIST Performance Regression Testing
+============================================
+Unit test yang gagal jika jalur prediksi menjadi lebih lambat dari budget:
+- latency satu gambar (median) lewat build_inference_fn() + predict_batch()
+- throughput batch (gambar/detik)
+
+Budget default sengaja longgar (±10-20x di atas hasil mesin CPU biasa)
+agar tidak flaky, tapi tetap menangkap regresi besar, contoh kembali ke
+model.predict() per gambar. Budget bisa diatur lewat environment variable:
+    PERF_LATENCY_BUDGET_MS    latency median maksimal (default: 10)
+    PERF_THROUGHPUT_BUDGET    throughput minimal, gambar/detik (default: 5000)
+
+Input berupa gambar acak dengan seed tetap, jadi dataset tidak diperlukan.
+File model harus sudah ada (hasil dari train_fashion_mnist_model.py).
+
+Framework: unittest (bawaan Python)
+
+Dibuat oleh: Fathih Apriandi
+"""
+
+import os
+import time
+import unittest
+
+import numpy as np
+
+from test_model import muat_model
+
+# ============================================================================
+# KONFIGURASI BUDGET
+# ============================================================================
+
+LATENCY_BUDGET_MS = float(os.environ.get('PERF_LATENCY_BUDGET_MS', 10))
+THROUGHPUT_BUDGET = float(os.environ.get('PERF_THROUGHPUT_BUDGET', 5000))
+
+# Jumlah pengukuran latency dan ukuran/jumlah batch untuk throughput
+LATENCY_RUNS = 50
+THROUGHPUT_BATCH_SIZE = 256
+THROUGHPUT_RUNS = 10
+
+# Jumlah panggilan pemanasan (tracing graph) yang tidak ikut diukur
+WARMUP_RUNS = 3
+
+# ============================================================================
+# CLASS UNIT TEST
+# ============================================================================
+
+class TestPredictionPerformance(unittest.TestCase):
+    """
+    Class untuk menjaga kecepatan jalur prediksi predict_custom_image.py.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        # Import di sini agar module ini tetap ringan saat hanya di-list/discover
+        from predict_custom_image import build_inference_fn, predict_batch
+
+        # staticmethod: tf.function dan fungsi biasa tidak boleh terikat ke self
+        cls.predict_batch = staticmethod(predict_batch)
+        cls.infer = staticmethod(build_inference_fn(muat_model()))
+
+        rng = np.random.default_rng(42)
+        cls.images = rng.random((THROUGHPUT_BATCH_SIZE, 28, 28), dtype=np.float32)
+
+    def test_single_image_latency(self):
+        """Test 1: Median latency satu gambar di bawah budget."""
+        gambar = [self.images[0]]
+        for _ in range(WARMUP_RUNS):
+            self.predict_batch(self.infer, gambar)
+
+        durasi = np.empty(LATENCY_RUNS)
+        for i in range(LATENCY_RUNS):
+            start = time.perf_counter()
+            self.predict_batch(self.infer, gambar)
+            durasi[i] = time.perf_counter() - start
+
+        median_ms = float(np.median(durasi)) * 1000
+        print(f"\n   ⏱️  Latency 1 gambar: median {median_ms:.3f} ms "
+              f"(budget {LATENCY_BUDGET_MS} ms)")
+        self.assertLessEqual(
+            median_ms, LATENCY_BUDGET_MS,
+            msg=f"Latency median {median_ms:.3f} ms melebihi budget {LATENCY_BUDGET_MS} ms"
+        )
+
+    def test_batch_throughput(self):
+        """Test 2: Throughput batch di atas budget."""
+        batch = list(self.images)
+        for _ in range(WARMUP_RUNS):
+            self.predict_batch(self.infer, batch)
+
+        start = time.perf_counter()
+        for _ in range(THROUGHPUT_RUNS):
+            self.predict_batch(self.infer, batch)
+        throughput = THROUGHPUT_RUNS * len(batch) / (time.perf_counter() - start)
+
+        print(f"\n   🚀 Throughput batch {len(batch)}: {throughput:,.0f} gambar/detik "
+              f"(budget {THROUGHPUT_BUDGET:,.0f})")
+        self.assertGreaterEqual(
+            throughput, THROUGHPUT_BUDGET,
+            msg=f"Throughput {throughput:,.0f} gambar/detik di bawah budget {THROUGHPUT_BUDGET:,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+"""
+Fashion MNIST Pipeline Metrics Unit Testing
+===========================================
+Unit test untuk pipeline_metrics.py: agregasi stage()/count()/observe()
+(termasuk dari beberapa thread), format export Prometheus dan JSON, dan
+NULL_METRICS yang tidak mencatat apa pun.
+
+Test terakhir menjalankan predict_files() dengan fake_infer dari
+testing_fakes.py, jadi model dan TensorFlow tidak diperlukan.
+
+Framework: unittest (bawaan Python)
+
+Dibuat oleh: Fathih Apriandi
+"""
+
+import contextlib
+import io
+import json
+import os
+import re
+import tempfile
+import threading
+import unittest
+
+import predict_custom_image
+from pipeline_metrics import METRIC_PREFIX, NULL_METRICS, PipelineMetrics
+from testing_fakes import fake_infer, write_image
+
+# Satu baris sample Prometheus: nama{label="nilai"} angka
+SAMPLE_LINE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{[a-z]+="(?:[^"\\]|\\.)*"\})? [0-9.e+-]+$')
+
+# ============================================================================
+# CLASS UNIT TEST
+# ============================================================================
+
+class TestPipelineMetrics(unittest.TestCase):
+    """
+    Class untuk testing pengumpulan dan export metrics pipeline.
+    """
+
+    def test_stage_count_and_observe_aggregate(self):
+        """Waktu & jumlah panggilan per stage, counter, dan gauge avg/max dijumlahkan."""
+        metrics = PipelineMetrics()
+        for _ in range(3):
+            with metrics.stage('open'):
+                pass
+        with self.assertRaises(KeyError):
+            with metrics.stage('save'):
+                raise KeyError('gagal')     # Stage yang gagal tetap tercatat
+
+        metrics.count('images_processed')
+        metrics.count('images_processed', 4)
+        metrics.count_label('Bag', 2)
+        for depth in (1, 5, 3):
+            metrics.observe('queue_depth', depth)
+
+        data = metrics.to_dict()
+        self.assertEqual(data['stages']['open']['calls'], 3)
+        self.assertEqual(data['stages']['save']['calls'], 1)
+        self.assertGreaterEqual(data['stages']['open']['seconds'], 0.0)
+        self.assertEqual(data['counters'], {'images_processed': 5})
+        self.assertEqual(data['labels'], {'Bag': 2})
+        self.assertEqual(data['gauges']['queue_depth'], {'avg': 3.0, 'max': 5})
+
+    def test_thread_safe_counting(self):
+        """Panggilan dari banyak worker thread tidak saling menimpa."""
+        metrics = PipelineMetrics()
+
+        def work():
+            for _ in range(1000):
+                with metrics.stage('resize'):
+                    metrics.count('bytes_read', 2)
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        data = metrics.to_dict()
+        self.assertEqual(data['stages']['resize']['calls'], 8000)
+        self.assertEqual(data['counters']['bytes_read'], 16000)
+
+    def test_prometheus_format(self):
+        """Setiap baris berupa komentar HELP/TYPE atau sample yang valid, label di-escape."""
+        metrics = PipelineMetrics()
+        with metrics.stage('predict'):
+            pass
+        metrics.count('images_processed', 7)
+        metrics.count_label('T-shirt/top', 7)
+        metrics.count_label('Kata "aneh"\\', 1)
+        metrics.observe('queue_depth', 2)
+
+        text = metrics.to_prometheus()
+        self.assertTrue(text.endswith("\n"))
+        for line in text.splitlines():
+            if line.startswith('#'):
+                self.assertRegex(line, rf'^# (HELP|TYPE) {METRIC_PREFIX}_')
+            else:
+                self.assertRegex(line, SAMPLE_LINE)
+
+        p = METRIC_PREFIX
+        self.assertIn(f'{p}_stage_calls_total{{stage="predict"}} 1', text)
+        self.assertIn(f'{p}_images_processed_total 7', text)
+        self.assertIn(f'{p}_label_total{{label="T-shirt/top"}} 7', text)
+        self.assertIn(f'{p}_label_total{{label="Kata \\"aneh\\"\\\\"}} 1', text)
+        self.assertIn(f'{p}_queue_depth{{stat="max"}} 2', text)
+
+    def test_write_picks_format_from_extension(self):
+        """File .prom berisi Prometheus text, ekstensi lain berisi JSON."""
+        metrics = PipelineMetrics()
+        metrics.count('images_processed', 3)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            prom_path = os.path.join(tmpdir, 'metrics.prom')
+            json_path = os.path.join(tmpdir, 'metrics.json')
+            metrics.write(prom_path)
+            metrics.write(json_path)
+
+            with open(prom_path) as f:
+                self.assertIn(f'{METRIC_PREFIX}_images_processed_total 3', f.read())
+            with open(json_path) as f:
+                self.assertEqual(json.load(f)['counters'], {'images_processed': 3})
+
+    def test_null_metrics_is_noop(self):
+        """NULL_METRICS tidak menyimpan state dan stage() selalu context manager yang sama."""
+        self.assertFalse(NULL_METRICS.enabled)
+        self.assertIs(NULL_METRICS.stage('open'), NULL_METRICS.stage('save'))
+
+        before = dict(vars(NULL_METRICS))
+        with NULL_METRICS.stage('open'):
+            NULL_METRICS.count('images_processed', 5)
+            NULL_METRICS.count_label('Bag')
+            NULL_METRICS.observe('queue_depth', 3)
+        self.assertEqual(vars(NULL_METRICS), before)
+
+        # Exception di dalam stage tetap diteruskan
+        with self.assertRaises(ValueError):
+            with NULL_METRICS.stage('predict'):
+                raise ValueError('gagal')
+
+    def test_predict_files_records_stages(self):
+        """predict_files() mengisi stage dan jumlah label sesuai gambar yang diprediksi."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            input_folder = os.path.join(tmpdir, 'input')
+            os.makedirs(input_folder)
+            filenames = [f"sample_{i}.png" for i in range(5)]
+            for i, filename in enumerate(filenames):
+                write_image(os.path.join(input_folder, filename), i)
+
+            output_folder = os.path.join(tmpdir, 'result')
+            metrics = PipelineMetrics()
+            with contextlib.redirect_stdout(io.StringIO()):
+                predict_custom_image.prepare_output_folder(output_folder, metrics)
+                prediction_count = predict_custom_image.predict_files(
+                    fake_infer, input_folder, filenames, output_folder,
+                    batch_size=2, workers=2, metrics=metrics)
+
+        data = metrics.to_dict()
+        self.assertEqual(data['stages']['open']['calls'], 5)
+        self.assertEqual(data['stages']['resize']['calls'], 5)
+        self.assertEqual(data['stages']['predict']['calls'], 3)
+        self.assertEqual(data['stages']['save']['calls'], 5)
+        self.assertEqual(data['labels'], {k: v for k, v in prediction_count.items() if v})
+
+
+if __name__ == "__main__":
+    unittest.main()
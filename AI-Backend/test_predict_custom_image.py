@@ -0,0 +1,500 @@
+"""
+Fashion MNIST Custom Image Predictor Unit Testing
+=================================================
+Unit test untuk bagian predict_custom_image.py yang menyimpan state antar
+run: mode output dan file prediksi (prediction_output.py), mode
+incremental, watch mode, pipeline asyncio, dan kesamaan hasil mode batch
+dengan prediksi per gambar.
+
+Model diganti fungsi inferensi palsu (kelas = kecerahan rata-rata gambar),
+kecuali TestBatchParity yang memakai model Keras kecil berweights acak;
+file model asli dan dataset tidak diperlukan. Setiap test berjalan di
+folder sementara.
+
+Framework: unittest (bawaan Python)
+
+Dibuat oleh: Fathih Apriandi
+"""
+
+import asyncio
+import contextlib
+import csv
+import errno
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+from PIL import Image
+
+import predict_custom_image
+from predict_custom_image import LABELS
+from prediction_manifest import MANIFEST_FILENAME, PredictionManifest
+from prediction_output import PredictionWriter
+from testing_fakes import fake_infer, write_image
+
+# ============================================================================
+# FUNGSI BANTU
+# ============================================================================
+
+def read_lines(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def wait_until(condition, timeout=10.0):
+    """Menunggu condition() bernilai True (watch mode berjalan di thread lain)."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("timeout menunggu watch mode")
+        time.sleep(0.01)
+
+# ============================================================================
+# CLASS UNIT TEST
+# ============================================================================
+
+class TestPredictCustomImage(unittest.TestCase):
+    """
+    Class untuk testing mode output, run incremental, watch mode, dan
+    pipeline asyncio predict_custom_image.py.
+    """
+
+    def setUp(self):
+        # main() memakai path relatif (test-image/, result/, file model)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.previous_cwd = os.getcwd()
+        os.chdir(self.tmpdir.name)
+
+        os.makedirs(predict_custom_image.INPUT_FOLDER)
+        for i in range(6):
+            write_image(self.input_path(f"sample_{i}.png"), i)
+        # Hanya dibaca untuk fingerprint model
+        with open(predict_custom_image.MODEL_PATH, 'wb') as f:
+            f.write(b'model')
+
+    def tearDown(self):
+        os.chdir(self.previous_cwd)
+        self.tmpdir.cleanup()
+
+    def input_path(self, filename):
+        return os.path.join(predict_custom_image.INPUT_FOLDER, filename)
+
+    def run_main(self, *argv):
+        """
+        Menjalankan main() dengan fake_infer, tanpa chart dan tanpa output terminal.
+        Return: nama file yang masuk forward pass
+        """
+        infer = mock.Mock(side_effect=fake_infer)
+        with mock.patch.object(predict_custom_image, 'load_model'), \
+                mock.patch.object(predict_custom_image, 'build_inference_fn',
+                                  return_value=infer), \
+                contextlib.redirect_stdout(io.StringIO()) as output:
+            predict_custom_image.main(['--no-chart', '--workers', '0', *argv])
+        return sorted(line.split()[1].rstrip(':') for line in output.getvalue().splitlines()
+                      if line.strip().startswith('📸'))
+
+    def test_incremental_run_keeps_all_predictions(self):
+        """Run incremental kedua tetap menulis satu baris untuk setiap gambar."""
+        predictions = os.path.join(predict_custom_image.OUTPUT_FOLDER, 'predictions.jsonl')
+        self.run_main('--incremental', '--predictions-file', predictions)
+        self.assertEqual(len(read_lines(predictions)), 6)
+
+        # Satu gambar berubah isi (dan kelas): hanya gambar itu yang diprediksi ulang
+        write_image(self.input_path("sample_0.png"), 9)
+        os.utime(self.input_path("sample_0.png"), ns=(1, 1))
+        self.run_main('--incremental', '--predictions-file', predictions)
+
+        rows = {row['filename']: row['label'] for row in read_lines(predictions)}
+        self.assertEqual(len(read_lines(predictions)), 6)
+        self.assertEqual(rows["sample_0.png"], LABELS[9])
+        self.assertEqual(rows["sample_1.png"], LABELS[1])
+        self.assertFalse(os.path.exists(os.path.join(
+            predict_custom_image.OUTPUT_FOLDER, LABELS[0], "sample_0.png")))
+
+    def test_incremental_skips_unchanged_files(self):
+        """Run kedua tanpa perubahan tidak memprediksi apa pun; file baru/dihapus terdeteksi."""
+        self.assertEqual(len(self.run_main('--incremental')), 6)
+        self.assertEqual(self.run_main('--incremental'), [])
+
+        write_image(self.input_path("sample_6.png"), 6)
+        os.remove(self.input_path("sample_5.png"))
+        self.assertEqual(self.run_main('--incremental'), ["sample_6.png"])
+
+        manifest_path = os.path.join(predict_custom_image.OUTPUT_FOLDER, MANIFEST_FILENAME)
+        with open(manifest_path) as f:
+            files = json.load(f)['files']
+        self.assertEqual(sorted(files), [f"sample_{i}.png" for i in (0, 1, 2, 3, 4, 6)])
+        self.assertFalse(os.path.exists(os.path.join(
+            predict_custom_image.OUTPUT_FOLDER, LABELS[5], "sample_5.png")))
+
+        # Model berubah: semua gambar diprediksi ulang
+        with open(predict_custom_image.MODEL_PATH, 'wb') as f:
+            f.write(b'model baru')
+        self.assertEqual(len(self.run_main('--incremental')), 6)
+
+    def test_manifest_detects_changed_file(self):
+        """mtime berubah = diproses ulang; dengan hash, hanya isi yang berubah yang diproses."""
+        manifest = PredictionManifest('manifest.json', 'model')
+        filenames = ["sample_0.png", "sample_1.png"]
+        for use_hash in (False, True):
+            to_process, _, _ = manifest.plan(predict_custom_image.INPUT_FOLDER, filenames, use_hash)
+            for filename in to_process:
+                manifest.record(filename, LABELS[0], 90.0)
+
+        # Isi sama, mtime berubah (file di-touch)
+        os.utime(self.input_path("sample_0.png"), ns=(1, 1))
+        self.assertEqual(manifest.plan(predict_custom_image.INPUT_FOLDER, filenames, True)[0], [])
+        os.utime(self.input_path("sample_0.png"), ns=(2, 2))
+        self.assertEqual(manifest.plan(predict_custom_image.INPUT_FOLDER, filenames)[0],
+                         ["sample_0.png"])
+
+        # Isi berubah dengan ukuran dan mtime yang sama: hanya terdeteksi lewat hash
+        with open(self.input_path("sample_1.png"), 'rb') as f:
+            data = bytearray(f.read())
+        stat = os.stat(self.input_path("sample_1.png"))
+        data[-20] ^= 0xFF
+        with open(self.input_path("sample_1.png"), 'wb') as f:
+            f.write(data)
+        os.utime(self.input_path("sample_1.png"), ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertNotIn("sample_1.png", manifest.plan(predict_custom_image.INPUT_FOLDER,
+                                                       filenames)[0])
+        self.assertIn("sample_1.png", manifest.plan(predict_custom_image.INPUT_FOLDER,
+                                                    filenames, True)[0])
+
+        # Manifest dari model lain tidak dipakai
+        manifest.save()
+        self.assertTrue(PredictionManifest.load('manifest.json', 'model lain').model_changed)
+        self.assertEqual(len(PredictionManifest.load('manifest.json', 'model').files), 2)
+
+    def test_output_modes(self):
+        """Mode image/hardlink/symlink/none menghasilkan file yang sesuai di result/<label>/."""
+        source = self.input_path("sample_3.png")
+        with Image.open(source) as opened:
+            img = opened.convert('L')
+
+        for mode in ('image', 'hardlink', 'symlink', 'none'):
+            with self.subTest(mode=mode):
+                output = os.path.join(mode, 'result')
+                os.makedirs(os.path.join(output, 'Dress'))
+                with PredictionWriter(output, mode=mode) as writer:
+                    path = writer.write(img, source, "sample_3.png", 'Dress', 90.0)
+
+                if mode == 'none':
+                    self.assertIsNone(path)
+                    self.assertEqual(os.listdir(os.path.join(output, 'Dress')), [])
+                elif mode == 'image':
+                    with Image.open(path) as saved:
+                        self.assertEqual(saved.size, (28, 28))
+                elif mode == 'hardlink':
+                    self.assertTrue(os.path.samefile(path, source))
+                else:
+                    self.assertEqual(os.readlink(path), os.path.abspath(source))
+
+    def test_hardlink_falls_back_to_copy(self):
+        """Hardlink lintas filesystem (EXDEV) diganti copy byte file asli."""
+        source = self.input_path("sample_3.png")
+        os.makedirs(os.path.join('result', 'Dress'))
+        cross_device = OSError(errno.EXDEV, "Invalid cross-device link")
+
+        with mock.patch('os.link', side_effect=cross_device), \
+                PredictionWriter('result', mode='hardlink') as writer:
+            path = writer.write(None, source, "sample_3.png", 'Dress', 90.0)
+
+        self.assertFalse(os.path.samefile(path, source))
+        with open(path, 'rb') as copied, open(source, 'rb') as original:
+            self.assertEqual(copied.read(), original.read())
+
+    def test_predictions_file_formats(self):
+        """CSV memakai header sekali (juga saat append); selain .csv ditulis JSON Lines."""
+        for append in (False, True):
+            with PredictionWriter('result', mode='none', predictions_path='out.csv',
+                                  append=append) as writer:
+                writer.write(None, None, "a.png", 'Bag', 97.123456)
+        with open('out.csv', newline='') as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows, [['filename', 'label', 'confidence'],
+                                ['a.png', 'Bag', '97.1235'], ['a.png', 'Bag', '97.1235']])
+
+        with PredictionWriter('result', mode='none', predictions_path='out.jsonl') as writer:
+            writer.write(None, None, "a.png", 'Bag', 97.0)
+        self.assertEqual(read_lines('out.jsonl'),
+                         [{'filename': "a.png", 'label': 'Bag', 'confidence': 97.0}])
+
+    def test_watch_survives_deleted_and_corrupt_files(self):
+        """File yang hilang sebelum diprediksi atau rusak dilewati; watcher tetap jalan."""
+        manifest = PredictionManifest(None, 'model')
+        stop_event = threading.Event()
+        errors = []
+
+        # sample_2.png dihapus setelah polling, tepat sebelum plan() membaca stat-nya
+        original_plan = manifest.plan
+
+        def plan_after_delete(input_folder, filenames, use_hash=False):
+            if os.path.exists(self.input_path("sample_2.png")):
+                os.remove(self.input_path("sample_2.png"))
+            return original_plan(input_folder, filenames, use_hash)
+
+        manifest.plan = plan_after_delete
+
+        def watch():
+            try:
+                predict_custom_image.watch_folder(
+                    None, manifest, predict_custom_image.INPUT_FOLDER, 'result', workers=0,
+                    poll_interval=0.01, max_latency=0, stop_event=stop_event
+                )
+            except Exception as error:
+                errors.append(error)
+
+        with mock.patch.object(predict_custom_image, 'build_inference_fn',
+                               return_value=fake_infer), \
+                contextlib.redirect_stdout(io.StringIO()):
+            predict_custom_image.prepare_output_folder('result')
+            thread = threading.Thread(target=watch)
+            thread.start()
+            try:
+                wait_until(lambda: len(manifest.files) == 5 or not thread.is_alive())
+
+                # Gambar rusak dilewati, gambar yang masuk setelahnya tetap diproses
+                with open(self.input_path("broken.png"), 'wb') as f:
+                    f.write(b'bukan gambar')
+                write_image(self.input_path("new.png"), 7)
+                wait_until(lambda: "new.png" in manifest.files or not thread.is_alive())
+            finally:
+                stop_event.set()
+                thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertNotIn("sample_2.png", manifest.files)
+        self.assertNotIn("broken.png", manifest.files)
+        self.assertEqual(manifest.files["new.png"]['label'], LABELS[7])
+        self.assertTrue(os.path.exists(os.path.join('result', LABELS[7], "new.png")))
+
+    def test_watch_survives_decompression_bomb(self):
+        """Gambar melebihi batas pixel PIL (DecompressionBombError) dilewati; watcher tetap jalan."""
+        original_predict_files = predict_custom_image.predict_files
+
+        def strict_predict_files(infer, input_folder, files, *args, **kwargs):
+            # Stage yang membuka gambar tanpa skip: error sampai ke flush()
+            for filename in files:
+                with Image.open(os.path.join(input_folder, filename)):
+                    pass
+            return original_predict_files(infer, input_folder, files, *args, **kwargs)
+
+        for name, predict_files in (('skip di pipeline', original_predict_files),
+                                    ('error sampai flush', strict_predict_files)):
+            with self.subTest(name):
+                self.run_watch_with_bomb(predict_files)
+
+    def run_watch_with_bomb(self, predict_files):
+        for filename in ("bomb.png", "new.png"):
+            if os.path.exists(self.input_path(filename)):
+                os.remove(self.input_path(filename))
+        manifest = PredictionManifest(None, 'model')
+        stop_event = threading.Event()
+        errors = []
+
+        def watch():
+            try:
+                predict_custom_image.watch_folder(
+                    None, manifest, predict_custom_image.INPUT_FOLDER, 'result', workers=0,
+                    poll_interval=0.01, max_latency=0, stop_event=stop_event
+                )
+            except Exception as error:
+                errors.append(error)
+
+        # Batas diperkecil agar gambar 100x100 sudah dianggap decompression bomb
+        # (PIL menolak gambar > 2 × MAX_IMAGE_PIXELS) tanpa menulis file raksasa
+        with mock.patch.object(Image, 'MAX_IMAGE_PIXELS', 1000), \
+                mock.patch.object(predict_custom_image, 'predict_files', predict_files), \
+                mock.patch.object(predict_custom_image, 'build_inference_fn',
+                                  return_value=fake_infer), \
+                contextlib.redirect_stdout(io.StringIO()) as output:
+            predict_custom_image.prepare_output_folder('result')
+            thread = threading.Thread(target=watch)
+            thread.start()
+            try:
+                wait_until(lambda: len(manifest.files) == 6 or not thread.is_alive())
+                Image.new('L', (100, 100)).save(self.input_path("bomb.png"))
+                wait_until(lambda: "bomb.png" in output.getvalue() or not thread.is_alive())
+                write_image(self.input_path("new.png"), 3)
+                wait_until(lambda: "new.png" in manifest.files or not thread.is_alive())
+            finally:
+                stop_event.set()
+                thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertIn("DecompressionBombError", output.getvalue())
+        self.assertNotIn("bomb.png", manifest.files)
+        self.assertEqual(manifest.files["new.png"]['label'], LABELS[3])
+
+    def test_async_pipeline_matches_serial(self):
+        """Pipeline asyncio menghasilkan prediksi dan file yang sama dengan versi serial."""
+        filenames = sorted(predict_custom_image.list_images(predict_custom_image.INPUT_FOLDER))
+        outputs = {}
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            for name in ('serial', 'async'):
+                predict_custom_image.prepare_output_folder(name)
+                writer = PredictionWriter(name, predictions_path=f"{name}.jsonl")
+                writer.flush = mock.Mock(wraps=writer.flush)
+                options = dict(batch_size=4, workers=2, writer=writer)
+
+                with writer:
+                    if name == 'serial':
+                        counts = predict_custom_image.predict_files(
+                            fake_infer, predict_custom_image.INPUT_FOLDER, filenames, name,
+                            **options)
+                    else:
+                        counts = asyncio.run(predict_custom_image.predict_files_async(
+                            fake_infer, predict_custom_image.INPUT_FOLDER, filenames, name,
+                            max_in_flight=4, **options))
+
+                # 6 gambar, batch 4: file prediksi di-flush setelah setiap batch
+                self.assertGreaterEqual(writer.flush.call_count, 2)
+                saved = sorted(
+                    os.path.relpath(os.path.join(folder, f), name)
+                    for folder, _, files in os.walk(name) for f in files
+                )
+                lines = sorted(read_lines(f"{name}.jsonl"), key=lambda row: row['filename'])
+                outputs[name] = (counts, saved, lines)
+
+        self.assertEqual(outputs['async'], outputs['serial'])
+        self.assertEqual(len(outputs['serial'][2]), 6)
+
+    def test_async_failure_keeps_manifest_complete(self):
+        """
+        Gambar rusak dilewati; jika inferensi gagal di tengah run, semua
+        file yang sudah ditulis tetap tercatat di manifest yang disimpan.
+        """
+        with open(self.input_path("broken.png"), 'wb') as f:
+            f.write(b'bukan gambar')
+        filenames = ["sample_0.png", "broken.png"] + [f"sample_{i}.png" for i in range(1, 6)]
+        manifest = PredictionManifest('manifest.json', 'model')
+        manifest.plan(predict_custom_image.INPUT_FOLDER, filenames)
+        skipped = []
+
+        # Batch kedua gagal selagi penulisan batch pertama masih berjalan
+        calls = []
+
+        def failing_infer(images):
+            calls.append(len(images))
+            if len(calls) == 2:
+                raise RuntimeError("inferensi gagal")
+            return fake_infer(images)
+
+        original_save = predict_custom_image.save_prediction
+
+        def slow_save(*args, **kwargs):
+            time.sleep(0.2)
+            return original_save(*args, **kwargs)
+
+        predict_custom_image.prepare_output_folder('result')
+        with mock.patch.object(predict_custom_image, 'save_prediction', slow_save), \
+                contextlib.redirect_stdout(io.StringIO()):
+            with self.assertRaises(RuntimeError):
+                asyncio.run(predict_custom_image.predict_files_async(
+                    failing_infer, predict_custom_image.INPUT_FOLDER, filenames, 'result',
+                    batch_size=2, workers=2, max_in_flight=4, manifest=manifest,
+                    skipped=skipped))
+
+        written = sorted(f for _, _, files in os.walk('result') for f in files)
+        self.assertEqual(written, ["sample_0.png", "sample_1.png"])
+        self.assertEqual(sorted(PredictionManifest.load('manifest.json', 'model').files), written)
+        self.assertEqual([filename for filename, _ in skipped], ["broken.png"])
+
+
+
+class TestBatchParity(unittest.TestCase):
+    """
+    Class untuk testing bahwa mode batch (user-001) dan preprocessing di
+    worker pool (user-002) memberi hasil yang sama dengan jalur lama:
+    model.predict() per gambar, satu per satu, di main thread.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        # Model Keras kecil dengan weights acak: tanpa file model hasil training
+        import tensorflow as tf
+        from train_fashion_mnist_model import build_model
+
+        tf.keras.utils.set_random_seed(0)
+        cls.model = build_model(hidden_units=16)
+
+    def setUp(self):
+        self.infer = predict_custom_image.build_inference_fn(self.model)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.folder = self.tmpdir.name
+        rng = np.random.default_rng(0)
+        # 13 gambar noise dengan ukuran berbeda: batch terakhir tidak penuh,
+        # dan setiap gambar ikut di-resize
+        self.filenames = [f"noise_{i:02d}.png" for i in range(13)]
+        for i, filename in enumerate(self.filenames):
+            size = 28 + 4 * (i % 3)
+            pixels = rng.integers(0, 256, size=(size, size), dtype=np.uint8)
+            Image.fromarray(pixels).save(os.path.join(self.folder, filename))
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def predict_one_by_one(self):
+        """Jalur sebelum batching: model.predict() untuk setiap gambar."""
+        results = {}
+        for filename in self.filenames:
+            _, img_array = predict_custom_image.preprocess_image(
+                os.path.join(self.folder, filename))
+            probabilities = self.model.predict(img_array[None], verbose=0)[0]
+            results[filename] = predict_custom_image.decode_prediction(probabilities)
+        return results
+
+    def test_batch_sizes_and_workers_match_per_image_path(self):
+        """Label & confidence sama untuk batch_size 1/N dan workers 0/N; urutan output tetap."""
+        expected = self.predict_one_by_one()
+
+        for batch_size in (1, 4, 32):
+            for workers in (0, 3):
+                with self.subTest(batch_size=batch_size, workers=workers):
+                    manifest = PredictionManifest(None, 'model')
+                    with contextlib.redirect_stdout(io.StringIO()) as output:
+                        predict_custom_image.predict_files(
+                            self.infer, self.folder, self.filenames, None,
+                            batch_size=batch_size, workers=workers, prefetch=2,
+                            manifest=manifest, writer=PredictionWriter(None, mode='none'))
+
+                    printed = [line.split()[1].rstrip(':') for line in
+                               output.getvalue().splitlines() if '📸' in line]
+                    self.assertEqual(printed, self.filenames)
+                    for filename, (label, confidence) in expected.items():
+                        self.assertEqual(manifest.files[filename]['label'], label)
+                        self.assertAlmostEqual(manifest.files[filename]['confidence'],
+                                               confidence, places=3)
+
+    def test_worker_pool_preserves_order(self):
+        """Batch dari worker pool keluar sesuai urutan file walaupun decode selesai acak."""
+        rng = np.random.default_rng(1)
+        delays = dict(zip(self.filenames, rng.uniform(0, 0.02, len(self.filenames))))
+
+        def slow_preprocess(path, metrics):
+            # Gambar di awal daftar sengaja bisa selesai paling akhir
+            time.sleep(delays[os.path.basename(path)])
+            return predict_custom_image.preprocess_image(path, metrics)
+
+        batches = list(predict_custom_image.iter_preprocessed_batches(
+            self.folder, self.filenames, batch_size=4, workers=4, prefetch=3,
+            preprocess=slow_preprocess))
+        serial = list(predict_custom_image.iter_preprocessed_batches(
+            self.folder, self.filenames, batch_size=4, workers=0))
+
+        self.assertEqual([f for files, _, _ in batches for f in files], self.filenames)
+        self.assertEqual([len(files) for files, _, _ in batches], [4, 4, 4, 1])
+        for (_, _, arrays), (_, _, serial_arrays) in zip(batches, serial):
+            np.testing.assert_array_equal(np.stack(arrays), np.stack(serial_arrays))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Fashion MNIST Prediction Cache Unit Testing
+===========================================
+Unit test untuk prediction_cache.py: eviction LRU, tier disk SQLite,
+isolasi antar model, dan statistik hit/miss/eviction.
+
+Model asli tidak diperlukan; yang diuji hanya struktur cache.
+
+Framework: unittest (bawaan Python)
+
+Dibuat oleh: Fathih Apriandi
+"""
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from prediction_cache import PredictionCache
+
+# Pixel dummy 28x28 untuk setiap entry
+PIXELS = np.zeros((28, 28), dtype=np.uint8)
+
+# ============================================================================
+# CLASS UNIT TEST
+# ============================================================================
+
+class TestPredictionCache(unittest.TestCase):
+    """
+    Class untuk testing cache prediksi berbasis isi gambar.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, 'cache.db')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_key_depends_on_content_and_model(self):
+        """Isi sama → key sama; model berbeda → key berbeda."""
+        cache_a = PredictionCache('model-a')
+        cache_b = PredictionCache('model-b')
+
+        self.assertEqual(cache_a.key_for(b'gambar'), cache_a.key_for(b'gambar'))
+        self.assertNotEqual(cache_a.key_for(b'gambar'), cache_a.key_for(b'lain'))
+        self.assertNotEqual(cache_a.key_for(b'gambar'), cache_b.key_for(b'gambar'))
+
+    def test_lru_eviction(self):
+        """Entry yang paling lama tidak dipakai dibuang lebih dulu."""
+        cache = PredictionCache('model', max_entries=2)
+        cache.put('a', 'Bag', 90.0, PIXELS)
+        cache.put('b', 'Coat', 80.0, PIXELS)
+
+        # 'a' dipakai lagi sehingga 'b' menjadi yang paling lama
+        self.assertEqual(cache.get('a').label, 'Bag')
+        cache.put('c', 'Dress', 70.0, PIXELS)
+
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNotNone(cache.get('c'))
+
+        stats = cache.stats()
+        self.assertEqual(stats['evictions'], 1)
+        self.assertEqual(stats['misses'], 3)
+        self.assertEqual(stats['hits'], 3)
+        self.assertEqual(stats['entries'], 2)
+
+    def test_disk_tier_persists_between_runs(self):
+        """Entry di tier disk bisa dibaca oleh cache baru dengan model yang sama."""
+        cache = PredictionCache('model', disk_path=self.db_path)
+        pixels = np.arange(784, dtype=np.uint8).reshape(28, 28)
+        cache.put('a', 'Sneaker', 99.5, pixels)
+        cache.close()
+
+        cache = PredictionCache('model', disk_path=self.db_path)
+        entry = cache.get('a')
+        cache.close()
+
+        self.assertEqual(entry.label, 'Sneaker')
+        self.assertAlmostEqual(entry.confidence, 99.5)
+        np.testing.assert_array_equal(entry.pixels, pixels)
+        self.assertEqual(cache.stats()['disk_hits'], 1)
+
+    def test_disk_tier_drops_other_models(self):
+        """Entry dari model lama dihapus saat database dibuka dengan model baru."""
+        cache = PredictionCache('model-lama', disk_path=self.db_path)
+        cache.put('a', 'Bag', 90.0, PIXELS)
+        cache.close()
+
+        cache = PredictionCache('model-baru', disk_path=self.db_path)
+        self.assertIsNone(cache.get('a'))
+        cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,213 @@
+"""
+Fashion MNIST Training Pipeline Unit Testing
+============================================
+Unit test untuk training_pipeline.py: urutan, dtype dan normalisasi batch
+dari make_dataset(), shuffle yang bisa direproduksi dengan seed, ringkasan
+throughput per epoch, opsi command line dan mixed precision di
+train_fashion_mnist_model.py, early stopping berdasarkan target metric,
+dan penyimpanan model yang atomic.
+
+Data berupa array uint8 kecil buatan sendiri, jadi dataset asli dan model
+hasil training tidak diperlukan.
+
+Framework: unittest (bawaan Python)
+
+Dibuat oleh: Fathih Apriandi
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import tensorflow as tf
+
+from train_fashion_mnist_model import build_model, compile_model, parse_args
+from training_pipeline import (
+    TargetMetricStopping, ThroughputLogger, make_dataset, save_model_atomic,
+)
+
+# ============================================================================
+# FUNGSI BANTU
+# ============================================================================
+
+def make_arrays(n=10):
+    """Gambar ke-i berisi pixel bernilai 20*i dengan label i (uint8)."""
+    images = np.repeat(np.arange(n, dtype=np.uint8) * 20, 28 * 28).reshape(n, 28, 28)
+    return images, np.arange(n, dtype=np.uint8)
+
+
+def epoch_labels(dataset):
+    """Urutan label dalam satu epoch (satu kali iterasi dataset)."""
+    return [int(label) for _, labels in dataset for label in labels.numpy()]
+
+# ============================================================================
+# CLASS UNIT TEST
+# ============================================================================
+
+class TestMakeDataset(unittest.TestCase):
+    """
+    Class untuk testing pipeline input tf.data.
+    """
+
+    def test_batches_keep_order_and_normalize(self):
+        """Tanpa shuffle: urutan asli, batch terakhir tidak penuh, float32 di [0, 1]."""
+        images, labels = make_arrays()
+        batches = list(make_dataset(images, labels, batch_size=4))
+
+        self.assertEqual([len(y) for _, y in batches], [4, 4, 2])
+        x = np.concatenate([x.numpy() for x, _ in batches])
+        y = np.concatenate([y.numpy() for _, y in batches])
+
+        self.assertEqual(batches[0][0].dtype, tf.float32)
+        self.assertEqual(x.shape, (10, 28, 28))
+        np.testing.assert_array_equal(y, labels)
+        np.testing.assert_allclose(x, images.astype(np.float32) / 255.0)
+        self.assertLessEqual(x.max(), 1.0)
+
+    def test_shuffle_is_seeded_permutation(self):
+        """Shuffle mengacak tanpa kehilangan data, berbeda tiap epoch, dan sama untuk seed sama."""
+        images, labels = make_arrays(50)
+        dataset = make_dataset(images, labels, batch_size=8, shuffle=True, seed=7)
+
+        first, second = epoch_labels(dataset), epoch_labels(dataset)
+        self.assertEqual(sorted(first), list(range(50)))
+        self.assertNotEqual(first, list(range(50)))
+        self.assertNotEqual(first, second)    # reshuffle_each_iteration
+
+        again = make_dataset(images, labels, batch_size=8, shuffle=True, seed=7)
+        self.assertEqual(epoch_labels(again), first)
+
+        # Pasangan gambar-label tetap utuh setelah diacak
+        for x, y in dataset:
+            np.testing.assert_allclose(x.numpy()[:, 0, 0], y.numpy() * 20 / 255.0, rtol=1e-6)
+
+
+class TestTrainingOptions(unittest.TestCase):
+    """
+    Class untuk testing opsi tuning training dan laporan throughput.
+    """
+
+    def test_throughput_summary_skips_first_epoch(self):
+        """Epoch pertama (tracing/XLA) tidak ikut rata-rata jika ada lebih dari satu epoch."""
+        logger = ThroughputLogger(num_samples=100, batch_size=32)
+        self.assertEqual(logger.num_steps, 4)     # batch terakhir tidak penuh tetap satu step
+        self.assertEqual(logger.summary()['seconds_per_epoch'], 0.0)
+
+        logger.history = [{'seconds': 10.0}]
+        self.assertEqual(logger.summary()['seconds_per_epoch'], 10.0)
+
+        logger.history += [{'seconds': 1.0}, {'seconds': 3.0}]
+        summary = logger.summary()
+        self.assertEqual(summary['seconds_per_epoch'], 2.0)
+        self.assertEqual(summary['steps_per_s'], 2.0)
+        self.assertEqual(summary['samples_per_s'], 50.0)
+
+    def test_epoch_log_line(self):
+        """Setiap epoch dicatat ke history dan dicetak ke terminal."""
+        logger = ThroughputLogger(num_samples=64, batch_size=32)
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            logger.on_epoch_begin(0)
+            logger.on_epoch_end(0)
+
+        self.assertEqual(len(logger.history), 1)
+        self.assertEqual(logger.history[0]['epoch'], 1)
+        self.assertGreater(logger.history[0]['samples_per_s'], 0)
+        self.assertIn('Epoch 1', output.getvalue())
+
+    def test_parse_args(self):
+        """Default aman (float32, tanpa XLA, thread otomatis) dan pilihan precision dibatasi."""
+        args = parse_args([])
+        self.assertEqual((args.mixed_precision, args.jit_compile), ('float32', False))
+        self.assertEqual((args.intra_op_threads, args.inter_op_threads), (0, 0))
+        self.assertIsNone(args.seed)
+
+        args = parse_args(['--epochs', '3', '--batch-size', '128', '--jit-compile',
+                           '--mixed-precision', 'mixed_bfloat16', '--intra-op-threads', '4'])
+        self.assertEqual((args.epochs, args.batch_size, args.intra_op_threads), (3, 128, 4))
+        self.assertTrue(args.jit_compile)
+
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            parse_args(['--mixed-precision', 'float16'])
+
+    def test_mixed_precision_keeps_float32_output(self):
+        """Dengan mixed_float16, layer tersembunyi 16-bit tetapi softmax tetap float32."""
+        tf.keras.mixed_precision.set_global_policy('mixed_float16')
+        try:
+            model = build_model(hidden_units=8)
+        finally:
+            tf.keras.mixed_precision.set_global_policy('float32')
+
+        self.assertEqual(model.layers[1].compute_dtype, 'float16')
+        self.assertEqual(model.layers[1].dtype, 'float32')    # variable tetap float32
+        probabilities = model(np.zeros((2, 28, 28), dtype=np.float32))
+        self.assertEqual(probabilities.dtype, tf.float32)
+        np.testing.assert_allclose(probabilities.numpy().sum(axis=1), 1.0, rtol=1e-5)
+
+
+
+class TestStoppingAndSaving(unittest.TestCase):
+    """
+    Class untuk testing early stopping target akurasi dan penyimpanan model atomic.
+    """
+
+    def test_stops_once_target_passed(self):
+        """model.fit() berhenti di epoch pertama yang melewati target, epochs hanya batas atas."""
+        images, labels = make_arrays()
+        tf.keras.utils.set_random_seed(0)
+        model = compile_model(build_model(hidden_units=32))
+        stopper = TargetMetricStopping(target=0.0)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            history = model.fit(make_dataset(images, labels, batch_size=5), epochs=20,
+                                callbacks=[stopper], verbose=0)
+        self.assertEqual(stopper.stopped_epoch, 1)
+        self.assertEqual(len(history.history['loss']), 1)
+
+    def test_target_not_reached_or_metric_missing(self):
+        """Metric di bawah/sama dengan target atau tidak ada di logs: training berlanjut."""
+        stopper = TargetMetricStopping(target=0.85)
+        stopper.set_model(mock.Mock(stop_training=False))
+
+        stopper.on_epoch_end(0, {'accuracy': 0.85})
+        stopper.on_epoch_end(1, {'loss': 0.1})
+        stopper.on_epoch_end(2, None)
+        self.assertFalse(stopper.model.stop_training)
+        self.assertIsNone(stopper.stopped_epoch)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            stopper.on_epoch_end(3, {'accuracy': 0.851})
+        self.assertTrue(stopper.model.stop_training)
+        self.assertEqual(stopper.stopped_epoch, 4)
+
+    def test_save_model_atomic(self):
+        """Save berhasil menimpa model; save gagal menyisakan model lama tanpa file sementara."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'model.keras')
+            model = build_model(hidden_units=4)
+            save_model_atomic(model, path)
+            self.assertEqual(os.listdir(tmpdir), ['model.keras'])
+            with open(path, 'rb') as f:
+                before = f.read()
+
+            def broken_save(tmp_path):
+                with open(tmp_path, 'wb') as f:
+                    f.write(b'sebagian')
+                raise OSError(28, 'No space left on device')
+
+            with mock.patch.object(model, 'save', broken_save):
+                with self.assertRaises(OSError):
+                    save_model_atomic(model, path)
+
+            self.assertEqual(os.listdir(tmpdir), ['model.keras'])
+            with open(path, 'rb') as f:
+                self.assertEqual(f.read(), before)
+            loaded = tf.keras.models.load_model(path)
+            self.assertEqual(loaded.count_params(), model.count_params())
+
+
+if __name__ == "__main__":
+    unittest.main()
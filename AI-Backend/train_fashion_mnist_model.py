@@ -13,116 +13,297 @@ Optimizer: Adam
 Loss Function: Sparse Categorical Crossentropy
 Metrics: Accuracy
 
+Mode high-throughput (untuk tuning di mesin CPU many-core):
+    python train_fashion_mnist_model.py --batch-size 256 --jit-compile
+    python train_fashion_mnist_model.py --mixed-precision mixed_bfloat16
+    python train_fashion_mnist_model.py --intra-op-threads 16 --inter-op-threads 2
+
+Early stopping & checkpoint:
+    python train_fashion_mnist_model.py --target-accuracy 0.85   # berhenti saat akurasi > 85%
+    python train_fashion_mnist_model.py --resume                 # lanjut dari checkpoint terakhir
+
 Dibuat oleh: Fathih Apriandi
 """
 
+import argparse
+import os
+import shutil
+
 import tensorflow as tf
 
+from dataset_cache import load_data
+from training_pipeline import (
+    DEFAULT_BATCH_SIZE,
+    TargetMetricStopping,
+    ThroughputLogger,
+    make_dataset,
+    peak_memory_mb,
+    save_model_atomic,
+)
+
 # ============================================================================
-# LOAD DAN PREPROCESS DATASET FASHION MNIST
+# KONFIGURASI DEFAULT
 # ============================================================================
 
-# Load dataset Fashion MNIST dari TensorFlow Keras
-# Dataset berisi 70.000 gambar fashion item dalam 10 kategori
-# - Training set: 60.000 gambar (x_train, y_train)
-# - Test set: 10.000 gambar (x_test, y_test)
-# Pixel values: 0-255 (grayscale), Label: 0-9
-mnist = tf.keras.datasets.fashion_mnist
-(x_train, y_train), (x_test, y_test) = mnist.load_data()
-
-# Normalisasi pixel values dari range [0, 255] ke [0, 1]
-# Tujuan: 
-# 1. Mempercepat konvergensi selama training
-# 2. Mencegah gradient explosion
-# 3. Membuat model lebih stabil secara numerik
-x_train, x_test = x_train / 255.0, x_test / 255.0
+# File hasil training
+MODEL_PATH = 'fashion_mnist_model.keras'
+
+# Jumlah epoch default (seluruh dataset diproses 10 kali)
+# Jika --target-accuracy dipakai, ini menjadi batas maksimal epoch
+DEFAULT_EPOCHS = 10
+
+# Folder checkpoint untuk melanjutkan training yang terputus
+CHECKPOINT_DIR = 'checkpoints'
+
+# Policy precision yang didukung Keras
+# - float32: default, paling akurat
+# - mixed_float16 / mixed_bfloat16: komputasi 16-bit, variable tetap float32
+PRECISION_POLICIES = ('float32', 'mixed_float16', 'mixed_bfloat16')
 
 # ============================================================================
-# ARSITEKTUR MODEL NEURAL NETWORK
+# KONFIGURASI RUNTIME TENSORFLOW
 # ============================================================================
 
-# Membangun model Sequential (feed-forward neural network)
-# Sequential model: layer disusun secara berurutan dari input ke output
-model = tf.keras.models.Sequential([
-    # Layer 1: Flatten
-    # Mengubah input 2D (28x28) menjadi 1D vector (784 elements)
-    # Required karena dense layer menerima input 1D
-    tf.keras.layers.Flatten(input_shape=(28, 28)),
-    
-    # Layer 2: Dense (Hidden Layer)
-    # 512 neurons dengan aktivasi ReLU (Rectified Linear Unit)
-    # ReLU: f(x) = max(0, x) - menghilangkan nilai negatif
-    # 512 neurons memberikan kapasitas learning yang cukup tanpa overfitting berlebihan
-    tf.keras.layers.Dense(512, activation=tf.nn.relu),
-    
-    # Layer 3: Dense (Output Layer)
-    # 10 neurons (sesuai jumlah kelas Fashion MNIST)
-    # Aktivasi Softmax: mengubah output menjadi probabilitas (sum = 1.0)
-    # Setiap neuron mewakili probabilitas satu kelas fashion item
-    tf.keras.layers.Dense(10, activation='softmax')
-])
+def configure_runtime(intra_op_threads=0, inter_op_threads=0, precision='float32'):
+    """
+    Mengatur thread pool dan mixed precision TensorFlow.
+
+    HARUS dipanggil sebelum operasi TensorFlow pertama dijalankan,
+    karena thread pool hanya bisa diatur sebelum runtime diinisialisasi.
+
+    Parameter:
+        intra_op_threads: thread untuk paralelisme di dalam satu op
+                          (contoh: matmul), 0 = otomatis
+        inter_op_threads: thread untuk menjalankan op independen
+                          secara bersamaan, 0 = otomatis
+        precision: salah satu dari PRECISION_POLICIES
+    """
+    tf.config.threading.set_intra_op_parallelism_threads(intra_op_threads)
+    tf.config.threading.set_inter_op_parallelism_threads(inter_op_threads)
+    tf.keras.mixed_precision.set_global_policy(precision)
 
 # ============================================================================
-# KOMPILASI MODEL
+# ARSITEKTUR MODEL NEURAL NETWORK
 # ============================================================================
 
-# Kompilasi model dengan konfigurasi training
-model.compile(
-    # Optimizer: Adam (Adaptive Moment Estimation)
-    # Kombinasi RMSProp + Momentum, cocok untuk berbagai masalah
-    # Learning rate adaptive, tidak perlu manual tuning
-    optimizer=tf.optimizers.Adam(),
-    
-    # Loss Function: Sparse Categorical Crossentropy
-    # Cocok untuk multi-class classification dengan integer labels
-    # Tidak perlu one-hot encoding untuk target labels
-    loss='sparse_categorical_crossentropy',
-    
-    # Metrics: Accuracy
-    # Mengukur persentase prediksi yang benar
-    # Monitor utama selama training process
-    metrics=['accuracy']
-)
+def build_model(hidden_units=512):
+    """
+    Membangun model Sequential (feed-forward neural network).
+    Sequential model: layer disusun secara berurutan dari input ke output.
+    """
+    return tf.keras.models.Sequential([
+        # Layer 1: Flatten
+        # Mengubah input 2D (28x28) menjadi 1D vector (784 elements)
+        # Required karena dense layer menerima input 1D
+        tf.keras.layers.Flatten(input_shape=(28, 28)),
+
+        # Layer 2: Dense (Hidden Layer)
+        # 512 neurons dengan aktivasi ReLU (Rectified Linear Unit)
+        # ReLU: f(x) = max(0, x) - menghilangkan nilai negatif
+        # 512 neurons memberikan kapasitas learning yang cukup tanpa overfitting berlebihan
+        tf.keras.layers.Dense(hidden_units, activation=tf.nn.relu),
+
+        # Layer 3: Dense (Output Layer)
+        # 10 neurons (sesuai jumlah kelas Fashion MNIST)
+        # Aktivasi Softmax: mengubah output menjadi probabilitas (sum = 1.0)
+        # Setiap neuron mewakili probabilitas satu kelas fashion item
+        # dtype float32: softmax tetap dihitung float32 meskipun mixed precision aktif
+        # agar probabilitas stabil secara numerik
+        tf.keras.layers.Dense(10, activation='softmax', dtype='float32')
+    ])
 
 # ============================================================================
-# TRAINING PROCESS
+# KOMPILASI MODEL
 # ============================================================================
 
-# Melatih model dengan data training
-# Parameter:
-# - x_train: Gambar training (60.000 samples)
-# - y_train: Label training (0-9)
-# - epochs: 10 (seluruh dataset diproses 10 kali)
-# 
-# Proses training:
-# 1. Forward propagation: input → output
-# 2. Calculate loss: bandingkan prediksi vs actual
-# 3. Backward propagation: hitung gradients
-# 4. Update weights: adjust berdasarkan gradients
-print("🚀 Memulai training model...")
-history = model.fit(x_train, y_train, epochs=10)
+def compile_model(model, jit_compile=False):
+    """
+    Kompilasi model dengan konfigurasi training.
+
+    jit_compile=True mengaktifkan XLA: op-op kecil digabung (fused) menjadi
+    kernel yang lebih besar sehingga overhead per step berkurang.
+    """
+    model.compile(
+        # Optimizer: Adam (Adaptive Moment Estimation)
+        # Kombinasi RMSProp + Momentum, cocok untuk berbagai masalah
+        # Learning rate adaptive, tidak perlu manual tuning
+        optimizer=tf.optimizers.Adam(),
+
+        # Loss Function: Sparse Categorical Crossentropy
+        # Cocok untuk multi-class classification dengan integer labels
+        # Tidak perlu one-hot encoding untuk target labels
+        loss='sparse_categorical_crossentropy',
+
+        # Metrics: Accuracy
+        # Mengukur persentase prediksi yang benar
+        # Monitor utama selama training process
+        metrics=['accuracy'],
+
+        jit_compile=jit_compile
+    )
+    return model
 
 # ============================================================================
-# SIMPAN MODEL
+# ARGUMEN COMMAND LINE
 # ============================================================================
 
-# Menyimpan model yang sudah dilatih ke file .keras
-# Format .keras: format modern TensorFlow, menyimpan:
-# - Arsitektur model
-# - Weight values
-# - Optimizer state
-# - Loss dan metrics
-model.save('fashion_mnist_model.keras')
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Training model Fashion MNIST"
+    )
+    parser.add_argument("--epochs", type=int, default=DEFAULT_EPOCHS,
+                        help=f"Jumlah epoch (default: {DEFAULT_EPOCHS})")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"Jumlah gambar per step (default: {DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--jit-compile", action="store_true",
+                        help="Aktifkan kompilasi XLA (jit_compile=True)")
+    parser.add_argument("--mixed-precision", choices=PRECISION_POLICIES, default="float32",
+                        help="Policy precision Keras (default: float32)")
+    parser.add_argument("--intra-op-threads", type=int, default=0,
+                        help="Thread di dalam satu op TensorFlow, 0 = otomatis")
+    parser.add_argument("--inter-op-threads", type=int, default=0,
+                        help="Thread untuk op paralel TensorFlow, 0 = otomatis")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Seed shuffle dan inisialisasi weights (default: acak)")
+    parser.add_argument("--output", default=MODEL_PATH,
+                        help=f"Path file model hasil training (default: {MODEL_PATH})")
+    parser.add_argument("--target-accuracy", type=float, default=None,
+                        help="Berhenti begitu akurasi training melewati nilai ini (contoh: 0.85)")
+    parser.add_argument("--checkpoint-dir", default=CHECKPOINT_DIR,
+                        help=f"Folder checkpoint per epoch (default: {CHECKPOINT_DIR})")
+    parser.add_argument("--resume", action="store_true",
+                        help="Lanjutkan dari checkpoint terakhir jika ada")
+    return parser.parse_args(argv)
 
 # ============================================================================
-# EVALUASI FINAL
+# MAIN EXECUTION
 # ============================================================================
 
-# Evaluasi model dengan test dataset
-# Memberikan indikasi performa pada data yang belum pernah dilihat
-test_loss, test_accuracy = model.evaluate(x_test, y_test, verbose=0)
+def main(argv=None):
+    args = parse_args(argv)
+
+    # Runtime diatur paling awal, sebelum ada operasi TensorFlow
+    configure_runtime(args.intra_op_threads, args.inter_op_threads, args.mixed_precision)
+    if args.seed is not None:
+        tf.keras.utils.set_random_seed(args.seed)
+
+    # ========================================================================
+    # LOAD DAN PREPROCESS DATASET FASHION MNIST
+    # ========================================================================
+
+    # Load dataset Fashion MNIST dari cache .npy (lihat dataset_cache.py)
+    # Dataset berisi 70.000 gambar fashion item dalam 10 kategori
+    # - Training set: 60.000 gambar (x_train, y_train)
+    # - Test set: 10.000 gambar (x_test, y_test)
+    # Pixel values: 0-255 (grayscale), Label: 0-9
+    (x_train, y_train), (x_test, y_test) = load_data()
+
+    # Pipeline input tf.data (lihat training_pipeline.py)
+    # Gambar tetap disimpan sebagai uint8; normalisasi [0, 255] → [0, 1] dan
+    # cast ke float32 dilakukan per batch di dalam pipeline, sehingga tidak ada
+    # salinan float64 seluruh dataset di memori.
+    # Tujuan normalisasi:
+    # 1. Mempercepat konvergensi selama training
+    # 2. Mencegah gradient explosion
+    # 3. Membuat model lebih stabil secara numerik
+    train_dataset = make_dataset(x_train, y_train, batch_size=args.batch_size,
+                                 shuffle=True, seed=args.seed)
+    test_dataset = make_dataset(x_test, y_test, batch_size=args.batch_size)
+
+    model = compile_model(build_model(), jit_compile=args.jit_compile)
+
+    # ========================================================================
+    # CHECKPOINT & EARLY STOPPING
+    # ========================================================================
+
+    # BackupAndRestore menyimpan model + optimizer + nomor epoch di akhir
+    # setiap epoch. Jika training terputus, run berikutnya dengan --resume
+    # melanjutkan dari epoch terakhir. Checkpoint dihapus otomatis setelah
+    # training selesai dengan normal.
+    if not args.resume and os.path.exists(args.checkpoint_dir):
+        # Tanpa --resume: mulai dari awal, checkpoint lama diabaikan
+        shutil.rmtree(args.checkpoint_dir)
+    elif args.resume and os.path.exists(args.checkpoint_dir):
+        print(f"♻️  Melanjutkan training dari checkpoint '{args.checkpoint_dir}/'")
+
+    throughput = ThroughputLogger(num_samples=len(x_train), batch_size=args.batch_size)
+    callbacks = [
+        tf.keras.callbacks.BackupAndRestore(args.checkpoint_dir, save_freq='epoch'),
+        throughput,
+    ]
+
+    # Loop "Akurasi > 85%?" dari flowchart: berhenti saat target tercapai
+    target_stopping = None
+    if args.target_accuracy is not None:
+        target_stopping = TargetMetricStopping(args.target_accuracy, monitor='accuracy')
+        callbacks.append(target_stopping)
+
+    # ========================================================================
+    # TRAINING PROCESS
+    # ========================================================================
+
+    # Melatih model dengan data training
+    # Parameter:
+    # - train_dataset: Gambar + label training (60.000 samples, di-shuffle tiap epoch)
+    # - epochs: 10 (seluruh dataset diproses 10 kali), atau kurang jika
+    #   target akurasi sudah tercapai
+    # - BackupAndRestore: checkpoint per epoch untuk --resume
+    # - ThroughputLogger: mencatat steps/detik, samples/detik, waktu dan
+    #   peak memory per epoch
+    #
+    # Proses training:
+    # 1. Forward propagation: input → output
+    # 2. Calculate loss: bandingkan prediksi vs actual
+    # 3. Backward propagation: hitung gradients
+    # 4. Update weights: adjust berdasarkan gradients
+    print("🚀 Memulai training model...")
+    print(f"   ⚙️  batch size {args.batch_size}, jit_compile={args.jit_compile}, "
+          f"precision {args.mixed_precision}, threads intra={args.intra_op_threads} "
+          f"inter={args.inter_op_threads} (0 = otomatis)")
+    model.fit(train_dataset, epochs=args.epochs, callbacks=callbacks)
+
+    # ========================================================================
+    # SIMPAN MODEL
+    # ========================================================================
+
+    # Menyimpan model yang sudah dilatih ke file .keras
+    # Format .keras: format modern TensorFlow, menyimpan:
+    # - Arsitektur model
+    # - Weight values
+    # - Optimizer state
+    # - Loss dan metrics
+    # Disimpan secara atomic: file lama tidak pernah tertimpa setengah jadi
+    save_model_atomic(model, args.output)
+
+    # ========================================================================
+    # EVALUASI FINAL
+    # ========================================================================
+
+    # Evaluasi model dengan test dataset
+    # Memberikan indikasi performa pada data yang belum pernah dilihat
+    # Akurasi dilaporkan agar biaya akurasi setiap setting bisa dibandingkan
+    test_loss, test_accuracy = model.evaluate(test_dataset, verbose=0)
+
+    print(f"\n✅ Training selesai!")
+    print(f"📊 Test Accuracy: {test_accuracy:.4f} ({test_accuracy*100:.2f}%)")
+    print(f"📊 Test Loss: {test_loss:.4f}")
+    print(f"💾 Model disimpan sebagai: {args.output}")
+    if target_stopping is not None and target_stopping.stopped_epoch is not None:
+        print(f"🎯 Target akurasi tercapai di epoch {target_stopping.stopped_epoch}")
+
+    summary = throughput.summary()
+    print(f"⏱️  Rata-rata: {summary['seconds_per_epoch']:.1f}s/epoch, "
+          f"{summary['steps_per_s']:,.1f} steps/detik, "
+          f"{summary['samples_per_s']:,.0f} samples/detik")
+
+    peak_mb = peak_memory_mb()
+    if peak_mb is not None:
+        print(f"🧠 Peak memory: {peak_mb:.0f} MB")
+
+    return model, throughput
+
 
-print(f"\n✅ Training selesai!")
-print(f"📊 Test Accuracy: {test_accuracy:.4f} ({test_accuracy*100:.2f}%)")
-print(f"📊 Test Loss: {test_loss:.4f}")
-print(f"💾 Model disimpan sebagai: fashion_mnist_model.keras")
\ No newline at end of file
+# Block ini dijalankan hanya jika script dieksekusi langsung
+# Tidak dijalankan jika script di-import sebagai module
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+Fashion MNIST Training Input Pipeline
+=====================================
+Pipeline input tf.data yang hemat memori untuk training model Fashion MNIST.
+
+Versi lama melakukan `x_train / 255.0` di NumPy sehingga tercipta salinan
+float64 (±376 MB untuk 60.000 gambar training) yang kemudian dikonversi
+lagi oleh Keras ke float32. Di sini gambar tetap disimpan sebagai uint8
+(±47 MB) dan normalisasi + cast ke float32 dilakukan per batch di dalam
+tf.data.map, sehingga hanya batch yang sedang diproses yang berupa float.
+
+Urutan stage:
+    from_tensor_slices (uint8) → cache → shuffle → batch → map(normalisasi) → prefetch
+
+Module ini juga berisi:
+- callback untuk mencatat waktu, steps/detik, samples/detik dan peak
+  memory (RSS) setiap epoch
+- callback early stopping berdasarkan target akurasi
+- penyimpanan model secara atomic
+
+Dibuat oleh: Fathih Apriandi
+"""
+
+import math
+import os
+import sys
+import time
+
+import tensorflow as tf
+
+# resource hanya tersedia di Linux/Mac; di Windows peak memory tidak dicatat
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# ============================================================================
+# KONFIGURASI DEFAULT
+# ============================================================================
+
+# Batch size default sama dengan default model.fit() Keras
+DEFAULT_BATCH_SIZE = 32
+
+# Seed shuffle default (None = acak setiap run, seperti model.fit biasa)
+DEFAULT_SEED = None
+
+# ============================================================================
+# FUNGSI PIPELINE DATASET
+# ============================================================================
+
+def normalize_batch(images, labels):
+    """
+    Cast uint8 → float32 dan normalisasi [0, 255] → [0, 1] per batch.
+    Harus sama dengan normalisasi di predict_custom_image.py!
+    """
+    return tf.cast(images, tf.float32) / 255.0, labels
+
+
+def make_dataset(images, labels, batch_size=DEFAULT_BATCH_SIZE, shuffle=False,
+                 seed=DEFAULT_SEED):
+    """
+    Membuat tf.data.Dataset dari array uint8 (contoh: hasil dataset_cache.load_data()).
+
+    Parameter:
+        images: array uint8 (N, 28, 28)
+        labels: array label (N,)
+        batch_size: jumlah gambar per batch
+        shuffle: acak urutan setiap epoch (True untuk training)
+        seed: seed shuffle agar urutan bisa direproduksi
+
+    Return:
+        tf.data.Dataset yang menghasilkan (float32 (B, 28, 28), label (B,))
+    """
+    dataset = tf.data.Dataset.from_tensor_slices((images, labels))
+
+    # Cache di awal pipeline: yang disimpan masih uint8, jadi tetap kecil
+    dataset = dataset.cache()
+
+    if shuffle:
+        # Buffer sebesar seluruh dataset = shuffle sempurna seperti model.fit(x, y)
+        # Murah karena elemen di buffer masih uint8 (784 byte per gambar)
+        dataset = dataset.shuffle(
+            buffer_size=len(images), seed=seed, reshuffle_each_iteration=True
+        )
+
+    # Batch dulu baru map: normalisasi dikerjakan sekali per batch (vectorized),
+    # bukan sekali per gambar
+    dataset = dataset.batch(batch_size)
+    dataset = dataset.map(normalize_batch, num_parallel_calls=tf.data.AUTOTUNE)
+
+    # Prefetch: batch berikutnya disiapkan selagi batch saat ini dilatih
+    return dataset.prefetch(tf.data.AUTOTUNE)
+
+# ============================================================================
+# CALLBACK: THROUGHPUT & PEAK MEMORY
+# ============================================================================
+
+def peak_memory_mb():
+    """Peak resident memory (RSS) proses ini dalam MB, atau None jika tidak didukung."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux melaporkan KB, macOS melaporkan byte
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+class ThroughputLogger(tf.keras.callbacks.Callback):
+    """
+    Callback Keras yang mencetak waktu, steps/detik, samples/detik dan
+    peak memory per epoch. Hasil setiap epoch juga disimpan di atribut
+    `history` untuk dianalisis.
+    """
+
+    def __init__(self, num_samples, batch_size=DEFAULT_BATCH_SIZE):
+        super().__init__()
+        self.num_samples = num_samples
+        # Batch terakhir yang tidak penuh tetap dihitung satu step
+        self.num_steps = math.ceil(num_samples / batch_size)
+        self.history = []
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._epoch_start = time.perf_counter()
+
+    def on_epoch_end(self, epoch, logs=None):
+        elapsed = time.perf_counter() - self._epoch_start
+        steps_per_s = self.num_steps / elapsed
+        samples_per_s = self.num_samples / elapsed
+        peak_mb = peak_memory_mb()
+
+        self.history.append({
+            'epoch': epoch + 1,
+            'seconds': elapsed,
+            'steps_per_s': steps_per_s,
+            'samples_per_s': samples_per_s,
+            'peak_memory_mb': peak_mb,
+        })
+
+        peak_text = f", peak memory {peak_mb:.0f} MB" if peak_mb is not None else ""
+        print(f"   ⏱️  Epoch {epoch + 1}: {elapsed:.1f}s, {steps_per_s:,.1f} steps/detik, "
+              f"{samples_per_s:,.0f} samples/detik{peak_text}")
+
+    def summary(self):
+        """
+        Rata-rata waktu dan throughput per epoch.
+        Epoch pertama tidak dihitung jika ada lebih dari satu epoch, karena
+        berisi waktu tracing graph (dan kompilasi XLA jika aktif).
+        """
+        epochs = self.history[1:] if len(self.history) > 1 else self.history
+        if not epochs:
+            return {'seconds_per_epoch': 0.0, 'steps_per_s': 0.0, 'samples_per_s': 0.0}
+
+        seconds = sum(e['seconds'] for e in epochs) / len(epochs)
+        return {
+            'seconds_per_epoch': seconds,
+            'steps_per_s': self.num_steps / seconds,
+            'samples_per_s': self.num_samples / seconds,
+        }
+
+# ============================================================================
+# CALLBACK: EARLY STOPPING BERDASARKAN TARGET METRIC
+# ============================================================================
+
+class TargetMetricStopping(tf.keras.callbacks.Callback):
+    """
+    Menghentikan training begitu metric melewati target.
+
+    Ini adalah loop "Akurasi > 85%?" pada flowchart: training diulang
+    epoch demi epoch dan langsung berhenti saat target tercapai, sehingga
+    tidak ada epoch tambahan yang membuang waktu CPU. Jumlah epoch pada
+    model.fit() berfungsi sebagai batas maksimal.
+    """
+
+    def __init__(self, target, monitor='accuracy'):
+        super().__init__()
+        self.target = target
+        self.monitor = monitor
+        self.stopped_epoch = None
+
+    def on_epoch_end(self, epoch, logs=None):
+        value = (logs or {}).get(self.monitor)
+        if value is None:
+            return
+
+        if value > self.target:
+            self.stopped_epoch = epoch + 1
+            self.model.stop_training = True
+            print(f"   🎯 {self.monitor} {value:.4f} > {self.target:.4f}, "
+                  f"training berhenti di epoch {epoch + 1}")
+
+# ============================================================================
+# FUNGSI: SIMPAN MODEL SECARA ATOMIC
+# ============================================================================
+
+def save_model_atomic(model, path):
+    """
+    Menyimpan model ke file sementara lalu rename ke `path`.
+
+    os.replace() bersifat atomic, jadi file model lama tidak pernah
+    tertimpa sebagian: jika proses mati di tengah penyimpanan, file
+    `path` tetap berisi model lama yang utuh.
+    """
+    # Keras mewajibkan ekstensi .keras, jadi penanda tmp diletakkan di depan
+    folder, filename = os.path.split(os.path.abspath(path))
+    tmp_path = os.path.join(folder, f".tmp-{os.getpid()}-{filename}")
+    try:
+        model.save(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)